@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Compile MetaSpec's Jinja2 templates to Python modules.
+
+This script:
+1. Loads every *.j2 template bundled in src/metaspec/templates
+2. Compiles it with the same environment options the Generator uses
+3. Writes the modules and a manifest to src/metaspec/compiled_templates/
+
+The compiled modules ship inside the wheel, so installed copies of
+MetaSpec render without parsing or compiling templates at runtime.
+
+Usage:
+    python scripts/compile-templates.py
+
+Run this before `python -m build`, and again after editing templates.
+"""
+
+from metaspec.generator import COMPILED_TEMPLATES_DIR, compile_templates
+
+
+def main() -> None:
+    """Compile templates into the package."""
+    print(f"🔧 Compiling templates into {COMPILED_TEMPLATES_DIR}...")
+    compiled = compile_templates()
+    print(f"✅ Compiled {len(compiled)} templates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""
+Benchmarks of MetaSpec's hot paths.
+
+`metaspec bench` (and tests/perf) time CLI cold start, template environment
+build, context build, full render, write_to_disk, registry cache load,
+search and `list` discovery on synthetic inputs of increasing size, and
+write the results as JSON so runs of different versions can be compared:
+
+    results = run_benchmarks(sizes=(1, 10, 100))
+    write_results(results, Path("bench.json"))
+    regressions = compare_results(results, read_results(Path("baseline.json")))
+
+Sizes scale the synthetic definition (entity fields, CLI commands), the
+registry (10 speckits per size unit) and the speckits found by `list`
+(one per size unit). Benchmarks that do not depend on input size run once,
+with size None.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from jinja2 import TemplateError
+
+from metaspec import __version__
+from metaspec.models import (
+    Command,
+    EntityDefinition,
+    Field,
+    MetaSpecDefinition,
+    Option,
+    SlashCommand,
+)
+
+# Benchmarks, in the order they run
+BENCHMARKS = (
+    "cli_startup",
+    "environment",
+    "context",
+    "render",
+    "write",
+    "registry_load",
+    "search",
+    "list_discovery",
+)
+
+# Benchmarks whose input does not grow with size
+SIZE_INDEPENDENT = ("cli_startup", "environment")
+
+DEFAULT_SIZES = (1, 10, 100)
+DEFAULT_REPEAT = 5
+
+# Registry speckits per size unit
+REGISTRY_SCALE = 10
+
+# A median this much slower than the baseline's counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+RESULTS_FORMAT = 1
+
+# Slash commands of the generic library, cycled through by size
+_SLASH_COMMANDS = ("plan", "tasks", "validate")
+_FIELD_TYPES = ("string", "integer", "boolean", "array", "object")
+
+
+def synthetic_definition(size: int, name: str | None = None) -> MetaSpecDefinition:
+    """
+    Build a definition whose entity and CLI grow with size.
+
+    Args:
+        size: Scale (>= 1): 5 entity fields, 1 CLI command (with 2 options)
+            per unit, and up to 3 slash commands
+        name: Speckit name (default: bench-<size>)
+
+    Returns:
+        Synthetic MetaSpecDefinition
+    """
+    return MetaSpecDefinition(
+        name=name or f"bench-{size}",
+        version="1.0.0",
+        description=f"Synthetic speckit of size {size}",
+        domain="benchmark",
+        entity=EntityDefinition(
+            name="Record",
+            fields=[
+                Field(
+                    name=f"field_{i}",
+                    type=_FIELD_TYPES[i % len(_FIELD_TYPES)],
+                    description=f"Field number {i}",
+                )
+                for i in range(5 * size)
+            ],
+        ),
+        cli_commands=[
+            Command(
+                name=f"command-{i}",
+                description=f"Command number {i}",
+                options=[
+                    Option(name="input", type="string", required=True),
+                    Option(name="strict", type="boolean", description="Strict mode"),
+                ],
+            )
+            for i in range(size)
+        ],
+        slash_commands=[
+            SlashCommand(name=command, description=f"{command} step")
+            for command in _SLASH_COMMANDS[:size]
+        ],
+        dependencies=["pydantic>=2.0.0", "typer>=0.9.0"],
+    )
+
+
+def synthetic_registry(size: int) -> dict[str, Any]:
+    """
+    Build registry data (as served and cached) with REGISTRY_SCALE * size speckits.
+
+    Args:
+        size: Scale (>= 1)
+
+    Returns:
+        Dict with a "speckits" list
+    """
+    return {
+        "speckits": [
+            {
+                "name": f"speckit-{i}",
+                "command": f"speckit-{i}",
+                "description": f"Synthetic speckit {i} for {_FIELD_TYPES[i % 5]} specs",
+                "version": "1.0.0",
+                "pypi_package": f"speckit-{i}",
+                "repository": f"https://github.com/example/speckit-{i}",
+                "author": "Benchmark",
+                "tags": ["benchmark", _FIELD_TYPES[i % 5], f"group-{i % 10}"],
+                "cli_commands": ["init", "validate", "generate"],
+            }
+            for i in range(REGISTRY_SCALE * size)
+        ]
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    """
+    Time func repeat times.
+
+    Args:
+        func: Code to time
+        repeat: Number of runs (>= 1)
+
+    Returns:
+        Dict with runs, min, median, mean and max (seconds)
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+        "max": max(durations),
+    }
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    repeat: int = DEFAULT_REPEAT,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run benchmarks in a temporary directory.
+
+    Args:
+        names: Benchmarks to run (default: all of BENCHMARKS)
+        sizes: Input sizes for size-dependent benchmarks
+        repeat: Timed runs per benchmark and size
+        on_result: Called with each result as soon as it is measured
+
+    Returns:
+        Dict with format, metaspec and python versions, platform, sizes,
+        repeat and results: a list of {benchmark, size, runs, min, median,
+        mean, max}
+
+    Raises:
+        ValueError: If a name is not a benchmark, or sizes or repeat are
+            not positive
+    """
+    selected = list(BENCHMARKS if names is None else names)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmark: {', '.join(unknown)}\n"
+            f"Expected one of: {', '.join(BENCHMARKS)}"
+        )
+    sizes = sorted(set(sizes))
+    if repeat < 1 or not sizes or sizes[0] < 1:
+        raise ValueError("Sizes and repeat must be positive")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="metaspec-bench-") as temp:
+        work_dir = Path(temp)
+        for name in BENCHMARKS:
+            if name not in selected:
+                continue
+            for size in [None] if name in SIZE_INDEPENDENT else sizes:
+                stats = _BENCHMARKS[name](work_dir / f"{name}-{size}", size, repeat)
+                result = {"benchmark": name, "size": size, **stats}
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+    return {
+        "format": RESULTS_FORMAT,
+        "metaspec": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def write_results(results: dict[str, Any], path: Path) -> None:
+    """
+    Write benchmark results as JSON.
+
+    Args:
+        results: Output of run_benchmarks()
+        path: Output file
+    """
+    path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+def read_results(path: Path) -> dict[str, Any]:
+    """
+    Read benchmark results written by write_results().
+
+    Args:
+        path: Results file
+
+    Returns:
+        Results dict
+
+    Raises:
+        ValueError: If the file is not benchmark results
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid benchmark results: {path}\n{e}") from e
+    if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+        raise ValueError(f"Invalid benchmark results: {path}")
+    return data
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[dict[str, Any]]:
+    """
+    Find benchmarks that got slower than a baseline.
+
+    Only benchmarks and sizes present in both runs are compared, by median.
+
+    Args:
+        current: Results of this run
+        baseline: Results to compare against
+        threshold: Allowed slowdown (0.25 = 25% slower)
+
+    Returns:
+        List of {benchmark, size, baseline, current, ratio} for medians more
+        than threshold slower, slowest ratio first
+    """
+    baseline_medians = {
+        (result["benchmark"], result["size"]): result["median"]
+        for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        before = baseline_medians.get((result["benchmark"], result["size"]))
+        if not before:
+            continue
+        ratio = result["median"] / before
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "benchmark": result["benchmark"],
+                    "size": result["size"],
+                    "baseline": before,
+                    "current": result["median"],
+                    "ratio": ratio,
+                }
+            )
+    regressions.sort(key=lambda regression: regression["ratio"], reverse=True)
+    return regressions
+
+
+def _bench_cli_startup(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time `metaspec version` in a fresh interpreter."""
+    command = [sys.executable, "-c", "from metaspec.cli import main; main()", "version"]
+    return measure(
+        lambda: subprocess.run(command, capture_output=True, check=True), repeat
+    )
+
+
+def _bench_environment(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time creating a generator and loading every template."""
+    from metaspec.generator import Generator
+
+    def build() -> None:
+        generator = Generator()
+        for name in generator.template_index.paths:
+            try:
+                generator.env.get_template(name)
+            except TemplateError:
+                continue
+
+    return measure(build, repeat)
+
+
+def _bench_context(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time building the template context of a definition."""
+    from metaspec.generator import Generator
+
+    generator = Generator()
+    meta_spec = synthetic_definition(size or 1)
+    return measure(lambda: generator._create_template_context(meta_spec), repeat)
+
+
+def _bench_render(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time a full in-memory generation with a warm environment."""
+    from metaspec.generator import Generator
+
+    generator = Generator()
+    generator.generate(synthetic_definition(size or 1), work_dir, dry_run=True)
+    runs = iter(range(repeat))
+
+    def render() -> None:
+        # A new name each run, so templates using the definition re-render
+        meta_spec = synthetic_definition(size or 1, name=f"bench-run-{next(runs)}")
+        generator.generate(meta_spec, work_dir, dry_run=True)
+
+    return measure(render, repeat)
+
+
+def _bench_write(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time writing a generated speckit to a new directory."""
+    from metaspec.generator import Generator
+
+    project = Generator().generate(
+        synthetic_definition(size or 1), work_dir / "speckit", dry_run=True
+    )
+    runs = iter(range(repeat))
+
+    def write() -> None:
+        project.root_path = work_dir / f"speckit-{next(runs)}"
+        project.write_to_disk()
+
+    return measure(write, repeat)
+
+
+def _bench_registry_load(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time loading the registry from its warm cache, with nothing memoized."""
+    from metaspec.registry import clear_registry_snapshots
+
+    registry = _cached_registry(work_dir, size or 1)
+
+    def load() -> None:
+        clear_registry_snapshots()
+        registry.fetch_speckits()
+
+    return measure(load, repeat)
+
+
+def _bench_search(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time a registry search with nothing memoized, as `metaspec search` runs."""
+    from metaspec.registry import clear_registry_snapshots
+
+    registry = _cached_registry(work_dir, size or 1)
+
+    def search() -> None:
+        clear_registry_snapshots()
+        registry.search("object")
+
+    return measure(search, repeat)
+
+
+def _bench_list_discovery(work_dir: Path, size: int | None, repeat: int) -> dict:
+    """Time discovering installed speckits on PATH, as `metaspec list` does."""
+    from metaspec.cli.info import _discover_installed_speckits
+
+    bin_dir = work_dir / "bin"
+    bin_dir.mkdir(parents=True)
+    for i in range(size or 1):
+        script = bin_dir / f"bench-{i}-speckit"
+        script.write_text("#!/bin/sh\necho 1.0.0\n", encoding="utf-8")
+        script.chmod(0o755)
+
+    with _path(bin_dir):
+        return measure(_discover_installed_speckits, repeat)
+
+
+def _cached_registry(work_dir: Path, size: int) -> Any:
+    """Create a registry client whose (fresh) cache holds a synthetic registry."""
+    from metaspec.registry import CommunityRegistry
+
+    # The cache lives in work_dir, never under ~/.metaspec
+    registry = CommunityRegistry(
+        registry_url="http://127.0.0.1:9/unreachable", cache_dir=work_dir
+    )
+    (work_dir / "community_speckits.json").write_text(
+        json.dumps(synthetic_registry(size)), encoding="utf-8"
+    )
+    registry.snapshot()  # Writes the binary snapshot, as the download would
+    return registry
+
+
+@contextmanager
+def _path(directory: Path) -> Iterator[None]:
+    """Temporarily make directory the only PATH entry."""
+    saved = os.environ.get("PATH")
+    os.environ["PATH"] = str(directory)
+    try:
+        yield
+    finally:
+        if saved is None:
+            del os.environ["PATH"]
+        else:
+            os.environ["PATH"] = saved
+
+
+_BENCHMARKS: dict[str, Callable[[Path, int | None, int], dict]] = {
+    "cli_startup": _bench_cli_startup,
+    "environment": _bench_environment,
+    "context": _bench_context,
+    "render": _bench_render,
+    "write": _bench_write,
+    "registry_load": _bench_registry_load,
+    "search": _bench_search,
+    "list_discovery": _bench_list_discovery,
+}
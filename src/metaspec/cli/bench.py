@@ -0,0 +1,147 @@
+"""
+Bench command for MetaSpec CLI.
+
+Times MetaSpec's hot paths on synthetic inputs (see metaspec.bench) and
+optionally compares the results with an earlier run.
+"""
+
+import sys
+from pathlib import Path
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from metaspec.bench import (
+    BENCHMARKS,
+    DEFAULT_REPEAT,
+    DEFAULT_SIZES,
+    DEFAULT_THRESHOLD,
+    compare_results,
+    read_results,
+    run_benchmarks,
+    write_results,
+)
+
+console = Console()
+
+
+def bench_command(
+    output: Path | None = typer.Option(
+        None, "--output", "-o", help="Write results as JSON to this file"
+    ),
+    sizes: list[int] = typer.Option(
+        list(DEFAULT_SIZES),
+        "--size",
+        "-s",
+        help="Synthetic input size (repeat the option for several)",
+    ),
+    repeat: int = typer.Option(
+        DEFAULT_REPEAT, "--repeat", "-r", help="Timed runs per benchmark and size"
+    ),
+    only: list[str] | None = typer.Option(
+        None,
+        "--only",
+        help=f"Run only this benchmark (repeatable): {', '.join(BENCHMARKS)}",
+    ),
+    baseline: Path | None = typer.Option(
+        None,
+        "--baseline",
+        "-b",
+        help="Compare with results of an earlier run; exit 1 on regressions",
+    ),
+    threshold: float = typer.Option(
+        DEFAULT_THRESHOLD,
+        "--threshold",
+        help="Slowdown of the median counted as a regression (0.25 = 25%)",
+    ),
+) -> None:
+    """
+    Benchmark generation, registry and CLI hot paths.
+
+    Measures CLI cold start, template environment build, context build,
+    full render, write_to_disk, registry cache load, search and `list`
+    discovery on synthetic definitions of increasing size.
+
+    Examples:
+        # Record results of this version
+        metaspec bench -o bench-0.9.7.json
+
+        # Check an upgrade for regressions
+        metaspec bench --baseline bench-0.9.7.json
+
+        # Only rendering, for large definitions
+        metaspec bench --only render --size 100 --size 1000
+    """
+    previous = None
+    try:
+        if baseline is not None:
+            previous = read_results(baseline)
+        results = run_benchmarks(
+            names=only or None,
+            sizes=sizes,
+            repeat=repeat,
+            on_result=lambda result: console.print(
+                f"[dim]{_label(result)}: {_format_duration(result['median'])}[/dim]"
+            ),
+        )
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+    table = Table(title=f"MetaSpec {results['metaspec']} benchmarks", show_header=True)
+    table.add_column("Benchmark", style="cyan", no_wrap=True)
+    table.add_column("Size", justify="right")
+    table.add_column("Median", justify="right")
+    table.add_column("Min", justify="right", style="dim")
+    table.add_column("Max", justify="right", style="dim")
+    for result in results["results"]:
+        table.add_row(
+            result["benchmark"],
+            "-" if result["size"] is None else str(result["size"]),
+            _format_duration(result["median"]),
+            _format_duration(result["min"]),
+            _format_duration(result["max"]),
+        )
+    console.print(table)
+
+    if output is not None:
+        write_results(results, output)
+        console.print(f"\n[green]✅ Results written to {output}[/green]")
+
+    if previous is None:
+        return
+
+    regressions = compare_results(results, previous, threshold)
+    if not regressions:
+        console.print(
+            f"\n[green]✅ No regressions against {baseline} "
+            f"(MetaSpec {previous.get('metaspec', 'unknown')})[/green]"
+        )
+        return
+
+    console.print(
+        f"\n[red]❌ {len(regressions)} regression(s) against {baseline}:[/red]"
+    )
+    for regression in regressions:
+        console.print(
+            f"  • {_label(regression)}: "
+            f"{_format_duration(regression['baseline'])} → "
+            f"{_format_duration(regression['current'])} "
+            f"({regression['ratio']:.2f}x)"
+        )
+    sys.exit(1)
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration for display."""
+    if seconds < 1:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def _label(result: dict) -> str:
+    """Name a benchmark result: benchmark and size."""
+    if result["size"] is None:
+        return str(result["benchmark"])
+    return f"{result['benchmark']} (size {result['size']})"
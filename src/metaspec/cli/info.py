@@ -70,8 +70,7 @@ def info_command(command: str) -> None:
     console.print(f"[cyan]Speckit Information:[/cyan] [bold]{command}[/bold]\n")
 
     # Detect info
-    registry = CommunityRegistry()
-    detected = registry.detect_speckit_info(command)
+    detected = CommunityRegistry.detect_speckit_info(command)
 
     # Display basic info
     console.print(f"[bold]Command:[/bold] {command}")
@@ -17,7 +17,11 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.prompt import Confirm, Prompt
 
 from metaspec.generator import create_generator
+from metaspec.instrumentation import TimingCollector
 from metaspec.models import MetaSpecDefinition
+from metaspec.output import WriteSummary, read_manifest
+from metaspec.project_cache import ProjectCache
+from metaspec.watch import DefinitionWatcher, WatchUpdate
 
 # Built-in starter presets for quick start
 # Used when: metaspec init <name> --template default
@@ -100,6 +104,34 @@ def init_command(
         "-f",
         help="Overwrite existing output directory",
     ),
+    cache: bool = typer.Option(
+        False,
+        "--cache/--no-cache",
+        help="Restore repeat generations from ~/.metaspec/cache/projects "
+        "(keeps up to 256 MB of generated speckits)",
+    ),
+    timings: Path | None = typer.Option(
+        None,
+        "--timings",
+        help="Write a JSON report of per-stage and per-template timings",
+    ),
+    definition: Path | None = typer.Option(
+        None,
+        "--definition",
+        "-d",
+        help="Read the speckit definition from a YAML or JSON file",
+    ),
+    template_dir: Path | None = typer.Option(
+        None,
+        "--template-dir",
+        help="Render with custom templates from this directory",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        "-w",
+        help="Keep running and regenerate when the definition or templates change",
+    ),
 ) -> None:
     """
     Create a new spec-driven speckit (interactive or template-based).
@@ -124,13 +156,28 @@ def init_command(
 
         # Specify custom output directory
         metaspec init my-spec-kit -o ./custom-path
+
+        # Profile generation
+        metaspec init my-spec-kit --timings timings.json
+
+        # Generate from a definition file, regenerating on every save
+        metaspec init -d speckit.yaml --watch
     """
     try:
         # Determine toolkit name
         toolkit_name = name
 
+        if watch and definition is None:
+            console.print("[red]Error:[/red] --watch requires --definition")
+            sys.exit(1)
+
+        # Mode 0: Definition file
+        if definition is not None:
+            meta_spec = MetaSpecDefinition.from_file(definition)
+            toolkit_name = meta_spec.name
+
         # Mode 1: Interactive mode (no name provided)
-        if not toolkit_name:
+        elif not toolkit_name:
             console.print(
                 Panel.fit(
                     "[bold cyan]MetaSpec - Create Spec-Driven Toolkit[/bold cyan]\n\n"
@@ -151,8 +198,9 @@ def init_command(
         if output is None:
             output = Path(f"./{toolkit_name}")
 
-        # Check if directory exists
-        if output.exists() and not force and not dry_run:
+        # Check if directory exists (watch mode may update a generated one)
+        updatable = watch and read_manifest(output) is not None
+        if output.exists() and not force and not dry_run and not updatable:
             console.print(f"\n[red]Error:[/red] Directory '{output}' already exists")
             console.print(
                 "Use [cyan]--force[/cyan] to overwrite or choose a different name"
@@ -166,6 +214,10 @@ def init_command(
             console.print(f"[dim]Run without --dry-run to create: {output}[/dim]")
             raise typer.Exit(0)
 
+        if watch and definition is not None:
+            _run_watch(definition, output, template_dir)
+            sys.exit(0)
+
         # Generate toolkit
         console.print("\n[bold]Generating toolkit...[/bold]")
 
@@ -176,8 +228,15 @@ def init_command(
         ) as progress:
             gen_task = progress.add_task("Generating files...", total=None)
 
-            # Create generator
-            generator = create_generator()
+            # Create generator (with --cache, repeat generations are
+            # restored instead of rendered)
+            generator = create_generator(
+                custom_template_dir=template_dir,
+                project_cache=ProjectCache() if cache else None,
+            )
+            collector = TimingCollector()
+            if timings:
+                generator.add_hook(collector)
 
             # Generate project
             project = generator.generate(
@@ -189,6 +248,17 @@ def init_command(
 
             progress.update(gen_task, completed=True)
             console.print(f"[green]✓[/green] Generated {len(project.files)} files")
+            if timings:
+                collector.dump(timings)
+                console.print(f"[dim]  Timings written to {timings}[/dim]")
+            summary = project.write_summary
+            if force and isinstance(summary, WriteSummary):
+                console.print(
+                    f"[dim]  {len(summary.created)} created, "
+                    f"{len(summary.updated)} updated, "
+                    f"{len(summary.unchanged)} unchanged, "
+                    f"{len(summary.removed)} removed[/dim]"
+                )
 
             # Initialize spec-kit if requested
             if spec_kit:
@@ -243,6 +313,33 @@ def init_command(
         sys.exit(1)
 
 
+def _run_watch(definition: Path, output: Path, template_dir: Path | None) -> None:
+    """Regenerate the speckit on every change until interrupted."""
+    watcher = DefinitionWatcher(definition, output, custom_template_dir=template_dir)
+    watched = f"{definition}" + (f" and {template_dir}" if template_dir else "")
+    mode = "inotify" if watcher.watcher.uses_inotify else "polling"
+    console.print(f"\n[bold]Watching {watched}[/bold] [dim]({mode}, Ctrl+C to stop)[/dim]")
+
+    def on_update(update: WatchUpdate) -> None:
+        summary = update.summary
+        console.print(
+            f"[green]✓[/green] Regenerated {output} in "
+            f"{update.duration * 1000:.0f} ms "
+            f"[dim]({len(summary.created)} created, {len(summary.updated)} updated, "
+            f"{len(summary.unchanged)} unchanged, {len(summary.removed)} removed)[/dim]"
+        )
+        for change in update.changes:
+            console.print(f"  {change}", highlight=False)
+
+    def on_error(error: Exception) -> None:
+        console.print(f"[red]✗[/red] {type(error).__name__}: {error}")
+
+    try:
+        watcher.run(on_update, on_error)
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped watching[/dim]")
+
+
 def _create_from_preset(preset_name: str, toolkit_name: str) -> MetaSpecDefinition:
     """Create MetaSpecDefinition from starter preset."""
     if preset_name not in STARTER_PRESETS:
@@ -1,34 +1,140 @@
 """
 Main CLI entry point for MetaSpec.
+
+Subcommands are registered lazily: a command's module (and with it the
+generator, Jinja2, the registry, pydantic, rich...) is only imported when
+the command runs or its own help is shown, so `metaspec version` and
+`metaspec --help` start without them.
+
+A command's help text comes only from LAZY_COMMANDS: `--help` lists its
+one-line summary without importing the command, and load_command() puts
+that summary in front of the details of the command function's docstring
+(whose own summary line, kept for readers of the code, is not shown).
 """
 
+import importlib
+import inspect
 import sys
+from typing import Any
 
 import typer
-from rich.console import Console
+from typer.core import TyperCommand, TyperGroup
+
+# Subcommands: name -> (module, function, short help); the short help is
+# the first line of the command's help, followed by its docstring's details
+LAZY_COMMANDS: dict[str, tuple[str, str, str]] = {
+    "init": (
+        "metaspec.cli.init",
+        "init_command",
+        "Create a new spec-driven speckit (interactive or template-based).",
+    ),
+    "search": (
+        "metaspec.cli.search",
+        "search_command",
+        "Search for speckits in the community registry.",
+    ),
+    "install": (
+        "metaspec.cli.search",
+        "install_command",
+        "Install a speckit from the community registry.",
+    ),
+    "contribute": (
+        "metaspec.cli.contribute",
+        "contribute_command",
+        "Validate and submit your speckit to the community registry.",
+    ),
+    "list": ("metaspec.cli.info", "list_command", "List all installed speckits."),
+    "info": (
+        "metaspec.cli.info",
+        "info_command",
+        "Show detailed information about a speckit.",
+    ),
+    "sync": (
+        "metaspec.cli.sync",
+        "sync_command",
+        "Sync MetaSpec commands to the latest version.",
+    ),
+    "serve": (
+        "metaspec.cli.serve",
+        "serve_command",
+        "Run a generation daemon that keeps templates and caches warm.",
+    ),
+    "bench": (
+        "metaspec.cli.bench",
+        "bench_command",
+        "Benchmark generation, registry and CLI hot paths.",
+    ),
+}
+
+
+def load_command(name: str) -> TyperCommand:
+    """
+    Import a lazily registered subcommand.
+
+    Args:
+        name: Command name (a key of LAZY_COMMANDS)
+
+    Returns:
+        The command, built by Typer from its function, with the short help
+        from LAZY_COMMANDS followed by the function's docstring, without
+        its summary line, as help
+    """
+    module_name, function_name, short_help = LAZY_COMMANDS[name]
+    function = getattr(importlib.import_module(module_name), function_name)
+    _, _, details = (inspect.getdoc(function) or "").partition("\n\n")
+
+    # A one-command Typer app builds the command itself (not a group)
+    single = typer.Typer(add_completion=False)
+    single.command(
+        name=name,
+        help=f"{short_help}\n\n{details}" if details else short_help,
+        short_help=short_help,
+    )(function)
+    command = typer.main.get_command(single)
+    command.name = name
+    return command  # type: ignore[return-value]
+
+
+class LazyCommand(TyperCommand):
+    """Placeholder listing a subcommand that imports it on first use."""
+
+    def __init__(self, name: str, short_help: str):
+        super().__init__(name=name, help=short_help, short_help=short_help)
+        self._command: TyperCommand | None = None
+
+    @property
+    def command(self) -> TyperCommand:
+        """The real command, imported on first access."""
+        if self._command is None:
+            self._command = load_command(self.name or "")
+        return self._command
+
+    def make_context(self, *args: Any, **kwargs: Any) -> Any:
+        # The context belongs to the real command, so the group invokes it
+        return self.command.make_context(*args, **kwargs)
+
+    def invoke(self, ctx: Any) -> Any:
+        return self.command.invoke(ctx)
+
+
+class LazyCommandGroup(TyperGroup):
+    """Command group whose LAZY_COMMANDS are imported on demand."""
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return [*LAZY_COMMANDS, *super().list_commands(ctx)]
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Any:
+        if cmd_name in LAZY_COMMANDS:
+            return LazyCommand(cmd_name, LAZY_COMMANDS[cmd_name][2])
+        return super().get_command(ctx, cmd_name)
 
-from metaspec.cli.contribute import contribute_command
-from metaspec.cli.info import info_command, list_command
-from metaspec.cli.init import init_command
-from metaspec.cli.search import install_command, search_command
-from metaspec.cli.sync import sync_command
 
 app = typer.Typer(
     name="metaspec",
     help="MetaSpec - Meta-specification framework for generating Spec-Driven X (SD-X) toolkits",
     add_completion=False,
+    cls=LazyCommandGroup,
 )
-console = Console()
-
-
-# Register commands
-app.command(name="init")(init_command)
-app.command(name="search")(search_command)
-app.command(name="install")(install_command)
-app.command(name="contribute")(contribute_command)
-app.command(name="list")(list_command)
-app.command(name="info")(info_command)
-app.command(name="sync")(sync_command)
 
 
 @app.command("version")
@@ -37,7 +143,8 @@ def version_command() -> None:
     Show version information.
     """
     from metaspec import __version__
-    console.print(f"MetaSpec version {__version__}")
+
+    typer.echo(f"MetaSpec version {__version__}")
 
 
 @app.callback()
@@ -55,10 +162,14 @@ def main() -> None:
     try:
         app()
     except KeyboardInterrupt:
-        console.print("\n[yellow]Cancelled by user[/yellow]")
+        from rich.console import Console
+
+        Console().print("\n[yellow]Cancelled by user[/yellow]")
         sys.exit(130)
     except Exception as e:
-        console.print(f"[red]Error:[/red] {e}", style="red")
+        from rich.console import Console
+
+        Console().print(f"[red]Error:[/red] {e}", style="red")
         if "--debug" in sys.argv:
             raise
         sys.exit(1)
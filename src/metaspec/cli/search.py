@@ -6,6 +6,7 @@ Commands for discovering and installing speckits from the community registry.
 
 import sys
 
+import typer
 from rich.console import Console
 from rich.table import Table
 
@@ -14,21 +15,42 @@ from metaspec.registry import get_community_registry
 console = Console()
 
 
-def search_command(query: str) -> None:
+def search_command(
+    query: str,
+    limit: int | None = typer.Option(
+        None, "--limit", "-n", min=1, help="Show at most this many results"
+    ),
+    offset: int = typer.Option(
+        0, "--offset", min=0, help="Skip this many of the best results"
+    ),
+) -> None:
     """
     Search for speckits in the community registry.
 
+    Results are ranked by relevance: name matches first, then command,
+    tags and description.
+
     Args:
-        query: Search term (searches in name, description, tags)
+        query: Search terms (searches in name, command, tags, description)
+        limit: Maximum number of results
+        offset: Number of best results to skip
     """
     registry = get_community_registry()
 
     console.print(f"[cyan]Searching for '[bold]{query}[/bold]'...[/cyan]\n")
 
-    results = registry.search(query)
+    results = registry.search(query, limit=limit, offset=offset)
 
     if not results:
         console.print("[yellow]No speckits found matching your query.[/yellow]")
+        suggestions = list(registry.suggest(query))
+        if suggestions:
+            console.print("\nDid you mean:")
+            for speckit in suggestions:
+                console.print(
+                    f"  • [cyan]{speckit.name}[/cyan] [dim]{speckit.description}[/dim]"
+                )
+            return
         console.print("\nTry:")
         console.print("  • Different keywords")
         console.print('  • metaspec search "" to list all speckits')
@@ -69,6 +91,10 @@ def install_command(name: str) -> None:
         console.print(
             f"[red]Error: Speckit '{name}' not found in community registry[/red]"
         )
+        suggestions = list(registry.suggest(name))
+        if suggestions:
+            names = ", ".join(speckit.name for speckit in suggestions)
+            console.print(f"\nDid you mean: [cyan]{names}[/cyan]?")
         console.print("\nSearch for available speckits:")
         console.print(f'  metaspec search "{name}"')
         sys.exit(1)
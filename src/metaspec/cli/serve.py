@@ -0,0 +1,151 @@
+"""
+Serve command for MetaSpec CLI.
+
+Runs a long-lived generation daemon (see metaspec.daemon for the JSONL
+protocol and metaspec.http_service for the HTTP endpoints).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import typer
+from rich.console import Console
+
+from metaspec.daemon import GenerationService
+from metaspec.generator import create_generator
+from metaspec.http_service import (
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    GenerationHTTPServer,
+)
+from metaspec.project_cache import ProjectCache
+
+# stdout carries protocol responses, so messages go to stderr
+console = Console(stderr=True)
+
+
+def serve_command(
+    stdio: bool = typer.Option(
+        False,
+        "--stdio",
+        help="Read JSONL requests from stdin and write responses to stdout",
+    ),
+    socket_path: Path | None = typer.Option(
+        None,
+        "--socket",
+        help="Serve JSONL requests on a Unix domain socket at this path",
+    ),
+    http: str | None = typer.Option(
+        None,
+        "--http",
+        help="Serve zipped speckits over HTTP on [HOST:]PORT (default host 127.0.0.1)",
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, "--workers", help="Concurrent HTTP generations"
+    ),
+    queue_size: int = typer.Option(
+        DEFAULT_QUEUE_SIZE,
+        "--queue-size",
+        help="HTTP generations that may wait for a worker before requests get 429",
+    ),
+    timeout: float = typer.Option(
+        DEFAULT_TIMEOUT, "--timeout", help="Seconds an HTTP request may take"
+    ),
+    template_dir: Path | None = typer.Option(
+        None,
+        "--template-dir",
+        help="Render with custom templates from this directory",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Always render instead of restoring previously generated speckits",
+    ),
+) -> None:
+    """
+    Run a generation daemon that keeps templates and caches warm.
+
+    Requests and responses are newline-delimited JSON, one object per line:
+
+        {"id": 1, "definition": {...}, "output": "out/my-kit", "force": true}
+
+    Examples:
+        # Talk to the daemon over a pipe
+        metaspec serve --stdio
+
+        # Serve several clients on a socket
+        metaspec serve --socket /tmp/metaspec.sock
+
+        # Serve zipped speckits: POST a definition to /generate
+        metaspec serve --http 8000
+    """
+    if [stdio, socket_path is not None, http is not None].count(True) != 1:
+        console.print(
+            "[red]Error:[/red] Pass exactly one of --stdio, --socket or --http"
+        )
+        sys.exit(1)
+
+    start = time.perf_counter()
+    service = GenerationService(
+        create_generator(
+            custom_template_dir=template_dir,
+            project_cache=None if no_cache else ProjectCache(),
+        )
+    )
+    console.print(
+        f"[dim]MetaSpec generation daemon ready in "
+        f"{(time.perf_counter() - start) * 1000:.0f} ms[/dim]"
+    )
+    if http is not None:
+        _serve_http(service, http, workers, queue_size, timeout)
+        return
+
+    try:
+        if socket_path is not None:
+            console.print(f"[dim]Listening on {socket_path}[/dim]")
+            service.serve_socket(socket_path)
+        else:
+            service.serve_stream(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+
+def _serve_http(
+    service: GenerationService,
+    address: str,
+    workers: int,
+    queue_size: int,
+    timeout: float,
+) -> None:
+    """Run the HTTP service until interrupted."""
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        console.print(
+            f"[red]Error:[/red] Invalid address: {address} (expected [HOST:]PORT)"
+        )
+        sys.exit(1)
+
+    try:
+        server = GenerationHTTPServer(
+            (host or "127.0.0.1", int(port)),
+            service.generator,
+            workers=workers,
+            queue_size=queue_size,
+            timeout=timeout,
+        )
+    except OSError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+    console.print(f"[dim]Listening on http://{server.server_name}:{server.server_port}[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
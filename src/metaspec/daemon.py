@@ -0,0 +1,284 @@
+"""
+Long-lived generation daemon speaking newline-delimited JSON.
+
+`metaspec serve --stdio` (or `--socket PATH`) keeps one warm Generator -
+imports done, templates compiled, render cache filled - and answers
+generation requests, so tools generating many speckits pay the startup
+cost once per session instead of once per speckit.
+
+Protocol: one JSON object per line in each direction. Requests:
+
+    {"id": 1, "definition": {...}, "output": "out/my-kit", "force": true}
+    {"id": 2, "definition": {...}, "output": "my-kit.zip", "format": "zip"}
+    {"id": 3, "op": "ping"}
+    {"id": 4, "op": "shutdown"}
+
+"op" defaults to "generate"; "definition" is a speckit definition as
+accepted by MetaSpecDefinition.from_dict; "format" is "directory" (the
+default), "zip" or "tar.gz". Every request gets exactly one response
+carrying its "id":
+
+    {"id": 1, "ok": true, "output": "out/my-kit", "files": 37,
+     "summary": {"created": 37, "updated": 0, "unchanged": 0, "removed": 0},
+     "timings": {"total": 0.052, "stages": {"render": 0.031, ...}}}
+    {"id": 5, "ok": false, "error": {"type": "KeyError", "message": "'entity'"}}
+
+Over a socket, requests on one connection are answered in order, and
+connections are served concurrently.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, TextIO, cast
+
+from jinja2 import TemplateError
+
+from metaspec.generator import Generator, create_generator
+from metaspec.instrumentation import GenerationEvent, StageEvent
+from metaspec.models import MetaSpecDefinition
+from metaspec.output import ARCHIVE_FORMATS, WriteSummary
+
+# Request operations
+OPERATIONS = ("generate", "ping", "shutdown")
+
+# Output formats of generate requests
+OUTPUT_FORMATS = ("directory", *ARCHIVE_FORMATS)
+
+
+class RequestError(ValueError):
+    """A request is malformed."""
+
+
+class GenerationService:
+    """
+    Answer generation requests with one shared, warm Generator.
+
+    Thread-safe: requests may be handled concurrently.
+    """
+
+    def __init__(self, generator: Generator | None = None, warm_up: bool = True):
+        """
+        Initialize service.
+
+        Args:
+            generator: Generator to use (default: create_generator())
+            warm_up: Load every template now rather than on first use
+        """
+        self.generator = generator or create_generator()
+        self.shutdown_requested = threading.Event()
+        # Stage timings of the request running on each thread
+        self._timings = threading.local()
+        self.generator.add_hook(self._record_event)
+        if warm_up:
+            self.warm_up()
+
+    def warm_up(self) -> int:
+        """
+        Compile (or load from the template caches) every template.
+
+        Returns:
+            Number of templates loaded
+        """
+        loaded = 0
+        for name in sorted(self.generator.template_index.paths):
+            try:
+                self.generator.env.get_template(name)
+            except TemplateError:
+                continue  # Reported if a request actually renders it
+            loaded += 1
+        return loaded
+
+    def handle_line(self, line: str) -> str:
+        """
+        Answer one protocol line.
+
+        Args:
+            line: Request (one JSON object)
+
+        Returns:
+            Response line (JSON, without trailing newline)
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            request_id = request.get("id")
+            response = self.handle(request)
+        except Exception as e:
+            response = _error_response(e)
+
+        return json.dumps({"id": request_id, **response}, default=str)
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        Answer one request.
+
+        Args:
+            request: Decoded request
+
+        Returns:
+            Response (without "id")
+
+        Raises:
+            RequestError: If the request is malformed
+            Exception: Whatever generation raises
+        """
+        op = request.get("op", "generate")
+        if op == "ping":
+            return {"ok": True}
+        if op == "shutdown":
+            self.shutdown_requested.set()
+            return {"ok": True}
+        if op != "generate":
+            raise RequestError(
+                f"Unknown op: {op!r}\nExpected one of: {', '.join(OPERATIONS)}"
+            )
+        return self._generate(request)
+
+    def serve_stream(self, reader: TextIO, writer: TextIO) -> None:
+        """
+        Answer requests from reader until EOF or a shutdown request.
+
+        Args:
+            reader: Request lines
+            writer: Response lines (flushed after each one)
+        """
+        for line in reader:
+            if not line.strip():
+                continue
+            writer.write(self.handle_line(line) + "\n")
+            writer.flush()
+            if self.shutdown_requested.is_set():
+                return
+
+    def serve_socket(self, path: Path) -> None:
+        """
+        Answer requests on a Unix domain socket until a shutdown request.
+
+        Args:
+            path: Socket path (replaced if it exists)
+
+        Raises:
+            OSError: If Unix domain sockets are unsupported or the socket
+                cannot be bound
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform")
+
+        path.unlink(missing_ok=True)
+        service = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                connection = cast(socket.socket, self.request)
+                with (
+                    connection.makefile("r", encoding="utf-8") as reader,
+                    connection.makefile("w", encoding="utf-8") as writer,
+                ):
+                    service.serve_stream(reader, writer)
+                if service.shutdown_requested.is_set():
+                    # shutdown() waits for serve_forever(), so not on this thread
+                    threading.Thread(target=self.server.shutdown).start()
+
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+        server.daemon_threads = True
+        try:
+            os.chmod(path, 0o600)  # Generation writes files as this user
+            server.serve_forever()
+        finally:
+            server.server_close()
+            path.unlink(missing_ok=True)
+
+    def _generate(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Run a generate request."""
+        definition = request.get("definition")
+        if not isinstance(definition, dict):
+            raise RequestError("'definition' must be a JSON object")
+        output = request.get("output")
+        if not isinstance(output, str) or not output:
+            raise RequestError("'output' must be a path")
+        output_format = request.get("format", "directory")
+        if output_format not in OUTPUT_FORMATS:
+            raise RequestError(
+                f"Unknown format: {output_format!r}\n"
+                f"Expected one of: {', '.join(OUTPUT_FORMATS)}"
+            )
+
+        meta_spec = MetaSpecDefinition.from_dict(definition)
+        output_path = Path(output)
+        stages: dict[str, float] = {}
+        self._timings.stages = stages
+        force = bool(request.get("force", False))
+        summary: WriteSummary | None = None
+        start = time.perf_counter()
+        try:
+            if output_format == "directory":
+                project = self.generator.generate(meta_spec, output_path, force=force)
+                files = len(project.files)
+                summary = project.write_summary
+            else:
+                files = self._write_archive(
+                    meta_spec, output_path, output_format, force, request.get("prefix")
+                )
+        finally:
+            self._timings.stages = None
+
+        response: dict[str, Any] = {
+            "ok": True,
+            "output": output,
+            "files": files,
+            "timings": {"total": time.perf_counter() - start, "stages": stages},
+        }
+        if summary is not None:
+            response["summary"] = {
+                "created": len(summary.created),
+                "updated": len(summary.updated),
+                "unchanged": len(summary.unchanged),
+                "removed": len(summary.removed),
+            }
+        return response
+
+    def _write_archive(
+        self,
+        meta_spec: MetaSpecDefinition,
+        path: Path,
+        archive_format: str,
+        force: bool,
+        prefix: str | None,
+    ) -> int:
+        """Write a speckit archive next to its final path, then rename it."""
+        if path.exists() and not force:
+            raise FileExistsError(
+                f"Output file already exists: {path}\nSet \"force\" to overwrite."
+            )
+
+        temp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                paths = self.generator.generate_archive(
+                    meta_spec, f, archive_format, prefix=prefix
+                )
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return len(paths)
+
+    def _record_event(self, event: GenerationEvent) -> None:
+        """Add a stage's duration to the timings of the current request."""
+        stages = getattr(self._timings, "stages", None)
+        if stages is not None and isinstance(event, StageEvent):
+            stages[event.stage] = stages.get(event.stage, 0.0) + event.duration
+
+
+def _error_response(error: Exception) -> dict[str, Any]:
+    """Describe a failed request."""
+    message = str(error)
+    if isinstance(error, json.JSONDecodeError):
+        message = f"Invalid JSON: {error}"
+    return {"ok": False, "error": {"type": type(error).__name__, "message": message}}
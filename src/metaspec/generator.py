@@ -5,22 +5,481 @@ This module implements the core generation logic that transforms
 MetaSpecDefinition into complete SpecKitProject structures.
 """
 
+import asyncio
+import dataclasses
+import functools
+import hashlib
+import itertools
+import json
+import os
 import re
+import shutil
+import tempfile
 import textwrap
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, MutableMapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import UTC, datetime
 from importlib.metadata import version
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
 from jinja2 import (
     BaseLoader,
+    ChoiceLoader,
     Environment,
     FileSystemLoader,
+    ModuleLoader,
     PackageLoader,
+    Template,
     TemplateNotFound,
+    TemplateSyntaxError,
+    meta,
+    nodes,
 )
+from jinja2.bccache import Bucket, FileSystemBytecodeCache
+
+from metaspec.instrumentation import (
+    RESTORE_STAGE,
+    GenerationEvent,
+    GenerationHook,
+    StageEvent,
+    TemplateEvent,
+)
+from metaspec.models import GenerationResult, MetaSpecDefinition, SpecKitProject
+from metaspec.output import (
+    DirectorySink,
+    OutputSink,
+    WriteSummary,
+    open_archive_sink,
+    read_manifest_metadata,
+)
+from metaspec.project_cache import ProjectCache
+from metaspec.template_graph import TemplateDependencyGraph
+from metaspec.template_index import TemplateIndex
+
+# Set to any non-empty value to disable MetaSpec's on-disk caches
+NO_CACHE_ENV = "METASPEC_NO_CACHE"
+
+# Ahead-of-time compiled templates (produced by scripts/compile-templates.py)
+COMPILED_TEMPLATES_DIR = Path(__file__).parent / "compiled_templates"
+COMPILED_MANIFEST = "manifest.json"
+
+# Options shared by every environment; compiled templates depend on them
+ENVIRONMENT_OPTIONS: dict[str, Any] = {
+    "trim_blocks": True,
+    "lstrip_blocks": True,
+    "keep_trailing_newline": True,
+}
+
+# Fixed timestamp for reproducible output (https://reproducible-builds.org)
+SOURCE_DATE_EPOCH_ENV = "SOURCE_DATE_EPOCH"
+
+# Maximum number of memoized template renders kept per Generator
+RENDER_CACHE_SIZE = 256
+
+# Default number of threads running agenerate() rendering and file I/O
+ASYNC_WORKERS = 4
+
+# Generated files marked executable (when present)
+EXECUTABLE_FILES = (
+    Path("scripts") / "init.sh",
+    Path("scripts") / "bash" / "create-new-feature.sh",
+)
+
+
+def analyze_template(ast: nodes.Template) -> frozenset[str] | None:
+    """
+    Find the context variables a parsed template reads.
+
+    Args:
+        ast: Parsed template
+
+    Returns:
+        Names of undeclared variables, or None if the template includes,
+        extends or imports other templates (its output then depends on more
+        than its own variables)
+    """
+    if any(True for _ in meta.find_referenced_templates(ast)):
+        return None
+    return frozenset(meta.find_undeclared_variables(ast))
+
+
+class TemplateEnvironment(Environment):
+    """
+    Jinja2 environment that records which variables each template reads.
+
+    Analysis runs on the AST produced while a template is compiled, so it
+    costs no extra parse. Templates loaded without parsing get their
+    analysis from TemplateBytecodeCache or the compiled template manifest.
+    """
+
+    def __init__(self, **options: Any):
+        """Initialize environment with an empty analysis table."""
+        super().__init__(**options)
+        self.template_variables: dict[str, frozenset[str] | None] = {}
+
+    def _parse(
+        self, source: str, name: str | None, filename: str | None
+    ) -> nodes.Template:
+        """Parse a template and record its variables."""
+        ast = super()._parse(source, name, filename)
+        if name is not None:
+            self.template_variables[name] = analyze_template(ast)
+        return ast
+
+
+def get_source_date_epoch() -> int | None:
+    """
+    Read the reproducible-build timestamp from the environment.
+
+    Returns:
+        Seconds since the epoch from SOURCE_DATE_EPOCH, or None if unset
+
+    Raises:
+        ValueError: If SOURCE_DATE_EPOCH is not a non-negative integer
+    """
+    value = os.environ.get(SOURCE_DATE_EPOCH_ENV, "").strip()
+    if not value:
+        return None
+    if not value.isdigit():
+        raise ValueError(
+            f"Invalid {SOURCE_DATE_EPOCH_ENV}: {value!r}\n"
+            "Expected a non-negative integer (seconds since 1970-01-01 UTC)."
+        )
+    return int(value)
 
-from metaspec.models import MetaSpecDefinition, SpecKitProject
+
+def get_template_cache_dir() -> Path:
+    """
+    Get the directory holding compiled template bytecode.
+
+    Returns:
+        Path to ~/.metaspec/cache/templates
+    """
+    return Path.home() / ".metaspec" / "cache" / "templates"
+
+
+def clear_template_cache() -> None:
+    """Remove all cached template bytecode (for every MetaSpec version)."""
+    shutil.rmtree(get_template_cache_dir(), ignore_errors=True)
+
+
+def _package_version(distribution: str) -> str:
+    """Get an installed distribution's version, or "0.0.0" if unavailable."""
+    try:
+        return version(distribution)
+    except Exception:
+        return "0.0.0"
+
+
+def compile_templates(target_dir: Path | None = None) -> list[str]:
+    """
+    Compile all bundled templates to Python modules.
+
+    Modules are written in the layout expected by jinja2.ModuleLoader,
+    together with a manifest recording the MetaSpec and Jinja2 versions
+    they were compiled for, the SHA-256 of each template's source and the
+    variables each template reads.
+    Templates with syntax errors are skipped and keep rendering from source.
+
+    Args:
+        target_dir: Directory to write compiled modules into, replacing its
+            contents (default: COMPILED_TEMPLATES_DIR)
+
+    Returns:
+        Sorted list of compiled template names
+    """
+    target_dir = target_dir or COMPILED_TEMPLATES_DIR
+    loader = PackageLoader("metaspec", "templates")
+    env = TemplateEnvironment(loader=loader, **ENVIRONMENT_OPTIONS)
+
+    shutil.rmtree(target_dir, ignore_errors=True)
+    target_dir.mkdir(parents=True)
+
+    compiled = []
+    sources = {}
+    for name in env.list_templates(filter_func=lambda n: n.endswith(".j2")):
+        source, filename, _ = loader.get_source(env, name)
+        try:
+            code = env.compile(source, name, filename, raw=True, defer_init=True)
+        except TemplateSyntaxError:
+            continue
+        (target_dir / ModuleLoader.get_module_filename(name)).write_text(
+            code, encoding="utf-8"
+        )
+        compiled.append(name)
+        sources[name] = _source_digest(source)
+
+    variables = {}
+    for name in compiled:
+        names = env.template_variables.get(name)
+        variables[name] = sorted(names) if names is not None else None
+
+    manifest = {
+        "metaspec_version": _package_version("meta-spec"),
+        "jinja2_version": _package_version("jinja2"),
+        "templates": compiled,
+        "sources": sources,
+        "variables": variables,
+    }
+    (target_dir / COMPILED_MANIFEST).write_text(
+        json.dumps(manifest, indent=2) + "\n", encoding="utf-8"
+    )
+    return compiled
+
+
+class _SourceDigests:
+    """
+    SHA-256 of template sources, re-read only when their file changes.
+
+    A source loaded from a file is hashed once and its digest reused while
+    the file keeps its (mtime_ns, size); sources without a file (e.g. from
+    a DictLoader) are hashed on every call.
+    """
+
+    def __init__(self, loader: BaseLoader):
+        """
+        Initialize cache.
+
+        Args:
+            loader: Loader of the template sources
+        """
+        self.loader = loader
+        # {name: (filename, (mtime_ns, size), digest)}
+        self._digests: dict[str, tuple[str, tuple[int, int], str]] = {}
+
+    def digest(self, environment: Environment, name: str) -> str:
+        """
+        Get the digest of a template's source.
+
+        Args:
+            environment: Environment to load the source with
+            name: Template name
+
+        Returns:
+            SHA-256 hex digest, as recorded for compiled templates
+
+        Raises:
+            TemplateNotFound: If the loader has no such template
+        """
+        cached = self._digests.get(name)
+        if cached is not None and _file_state(cached[0]) == cached[1]:
+            return cached[2]
+
+        source, filename, _ = self.loader.get_source(environment, name)
+        digest = _source_digest(source)
+        state = _file_state(filename) if filename else None
+        if filename and state is not None:
+            self._digests[name] = (filename, state, digest)
+        return digest
+
+
+class CompiledTemplateLoader(ModuleLoader):
+    """
+    ModuleLoader that can also list the templates it was compiled from.
+
+    Given the loader of the templates' sources, a compiled template is only
+    used while its source still has the checksum recorded at compile time;
+    otherwise (e.g. a template edited in a development checkout without
+    recompiling) loading it raises TemplateNotFound, so a ChoiceLoader
+    falls back to the source.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        manifest: dict[str, Any],
+        source_loader: BaseLoader | None = None,
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            directory: Directory produced by compile_templates()
+            manifest: Parsed compiled template manifest
+            source_loader: Loader of the sources the templates were compiled
+                from, to check them against the manifest (default: no check)
+        """
+        super().__init__(directory)
+        self.templates: list[str] = manifest.get("templates", [])
+        self.sources: dict[str, str] = manifest.get("sources", {})
+        self.variables: dict[str, list[str] | None] = manifest.get("variables", {})
+        self.source_loader = source_loader
+        self._source_digests = (
+            _SourceDigests(source_loader) if source_loader is not None else None
+        )
+
+    def list_templates(self) -> list[str]:
+        """Return the names of all compiled templates."""
+        return sorted(self.templates)
+
+    def load(
+        self,
+        environment: Environment,
+        name: str,
+        globals: MutableMapping[str, Any] | None = None,
+    ) -> Template:
+        """Load a compiled template and register its recorded variables."""
+        if self._source_digests is not None:
+            # Re-hashed only when the source file changed since the last load
+            digest = self._source_digests.digest(environment, name)
+            if self.sources.get(name) != digest:
+                raise TemplateNotFound(name)  # Stale: render the source
+        template = super().load(environment, name, globals)
+        if isinstance(environment, TemplateEnvironment) and name in self.variables:
+            names = self.variables[name]
+            environment.template_variables[name] = (
+                frozenset(names) if names is not None else None
+            )
+        return template
+
+
+def load_compiled_templates(
+    directory: Path | None = None,
+    source_loader: BaseLoader | None = None,
+) -> CompiledTemplateLoader | None:
+    """
+    Get a loader for ahead-of-time compiled templates.
+
+    Args:
+        directory: Directory produced by compile_templates()
+            (default: COMPILED_TEMPLATES_DIR)
+        source_loader: Loader of the templates' sources; compiled templates
+            whose source changed since they were compiled are not loaded
+
+    Returns:
+        CompiledTemplateLoader, or None if no compiled templates exist or
+        they were compiled for a different MetaSpec or Jinja2 version
+    """
+    directory = directory or COMPILED_TEMPLATES_DIR
+    try:
+        manifest = json.loads((directory / COMPILED_MANIFEST).read_text("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("metaspec_version") != _package_version(
+        "meta-spec"
+    ) or manifest.get("jinja2_version") != _package_version("jinja2"):
+        return None
+
+    return CompiledTemplateLoader(directory, manifest, source_loader)
+
+
+def _source_digest(source: str) -> str:
+    """Get the SHA-256 of a template source, as recorded for compiled templates."""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _file_state(path: str) -> tuple[int, int] | None:
+    """Get (mtime_ns, size) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class _TemplateBucket(Bucket):
+    """Bytecode bucket that remembers which template it belongs to."""
+
+    def __init__(self, environment: Environment, key: str, checksum: str, name: str):
+        super().__init__(environment, key, checksum)
+        self.template_name = name
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    On-disk cache of compiled templates.
+
+    Entries live in a per-version directory and are keyed by template name
+    and source checksum, so upgrading MetaSpec or editing a template never
+    picks up stale bytecode. Each entry has a JSON sidecar holding the
+    TemplateEnvironment variable analysis for the template.
+    """
+
+    def __init__(self, directory: Path, metaspec_version: str):
+        """
+        Initialize the cache, creating its directory if needed.
+
+        Args:
+            directory: Root cache directory
+            metaspec_version: MetaSpec version used to partition entries
+        """
+        versioned_dir = directory / metaspec_version
+        versioned_dir.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(versioned_dir), pattern="%s.cache")
+        # Cleared on the first failed write (e.g. an existing read-only
+        # directory), after which the cache is only read
+        self.writable = True
+
+    def get_bucket(
+        self,
+        environment: Environment,
+        name: str,
+        filename: str | None,
+        source: str,
+    ) -> Bucket:
+        """Return a bucket whose key includes the template source checksum."""
+        checksum = self.get_source_checksum(source)
+        key = self.get_cache_key(f"{name}|{checksum}", filename)
+        bucket = _TemplateBucket(environment, key, checksum, name)
+        self.load_bytecode(bucket)
+
+        if bucket.code is not None and isinstance(environment, TemplateEnvironment):
+            try:
+                sidecar = json.loads(self._get_sidecar_path(bucket).read_text("utf-8"))
+            except (OSError, ValueError):
+                # No analysis recorded - recompile so it gets recorded
+                bucket.reset()
+            else:
+                names = sidecar.get("variables")
+                environment.template_variables[name] = (
+                    frozenset(names) if names is not None else None
+                )
+
+        return bucket
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """
+        Store bytecode, writing the variable analysis sidecar first.
+
+        Write errors never reach the render: they disable further writes.
+        """
+        if not self.writable:
+            return
+        try:
+            self._dump(bucket)
+        except OSError:
+            self.writable = False
+
+    def _dump(self, bucket: Bucket) -> None:
+        """Write a bucket's sidecar and bytecode."""
+        environment = bucket.environment
+        if isinstance(bucket, _TemplateBucket) and isinstance(
+            environment, TemplateEnvironment
+        ):
+            names = environment.template_variables.get(bucket.template_name)
+            sidecar = {"variables": sorted(names) if names is not None else None}
+            sidecar_path = self._get_sidecar_path(bucket)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=sidecar_path.parent,
+                prefix=sidecar_path.name,
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                json.dump(sidecar, f)
+            os.replace(f.name, sidecar_path)
+
+        super().dump_bytecode(bucket)
+
+    def _get_sidecar_path(self, bucket: Bucket) -> Path:
+        """Get the path of a bucket's variable analysis sidecar."""
+        return Path(self.directory) / f"{bucket.key}.vars.json"
 
 
 class Generator:
@@ -33,36 +492,111 @@ class Generator:
     3. Create template context
     4. Render all templates
     5. Build SpecKitProject structure
-    6. Write to disk (atomic)
+    6. Write to disk (atomic, also when regenerating over a project)
+
+    Hooks (see metaspec.instrumentation) receive a StageEvent after each
+    step and a TemplateEvent for each rendered template.
     """
 
-    def __init__(self, custom_template_dir: Path | None = None):
+    def __init__(
+        self,
+        custom_template_dir: Path | None = None,
+        use_cache: bool = True,
+        render_workers: int = 0,
+        hooks: Iterable[GenerationHook] | None = None,
+        project_cache: ProjectCache | None = None,
+        source_date_epoch: int | None = None,
+        async_workers: int = ASYNC_WORKERS,
+    ):
         """
         Initialize generator with Jinja2 environment.
 
         Args:
             custom_template_dir: Optional path to custom templates
+            use_cache: Cache compiled templates under ~/.metaspec/cache
+                (also disabled by setting METASPEC_NO_CACHE)
+            render_workers: Render a project's templates on this many
+                threads (0 or 1 renders sequentially)
+            hooks: Callables receiving timing events (not passed on to
+                process pool workers)
+            project_cache: Restore previously generated speckits from this
+                cache instead of rendering them (also disabled by setting
+                METASPEC_NO_CACHE)
+            source_date_epoch: Timestamp (seconds since the epoch, UTC) to
+                use for dates in generated files and archive entries instead
+                of the current time, making output reproducible. Defaults to
+                the SOURCE_DATE_EPOCH environment variable.
+            async_workers: Threads running agenerate() rendering and file
+                I/O, i.e. how many async generations progress at once
+
+        Raises:
+            ValueError: If SOURCE_DATE_EPOCH is set but invalid
         """
+        self.custom_template_dir = custom_template_dir
+        self.use_cache = use_cache
+        self.render_workers = render_workers
+        self.hooks: list[GenerationHook] = list(hooks or [])
+        self.project_cache = None if os.environ.get(NO_CACHE_ENV) else project_cache
+        # Template sources' digests, and the fingerprint hashed from them
+        self._source_digests: _SourceDigests | None = None
+        self._templates_fingerprint: tuple[list[tuple[str, str]], str] | None = None
+        self._template_index: TemplateIndex | None = None
+        self._dependency_graph: TemplateDependencyGraph | None = None
+        if source_date_epoch is None:
+            source_date_epoch = get_source_date_epoch()
+        self.source_date_epoch = source_date_epoch
+        self._render_pool: ThreadPoolExecutor | None = None
+        self.async_workers = async_workers
+        self._async_pool: ThreadPoolExecutor | None = None
+
         # Initialize Jinja2 environment
         loader: BaseLoader
         if custom_template_dir:
             loader = FileSystemLoader(str(custom_template_dir))
         else:
             loader = PackageLoader("metaspec", "templates")
+            # Prefer templates compiled at build time, falling back to source
+            compiled_loader = load_compiled_templates(source_loader=loader)
+            if compiled_loader is not None:
+                loader = ChoiceLoader([compiled_loader, loader])
 
-        self.env = Environment(
+        self.env = TemplateEnvironment(
             loader=loader,
-            trim_blocks=True,
-            lstrip_blocks=True,
-            keep_trailing_newline=True,
+            bytecode_cache=self._create_bytecode_cache() if use_cache else None,
+            **ENVIRONMENT_OPTIONS,
         )
 
+        # Rendered output of context-independent parts, keyed by template
+        # name and the values of the variables the template actually reads
+        self._render_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._render_cache_lock = threading.Lock()
+
+    def _create_bytecode_cache(self) -> TemplateBytecodeCache | None:
+        """
+        Create the on-disk template bytecode cache.
+
+        Returns:
+            TemplateBytecodeCache, or None if caching is disabled or the
+            cache directory is not writable
+        """
+        if os.environ.get(NO_CACHE_ENV):
+            return None
+
+        try:
+            return TemplateBytecodeCache(
+                get_template_cache_dir(), self._get_metaspec_version()
+            )
+        except OSError:
+            # Read-only home directory etc. - compile in memory only
+            return None
+
     def generate(
         self,
         meta_spec: MetaSpecDefinition,
         output_dir: Path,
         force: bool = False,
         dry_run: bool = False,
+        fsync: str = "none",
     ) -> SpecKitProject:
         """
         Generate a complete speckit from meta-spec definition.
@@ -72,6 +606,7 @@ class Generator:
             output_dir: Output directory path
             force: If True, overwrite existing directory
             dry_run: If True, only return project structure without writing
+            fsync: fsync policy for writing ("none", "files" or "all")
 
         Returns:
             Generated SpecKitProject
@@ -79,21 +614,44 @@ class Generator:
         Raises:
             FileExistsError: If output_dir exists and force=False (when not dry_run)
         """
+        start = time.perf_counter()
+
         # Step 1: Check output directory (skip in dry_run mode)
         if not dry_run and output_dir.exists() and not force:
             raise FileExistsError(
                 f"Output directory already exists: {output_dir}\n"
                 "Use --force flag to overwrite."
             )
+        start = self._stage_finished(meta_spec.name, "validate", start)
+
+        # Identical inputs give identical speckits: reuse a cached one
+        fingerprint = None
+        if self.project_cache is not None and not dry_run:
+            fingerprint = self.fingerprint(meta_spec)
+            cached = self.project_cache.restore(
+                fingerprint, output_dir, force=force, fsync=fsync
+            )
+            if cached is not None:
+                self._stage_finished(
+                    meta_spec.name, RESTORE_STAGE, start, cached.files.values()
+                )
+                return cached
 
         # Step 2: Select templates
         template_map = self._select_templates(meta_spec)
+        start = self._stage_finished(
+            meta_spec.name, "select_templates", start, files=len(template_map)
+        )
 
         # Step 3: Create template context
         context = self._create_template_context(meta_spec)
+        start = self._stage_finished(meta_spec.name, "create_context", start)
 
         # Step 4: Render all templates
         rendered_files = self._render_templates(template_map, context)
+        start = self._stage_finished(
+            meta_spec.name, "render", start, rendered_files.values()
+        )
 
         # Step 5: Build SpecKitProject
         project = self._construct_project(
@@ -102,14 +660,620 @@ class Generator:
             rendered_files=rendered_files,
             context=context,
         )
+        project.metadata = self._project_metadata(template_map, context)
+        start = self._stage_finished(
+            meta_spec.name, "construct_project", start, project.files.values()
+        )
 
         # Step 6: Write to disk (atomic) - skip in dry_run mode
         if not dry_run:
             # Note: write_to_disk already includes executable permissions
-            project.write_to_disk(force=force)
+            project.write_to_disk(force=force, fsync=fsync)
+            self._stage_finished(meta_spec.name, "write", start, project.files.values())
+
+        if self.project_cache is not None and fingerprint is not None:
+            try:
+                self.project_cache.store(fingerprint, project)
+            except OSError:
+                # Caching is best effort (read-only home directory etc.)
+                pass
+
+        return project
+
+    async def agenerate(
+        self,
+        meta_spec: MetaSpecDefinition,
+        output_dir: Path,
+        force: bool = False,
+        dry_run: bool = False,
+        fsync: str = "none",
+    ) -> SpecKitProject:
+        """
+        Generate a speckit without blocking the event loop.
+
+        Same steps and result as generate(). Fingerprinting, rendering and
+        writing run on the generator's async pool (async_workers threads), so
+        any number of calls may be awaited concurrently while at most
+        async_workers of them render or write at a time.
+
+        Args:
+            meta_spec: Parsed and validated meta-spec definition
+            output_dir: Output directory path
+            force: If True, overwrite existing directory
+            dry_run: If True, only return project structure without writing
+            fsync: fsync policy for writing ("none", "files" or "all")
+
+        Returns:
+            Generated SpecKitProject
+
+        Raises:
+            FileExistsError: If output_dir exists and force=False (when not dry_run)
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_async_pool()
+
+        def run(func: Any, *args: Any, **kwargs: Any) -> asyncio.Future[Any]:
+            return loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
+        if not dry_run and not force and await run(output_dir.exists):
+            raise FileExistsError(
+                f"Output directory already exists: {output_dir}\n"
+                "Use --force flag to overwrite."
+            )
+
+        fingerprint = None
+        if self.project_cache is not None and not dry_run:
+            start = time.perf_counter()
+            # Hashing the templates stats (and may read) every source file
+            fingerprint = await run(self.fingerprint, meta_spec)
+            cached: SpecKitProject | None = await run(
+                self.project_cache.restore,
+                fingerprint,
+                output_dir,
+                force=force,
+                fsync=fsync,
+            )
+            if cached is not None:
+                self._stage_finished(
+                    meta_spec.name, RESTORE_STAGE, start, cached.files.values()
+                )
+                return cached
+
+        # Steps 1-5 (the output directory was checked above)
+        project: SpecKitProject = await run(
+            self.generate, meta_spec, output_dir, dry_run=True
+        )
+
+        # Step 6: Write to disk
+        if not dry_run:
+            start = time.perf_counter()
+            await project.awrite_to_disk(force=force, fsync=fsync, executor=pool)
+            self._stage_finished(meta_spec.name, "write", start, project.files.values())
+
+        if self.project_cache is not None and fingerprint is not None:
+            try:
+                await run(self.project_cache.store, fingerprint, project)
+            except OSError:
+                pass  # Caching is best effort
 
         return project
 
+    def _get_async_pool(self) -> ThreadPoolExecutor:
+        """Get the thread pool agenerate() offloads work to, creating it once."""
+        with self._render_cache_lock:
+            if self._async_pool is None:
+                self._async_pool = ThreadPoolExecutor(
+                    max_workers=self.async_workers,
+                    thread_name_prefix="metaspec-async",
+                )
+            return self._async_pool
+
+    def regenerate(
+        self,
+        meta_spec: MetaSpecDefinition,
+        output_dir: Path,
+        fsync: str = "none",
+    ) -> WriteSummary:
+        """
+        Update a generated speckit, re-rendering only what the change affects.
+
+        The manifest of a generated speckit records a digest of every
+        template context value. Templates that read none of the values that
+        changed since (see dependency_graph) keep their files as they are,
+        unless those were edited by hand. Falls back to a full generation
+        when output_dir has no such record or the templates changed.
+
+        Args:
+            meta_spec: Parsed and validated meta-spec definition
+            output_dir: Output directory (created if missing)
+            fsync: fsync policy for writing ("none", "files" or "all")
+
+        Returns:
+            What the update changed on disk
+
+        Raises:
+            TemplateNotFound: If a required template file is missing
+        """
+        previous = read_manifest_metadata(output_dir)
+        previous_context = previous.get("context")
+        previous_templates = previous.get("templates")
+        if (
+            previous.get("templates_fingerprint") != self._get_templates_fingerprint()
+            or not isinstance(previous_context, dict)
+            or not isinstance(previous_templates, dict)
+        ):
+            project = self.generate(meta_spec, output_dir, force=True, fsync=fsync)
+            return project.write_summary or WriteSummary()
+
+        template_map = self._select_templates(meta_spec)
+        context = self._create_template_context(meta_spec)
+        metadata = self._project_metadata(template_map, context)
+        changed_keys = {
+            key
+            for key, digest in metadata["context"].items()
+            if previous_context.get(key) != digest
+        }
+
+        with DirectorySink(output_dir, force=True, fsync=fsync) as sink:
+            sink.metadata.update(metadata)
+            paths = []
+            for template_path, output_path in template_map.items():
+                path = Path(output_path)
+                executable = path in EXECUTABLE_FILES
+                if (
+                    previous_templates.get(output_path) == template_path
+                    and not self._is_affected(template_path, changed_keys)
+                    and sink.keep_file(path, executable=executable)
+                ):
+                    paths.append(path)
+                    continue
+
+                content = self._render_entry(template_path, context)
+                if content is not None:
+                    sink.write_file(path, content, executable=executable)
+                    paths.append(path)
+
+            # Generated in code and cheap: always rewrite (the sink leaves
+            # unchanged files alone instead of writing them)
+            extra_files = self._create_extra_files(context["package_name"], context)
+            for path, content in extra_files.items():
+                sink.write_file(path, content, executable=path in EXECUTABLE_FILES)
+                paths.append(path)
+
+            for dir_path in self._project_directories(context["package_name"], paths):
+                sink.add_directory(dir_path)
+
+        return sink.summary
+
+    @property
+    def dependency_graph(self) -> TemplateDependencyGraph:
+        """Context keys each template reads, computed on first use."""
+        if self._dependency_graph is None:
+            self._dependency_graph = TemplateDependencyGraph(self.env)
+        return self._dependency_graph
+
+    def _is_affected(self, template_path: str, changed_keys: set[str]) -> bool:
+        """Check whether a template's output may depend on changed context keys."""
+        try:
+            return bool(self.dependency_graph.affected([template_path], changed_keys))
+        except TemplateNotFound:
+            return True  # Missing optional template; let rendering decide
+
+    def _project_metadata(
+        self, template_map: dict[str, str], context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Get the generation record stored in a speckit's manifest.
+
+        Args:
+            template_map: Dict of {template_path: output_path}
+            context: Template variables
+
+        Returns:
+            Dict with the templates fingerprint, {output_path: template_path}
+            and a digest of each context value
+        """
+        return {
+            "templates_fingerprint": self._get_templates_fingerprint(),
+            "templates": {
+                output_path: template_path
+                for template_path, output_path in template_map.items()
+            },
+            "context": {
+                key: hashlib.sha256(
+                    json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+                ).hexdigest()
+                for key, value in context.items()
+            },
+        }
+
+    @property
+    def template_index(self) -> TemplateIndex:
+        """Index of the available templates, built on first use."""
+        if self._template_index is None:
+            self._template_index = TemplateIndex.from_environment(self.env)
+        return self._template_index
+
+    def check_slash_commands(self, meta_spec: MetaSpecDefinition) -> None:
+        """
+        Check that the library of every slash command provides its template.
+
+        Args:
+            meta_spec: Meta-spec definition
+
+        Raises:
+            ValueError: If a slash command names an unknown source, or a
+                source without a template for the command
+        """
+        index = self.template_index
+        for sc in meta_spec.slash_commands:
+            source = index.library_root(sc.source, sc.name)
+            if f"{source}/templates/{sc.name}-template.md.j2" not in index:
+                raise ValueError(
+                    f"Slash command '{sc.name}': source '{sc.source}' has no "
+                    f"template for it (expected {source}/templates/"
+                    f"{sc.name}-template.md.j2)"
+                )
+
+    def fingerprint(self, meta_spec: MetaSpecDefinition) -> str:
+        """
+        Get a stable fingerprint of everything a generated speckit depends on.
+
+        Covers the definition (canonical JSON), the MetaSpec version, the
+        template set (names and sources) and the generation date, which
+        templates stamp into their output.
+
+        Args:
+            meta_spec: Parsed and validated meta-spec definition
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = {
+            "definition": dataclasses.asdict(meta_spec),
+            "metaspec_version": self._get_metaspec_version(),
+            "templates": self._get_templates_fingerprint(),
+            "date": self._generation_date().date().isoformat(),
+        }
+        canonical = json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _get_templates_fingerprint(self) -> str:
+        """
+        Hash the names and sources of all templates.
+
+        Sources are only re-read when their file's (mtime_ns, size) changed
+        (see _SourceDigests), and the fingerprint is only rehashed when a
+        template was added, removed or changed.
+        """
+        if self._source_digests is None:
+            loader: BaseLoader
+            if self.custom_template_dir:
+                loader = FileSystemLoader(str(self.custom_template_dir))
+            else:
+                # Always hash sources; compiled templates are built from them
+                loader = PackageLoader("metaspec", "templates")
+            self._source_digests = _SourceDigests(loader)
+
+        source_digests = self._source_digests
+        digests = [
+            (name, source_digests.digest(self.env, name))
+            for name in source_digests.loader.list_templates()
+        ]
+        if self._templates_fingerprint is None or (
+            self._templates_fingerprint[0] != digests
+        ):
+            fingerprint = hashlib.sha256()
+            for name, digest in digests:
+                fingerprint.update(name.encode("utf-8") + b"\0")
+                fingerprint.update(bytes.fromhex(digest))
+            self._templates_fingerprint = (digests, fingerprint.hexdigest())
+
+        return self._templates_fingerprint[1]
+
+    def _generation_date(self) -> datetime:
+        """Get the date stamped into generated files."""
+        if self.source_date_epoch is not None:
+            return datetime.fromtimestamp(self.source_date_epoch, tz=UTC)
+        return datetime.now()
+
+    def add_hook(self, hook: GenerationHook) -> None:
+        """
+        Register a hook receiving timing events.
+
+        Args:
+            hook: Callable taking a StageEvent or TemplateEvent
+        """
+        self.hooks.append(hook)
+
+    def _emit(self, event: GenerationEvent) -> None:
+        """Pass an event to every hook."""
+        for hook in self.hooks:
+            hook(event)
+
+    def _stage_finished(
+        self,
+        speckit: str,
+        stage: str,
+        start: float,
+        contents: Iterable[str] = (),
+        files: int | None = None,
+        size: int | None = None,
+    ) -> float:
+        """
+        Report a finished stage to the hooks.
+
+        Args:
+            speckit: Speckit name
+            stage: Stage name
+            start: perf_counter() value when the stage started
+            contents: Files produced by the stage (for file and byte counts)
+            files: File count, if contents are not given
+            size: UTF-8 byte count, if contents are not given
+
+        Returns:
+            perf_counter() value to use as the next stage's start
+        """
+        now = time.perf_counter()
+        if self.hooks:
+            sizes = [len(content.encode("utf-8")) for content in contents]
+            self._emit(
+                StageEvent(
+                    speckit=speckit,
+                    stage=stage,
+                    duration=now - start,
+                    files=len(sizes) if files is None else files,
+                    bytes=sum(sizes) if size is None else size,
+                )
+            )
+        return now
+
+    def stream(self, meta_spec: MetaSpecDefinition) -> Iterator[tuple[Path, str]]:
+        """
+        Render a speckit lazily, one chunk at a time.
+
+        Templates are rendered with Jinja's Template.generate(), so at most
+        one template's output is in flight (memoized templates are yielded
+        from the render cache as a single chunk). Every file yields at least
+        one chunk, and all chunks of a file are consecutive. Rendering is
+        sequential regardless of render_workers.
+
+        Args:
+            meta_spec: Parsed and validated meta-spec definition
+
+        Yields:
+            (relative_path, chunk) pairs, file by file
+
+        Raises:
+            TemplateNotFound: If a required template file is missing
+        """
+        context = self._create_template_context(meta_spec)
+        return self._stream_files(self._select_templates(meta_spec), context)
+
+    def _stream_files(
+        self, template_map: dict[str, str], context: dict[str, Any]
+    ) -> Iterator[tuple[Path, str]]:
+        """Yield (relative_path, chunk) pairs for every file of a project."""
+        for template_path, output_path in template_map.items():
+            chunks = self._stream_entry(template_path, context)
+            if chunks is None:
+                continue
+
+            path = Path(output_path)
+            empty = True
+            for chunk in chunks:
+                if chunk:
+                    empty = False
+                    yield path, chunk
+            if empty:
+                yield path, ""
+
+        yield from self._create_extra_files(context["package_name"], context).items()
+
+    def generate_into(
+        self, meta_spec: MetaSpecDefinition, sink: OutputSink
+    ) -> list[Path]:
+        """
+        Stream a speckit into an open sink without building it in memory.
+
+        Produces the same files, directories and executable bits as
+        generate() followed by SpecKitProject.write_to(sink), and reports the
+        same stages to the hooks. Rendering and writing interleave, so the
+        render stage is the time spent producing chunks and the write stage
+        the time the sink spent on them.
+
+        Args:
+            meta_spec: Parsed and validated meta-spec definition
+            sink: Open output sink (committed by the caller)
+
+        Returns:
+            Relative paths of the files written, in write order
+
+        Raises:
+            TemplateNotFound: If a required template file is missing
+        """
+        name = meta_spec.name
+        start = self._stage_finished(name, "validate", time.perf_counter())
+
+        template_map = self._select_templates(meta_spec)
+        start = self._stage_finished(
+            name, "select_templates", start, files=len(template_map)
+        )
+
+        context = self._create_template_context(meta_spec)
+        start = self._stage_finished(name, "create_context", start)
+
+        render_time = 0.0
+        rendered = 0  # UTF-8 bytes
+
+        def timed(chunks: Iterator[tuple[Path, str]]) -> Iterator[tuple[Path, str]]:
+            nonlocal render_time, rendered
+            while True:
+                begin = time.perf_counter()
+                item = next(chunks, None)
+                render_time += time.perf_counter() - begin
+                if item is None:
+                    return
+                rendered += len(item[1].encode("utf-8"))
+                yield item
+
+        chunks = self._stream_files(template_map, context)
+        if self.hooks:
+            chunks = timed(chunks)
+
+        paths = []
+        for path, group in itertools.groupby(chunks, key=lambda item: item[0]):
+            sink.write_file(
+                path,
+                (chunk for _, chunk in group),
+                executable=path in EXECUTABLE_FILES,
+            )
+            paths.append(path)
+        write_time = time.perf_counter() - start - render_time
+
+        start = time.perf_counter()
+        sink.metadata.update(self._project_metadata(template_map, context))
+        directories = self._project_directories(context["package_name"], paths)
+        construct_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for dir_path in directories:
+            sink.add_directory(dir_path)
+        write_time += time.perf_counter() - start
+
+        now = time.perf_counter()
+        for stage, duration in (
+            ("render", render_time),
+            ("construct_project", construct_time),
+            ("write", write_time),
+        ):
+            self._stage_finished(
+                name, stage, now - duration, files=len(paths), size=rendered
+            )
+
+        return paths
+
+    def generate_archive(
+        self,
+        meta_spec: MetaSpecDefinition,
+        fileobj: IO[bytes],
+        archive_format: str = "zip",
+        prefix: str | None = None,
+    ) -> list[Path]:
+        """
+        Stream a speckit into a zip or tar.gz archive.
+
+        The archive is written in one pass with no temporary files; fileobj
+        may be an in-memory buffer, a socket file or a response body. With
+        source_date_epoch set, the archive is byte-identical across runs.
+
+        Args:
+            meta_spec: Parsed and validated meta-spec definition
+            fileobj: Writable binary stream (left open)
+            archive_format: "zip" or "tar.gz"
+            prefix: Top-level directory in the archive (default: meta_spec.name)
+
+        Returns:
+            Relative paths of the files written
+
+        Raises:
+            ValueError: If archive_format is not supported, or prefix is not
+                a safe directory name (see check_archive_prefix())
+            TemplateNotFound: If a required template file is missing
+        """
+        if prefix is None:
+            prefix = meta_spec.name
+
+        with open_archive_sink(
+            fileobj, archive_format, prefix=prefix, mtime=self.source_date_epoch
+        ) as sink:
+            return self.generate_into(meta_spec, sink)
+
+    def generate_many(
+        self,
+        jobs: Iterable[tuple[MetaSpecDefinition, Path]],
+        force: bool = False,
+        dry_run: bool = False,
+        max_workers: int | None = None,
+        use_processes: bool = False,
+        stream: bool = False,
+    ) -> list[GenerationResult]:
+        """
+        Generate several speckits in parallel.
+
+        Threads share this generator's environment and render cache.
+        Processes each build one generator with the same settings and reuse
+        it for every job they run, which avoids the GIL for large batches.
+        A failing job is reported in its result and never aborts the batch.
+
+        Args:
+            jobs: (meta_spec, output_dir) pairs
+            force: If True, overwrite existing directories
+            dry_run: If True, only build project structures without writing
+            max_workers: Pool size (default: executor default)
+            use_processes: Use a process pool instead of a thread pool
+            stream: Write each speckit with generate_into() instead of
+                building it in memory; results carry a write summary and
+                no project (ignored when dry_run is set)
+
+        Returns:
+            One GenerationResult per job, in input order
+        """
+        executor: Executor
+        if use_processes:
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker_generator,
+                initargs=(
+                    self.custom_template_dir,
+                    self.use_cache,
+                    self.source_date_epoch,
+                ),
+            )
+            generate_one = _generate_in_worker
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            generate_one = self._generate_one
+
+        with executor:
+            futures = [
+                executor.submit(
+                    generate_one, meta_spec, output_dir, force, dry_run, stream
+                )
+                for meta_spec, output_dir in jobs
+            ]
+            return [future.result() for future in futures]
+
+    def _generate_one(
+        self,
+        meta_spec: MetaSpecDefinition,
+        output_dir: Path,
+        force: bool,
+        dry_run: bool,
+        stream: bool = False,
+    ) -> GenerationResult:
+        """Generate one speckit, capturing timing and any error."""
+        result = GenerationResult(name=meta_spec.name, output_dir=output_dir)
+        start = time.perf_counter()
+        try:
+            if stream and not dry_run:
+                with DirectorySink(output_dir, force=force) as sink:
+                    self.generate_into(meta_spec, sink)
+                result.summary = sink.summary
+            else:
+                result.project = self.generate(
+                    meta_spec=meta_spec,
+                    output_dir=output_dir,
+                    force=force,
+                    dry_run=dry_run,
+                )
+        except Exception as e:
+            result.error = e
+        result.duration = time.perf_counter() - start
+        return result
+
     def _get_metaspec_version(self) -> str:
         """
         Get the MetaSpec package version from metadata.
@@ -117,11 +1281,8 @@ class Generator:
         Returns:
             Version string (e.g., "0.5.1")
         """
-        try:
-            return version("meta-spec")
-        except Exception:
-            # Fallback to a default version if package metadata is not available
-            return "0.0.0"
+        # Falls back to "0.0.0" if package metadata is not available
+        return _package_version("meta-spec")
 
     def _create_template_context(self, meta_spec: MetaSpecDefinition) -> dict[str, Any]:
         """
@@ -190,6 +1351,7 @@ class Generator:
                     }
                 )
 
+        generation_date = self._generation_date()
         return {
             "name": meta_spec.name,
             "package_name": package_name,
@@ -201,8 +1363,8 @@ class Generator:
             "cli_commands": cli_commands_list,
             "slash_commands": slash_commands_list,
             "dependencies": meta_spec.dependencies or [],
-            "year": datetime.now().year,
-            "date": datetime.now().date().isoformat(),
+            "year": generation_date.year,
+            "date": generation_date.date().isoformat(),
             "metaspec_version": self._get_metaspec_version(),
         }
 
@@ -243,122 +1405,47 @@ class Generator:
 
         # 2. Library templates (dynamically based on slash_commands)
         # Only copy templates and commands that are referenced by slash commands
-        if meta_spec.slash_commands:
-            # Define command-to-subdirectory mapping for library/generic
-            generic_command_map = {
-                # Greenfield commands (8)
-                "constitution": "greenfield",
-                "specify": "greenfield",
-                "clarify": "greenfield",
-                "plan": "greenfield",
-                "tasks": "greenfield",
-                "generate": "greenfield",
-                "validate": "greenfield",
-                "analyze": "greenfield",
-                # Brownfield commands (3)
-                "proposal": "brownfield",
-                "apply": "brownfield",
-                "archive": "brownfield",
-            }
-
-            for sc in meta_spec.slash_commands:
-                # Use source field from slash command (defaults to "generic")
-                source = f"library/{sc.source}"
-
-                # For library/generic, check if command needs subdirectory routing
-                if sc.source == "generic" and sc.name in generic_command_map:
-                    subdir = generic_command_map[sc.name]
-                    source = f"library/generic/{subdir}"
-
-                # Copy template file (required)
-                # Organize by source to maintain specification system boundaries
-                template_name = f"{sc.name}-template.md"
-                source_template = f"{source}/templates/{template_name}.j2"
-                output_template = f"templates/{sc.source}/templates/{template_name}"
-                template_map[source_template] = output_template
-
-                # Copy command file (optional - some sources like "generic" may not have commands)
-                # Organize by source to avoid naming conflicts
-                command_name = f"{sc.name}.md"
-                source_command = f"{source}/commands/{command_name}.j2"
+        index = self.template_index
+        for sc in meta_spec.slash_commands:
+            # Library providing the command; for nested libraries such as
+            # library/generic/{greenfield,brownfield} the index routes
+            # "generic" commands to the subdirectory that has them
+            source = index.library_root(sc.source, sc.name)
+
+            # Copy template file (required)
+            # Organize by source to maintain specification system boundaries
+            template_name = f"{sc.name}-template.md"
+            source_template = f"{source}/templates/{template_name}.j2"
+            output_template = f"templates/{sc.source}/templates/{template_name}"
+            template_map[source_template] = output_template
+
+            # Copy command file (optional - some sources like "generic" may not have commands)
+            # Organize by source to avoid naming conflicts
+            command_name = f"{sc.name}.md"
+            source_command = f"{source}/commands/{command_name}.j2"
+            if source_command in index:
                 output_command = f"templates/{sc.source}/commands/{command_name}"
-                # Only add to template_map if command file exists
-                # The actual existence check happens during rendering, where missing files are skipped
                 template_map[source_command] = output_command
 
         # 3. MetaSpec commands and templates for speckit development → .metaspec/
         # These provide AI-assisted workflow for developing the speckit itself
-        # Three-layer architecture:
-        #   - SDS (Spec-Driven Specification): 8 commands for specification definition
-        #   - SDD (Spec-Driven Development): 8 commands for toolkit development
-        #   - Evolution: 3 shared commands for specification evolution
-
-        # SDS commands (8): Domain specification definition
-        # File naming: metaspec.sds.{command}.md to use /metaspec.sds.{command} prefix
-        sds_commands = [
-            "constitution",  # Define specification design principles
-            "specify",  # Define specification entities and operations
-            "clarify",  # Resolve specification ambiguities
-            "plan",  # Plan specification architecture and sub-specifications
-            "tasks",  # Break down specification work
-            "implement",  # Write specification documents
-            "checklist",  # Generate quality checklist for specification
-            "analyze",  # Check specification consistency
-        ]
-
-        for cmd in sds_commands:
-            source_path = f"meta/sds/commands/{cmd}.md.j2"
-            output_path = f".metaspec/commands/metaspec.sds.{cmd}.md"
-            template_map[source_path] = output_path
-
-        # SDD commands (8): Toolkit development workflow
-        # File naming: metaspec.sdd.{command}.md to use /metaspec.sdd.{command} prefix
-        sdd_commands = [
-            "constitution",  # Define toolkit principles
-            "specify",  # Define toolkit specifications
-            "clarify",  # Resolve toolkit ambiguities
-            "plan",  # Plan implementation
-            "tasks",  # Break down tasks
-            "implement",  # Execute implementation
-            "checklist",  # Validate quality
-            "analyze",  # Check consistency
-        ]
-
-        for cmd in sdd_commands:
-            source_path = f"meta/sdd/commands/{cmd}.md.j2"
-            output_path = f".metaspec/commands/metaspec.sdd.{cmd}.md"
-            template_map[source_path] = output_path
-
-        # Evolution commands (3): Shared specification evolution commands
-        # File naming: metaspec.evolution.{command}.md (unified naming pattern)
-        # These commands support both SDS and SDD through --type parameter
-        evolution_commands = [
-            "proposal",  # Propose changes (SDS or SDD)
-            "apply",  # Apply changes
-            "archive",  # Archive changes
-        ]
-
-        for cmd in evolution_commands:
-            source_path = f"meta/evolution/commands/{cmd}.md.j2"
-            output_path = f".metaspec/commands/metaspec.evolution.{cmd}.md"
-            template_map[source_path] = output_path
+        # Command groups (meta/<group>/commands/), e.g.:
+        #   - SDS (Spec-Driven Specification): specification definition
+        #   - SDD (Spec-Driven Development): toolkit development
+        #   - Evolution: shared specification evolution commands
+        # File naming: metaspec.{group}.{command}.md for the
+        # /metaspec.{group}.{command} prefix
+        for group, entries in index.meta_command_groups().items():
+            for entry in entries:
+                output_path = f".metaspec/commands/metaspec.{group}.{entry.name}"
+                template_map[entry.path] = output_path
 
         # MetaSpec README.md (Developer guide for speckit developers)
         template_map["base/.metaspec/README.md.j2"] = ".metaspec/README.md"
 
         # MetaSpec templates (output formats for MetaSpec commands)
-        metaspec_templates = [
-            "constitution-template.md",  # Constitution template
-            "spec-template.md",  # Spec template
-            "plan-template.md",  # Plan template
-            "tasks-template.md",  # Tasks template
-            "checklist-template.md",  # Checklist template
-        ]
-
-        for tpl in metaspec_templates:
-            source_path = f"meta/templates/{tpl}.j2"
-            output_path = f".metaspec/templates/{tpl}"
-            template_map[source_path] = output_path
+        for entry in index.meta_templates():
+            template_map[entry.path] = f".metaspec/templates/{entry.name}"
 
         return template_map
 
@@ -378,32 +1465,264 @@ class Generator:
         Raises:
             TemplateNotFound: If a required template file is missing
         """
-        rendered = {}
+        contents: Iterable[str | None]
+        if self.render_workers > 1 and len(template_map) > 1:
+            # Render concurrently; map() keeps results in template_map order
+            # and re-raises the first failure in that order
+            contents = self._get_render_pool().map(
+                lambda template_path: self._render_entry(template_path, context),
+                template_map,
+            )
+        else:
+            contents = (
+                self._render_entry(template_path, context)
+                for template_path in template_map
+            )
 
-        for template_path, output_path in template_map.items():
-            try:
-                # Render template using Jinja2 environment
-                template = self.env.get_template(template_path)
-                content = template.render(**context)
+        rendered = {}
+        for output_path, content in zip(template_map.values(), contents, strict=True):
+            if content is not None:
                 rendered[output_path] = content
-            except TemplateNotFound as e:
-                # Command files from library are optional (e.g., library/generic/commands/)
-                # Skip silently if not found
-                if (
-                    template_path.startswith("library/")
-                    and "/commands/" in template_path
-                ):
-                    continue
-
-                # All other templates are required
-                raise TemplateNotFound(
-                    f"Template not found: {template_path}\n"
-                    f"Expected location: templates/{template_path}\n"
-                    f"This may indicate a missing template file or incorrect template path."
-                ) from e
 
         return rendered
 
+    def _render_entry(self, template_path: str, context: dict[str, Any]) -> str | None:
+        """
+        Render one entry of a template map.
+
+        Args:
+            template_path: Template name
+            context: Template variables
+
+        Returns:
+            Rendered content, or None for a missing optional template
+
+        Raises:
+            TemplateNotFound: If a required template file is missing
+        """
+        try:
+            return self._render_template(template_path, context)
+        except TemplateNotFound as e:
+            self._check_optional_template(template_path, e)
+            return None
+
+    def _stream_entry(
+        self, template_path: str, context: dict[str, Any]
+    ) -> Iterator[str] | None:
+        """
+        Stream one entry of a template map.
+
+        Args:
+            template_path: Template name
+            context: Template variables
+
+        Returns:
+            Iterator of content chunks, or None for a missing optional template
+
+        Raises:
+            TemplateNotFound: If a required template file is missing
+        """
+        try:
+            return self._stream_template(template_path, context)
+        except TemplateNotFound as e:
+            self._check_optional_template(template_path, e)
+            return None
+
+    def _check_optional_template(
+        self, template_path: str, error: TemplateNotFound
+    ) -> None:
+        """
+        Allow a missing template if it is optional.
+
+        Raises:
+            TemplateNotFound: If the template is required
+        """
+        # Command files from library are optional (e.g., library/generic/commands/)
+        # Skip silently if not found
+        if template_path.startswith("library/") and "/commands/" in template_path:
+            return
+
+        # All other templates are required
+        raise TemplateNotFound(
+            f"Template not found: {template_path}\n"
+            f"Expected location: templates/{template_path}\n"
+            f"This may indicate a missing template file or incorrect template path."
+        ) from error
+
+    def _get_render_pool(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for concurrent rendering, creating it once."""
+        with self._render_cache_lock:
+            if self._render_pool is None:
+                self._render_pool = ThreadPoolExecutor(
+                    max_workers=self.render_workers,
+                    thread_name_prefix="metaspec-render",
+                )
+            return self._render_pool
+
+    def _render_template(self, template_path: str, context: dict[str, Any]) -> str:
+        """
+        Render a single template, reusing earlier output when possible.
+
+        Output is memoized by the values of the variables the template reads,
+        so templates that ignore most of the definition (e.g. the large
+        .metaspec/commands/ templates) render once per Generator.
+
+        Args:
+            template_path: Template name
+            context: Template variables
+
+        Returns:
+            Rendered content
+
+        Raises:
+            TemplateNotFound: If the template does not exist
+        """
+        start = time.perf_counter()
+        template = self.env.get_template(template_path)
+
+        # None if the template's variables are unknown or it includes other
+        # templates - then it is always rendered
+        key = self._render_cache_key(template_path, context)
+        content = None if key is None else self._get_cached_render(key)
+        cached = content is not None
+
+        if content is None:
+            content = template.render(**context)
+            if key is not None:
+                self._cache_render(key, content)
+
+        if self.hooks:
+            self._emit(
+                TemplateEvent(
+                    speckit=context.get("name", ""),
+                    template=template_path,
+                    duration=time.perf_counter() - start,
+                    bytes=len(content.encode("utf-8")),
+                    cached=cached,
+                )
+            )
+
+        return content
+
+    def _stream_template(
+        self, template_path: str, context: dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Render a single template chunk by chunk.
+
+        Memoized output is returned as one chunk; otherwise chunks come from
+        Template.generate() and, if the template is memoizable, are joined
+        into the render cache once the template is exhausted.
+
+        Args:
+            template_path: Template name
+            context: Template variables
+
+        Returns:
+            Iterator of content chunks
+
+        Raises:
+            TemplateNotFound: If the template does not exist
+        """
+        start = time.perf_counter()
+        # Resolved eagerly so a missing template raises here, not mid-stream
+        template = self.env.get_template(template_path)
+
+        key = self._render_cache_key(template_path, context)
+        content = None if key is None else self._get_cached_render(key)
+
+        chunks: Iterator[str]
+        if content is not None:
+            chunks = iter([content])
+        elif key is None:
+            chunks = template.generate(**context)
+        else:
+            chunks = self._generate_and_cache(template, context, key)
+
+        if self.hooks:
+            chunks = self._timed_chunks(
+                TemplateEvent(
+                    speckit=context.get("name", ""),
+                    template=template_path,
+                    duration=time.perf_counter() - start,
+                    bytes=0,
+                    cached=content is not None,
+                ),
+                chunks,
+            )
+
+        return chunks
+
+    def _timed_chunks(
+        self, event: TemplateEvent, chunks: Iterator[str]
+    ) -> Iterator[str]:
+        """
+        Yield chunks, then report the template once they are exhausted.
+
+        Only time spent producing chunks counts, not time the consumer
+        spends between them.
+
+        Args:
+            event: Event with the time spent before the first chunk
+            chunks: Template output
+        """
+        duration = event.duration
+        size = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                duration += time.perf_counter() - start
+                break
+            duration += time.perf_counter() - start
+            size += len(chunk.encode("utf-8"))
+            yield chunk
+
+        self._emit(dataclasses.replace(event, duration=duration, bytes=size))
+
+    def _generate_and_cache(
+        self, template: Template, context: dict[str, Any], key: tuple[str, str]
+    ) -> Iterator[str]:
+        """Yield a template's chunks, caching the full output at the end."""
+        chunks = []
+        for chunk in template.generate(**context):
+            chunks.append(chunk)
+            yield chunk
+        self._cache_render(key, "".join(chunks))
+
+    def _render_cache_key(
+        self, template_path: str, context: dict[str, Any]
+    ) -> tuple[str, str] | None:
+        """
+        Get the render cache key of a template and context.
+
+        Returns:
+            (template name, JSON of the variables it reads), or None if the
+            template's variables are unknown
+        """
+        variables = self.env.template_variables.get(template_path)
+        if variables is None:
+            return None
+
+        used = {name: context.get(name) for name in variables}
+        return (template_path, json.dumps(used, sort_keys=True, default=str))
+
+    def _get_cached_render(self, key: tuple[str, str]) -> str | None:
+        """Get memoized output, marking it recently used."""
+        with self._render_cache_lock:
+            content = self._render_cache.get(key)
+            if content is not None:
+                self._render_cache.move_to_end(key)
+            return content
+
+    def _cache_render(self, key: tuple[str, str], content: str) -> None:
+        """Memoize output, evicting the least recently used entry if full."""
+        with self._render_cache_lock:
+            self._render_cache[key] = content
+            if len(self._render_cache) > RENDER_CACHE_SIZE:
+                self._render_cache.popitem(last=False)
+
     def _construct_project(
         self,
         output_dir: Path,
@@ -423,63 +1742,72 @@ class Generator:
         Returns:
             SpecKitProject instance
         """
-        files = {}
-        directories = set()
-        executable_files = []
-
-        # Add rendered files
-        for relative_path, content in rendered_files.items():
-            path = Path(relative_path)
-            files[path] = content
+        files = {
+            Path(relative_path): content
+            for relative_path, content in rendered_files.items()
+        }
+        files.update(self._create_extra_files(package_name, context))
 
-            # Track directory
-            if path.parent != Path("."):
-                directories.add(path.parent)
+        return SpecKitProject(
+            root_path=output_dir,
+            files=files,
+            directories=self._project_directories(package_name, files),
+            executable_files=[path for path in EXECUTABLE_FILES if path in files],
+        )
 
-        # Add source package structure
-        src_dir = Path("src") / package_name
-        directories.add(src_dir)
+    def _create_extra_files(
+        self, package_name: str, context: dict[str, Any] | None
+    ) -> dict[Path, str]:
+        """
+        Create the files generated in code rather than from templates.
 
-        # Create __init__.py
-        init_path = src_dir / "__init__.py"
-        files[init_path] = f'"""Package: {package_name}"""\n\n__version__ = "0.1.0"\n'
+        Args:
+            package_name: Python package name
+            context: Template context (provides cli_commands)
 
-        # Create cli.py stub
-        cli_path = src_dir / "cli.py"
+        Returns:
+            Dict of {relative_path: content}
+        """
+        src_dir = Path("src") / package_name
         cli_commands = context.get("cli_commands", []) if context else []
-        files[cli_path] = self._create_cli_stub(package_name, cli_commands)
 
-        # Create scripts directory
-        scripts_dir = Path("scripts")
-        directories.add(scripts_dir)
-        directories.add(scripts_dir / "bash")  # Phase 2: bash scripts subdirectory
+        return {
+            # Source package structure
+            src_dir / "__init__.py": (
+                f'"""Package: {package_name}"""\n\n__version__ = "0.1.0"\n'
+            ),
+            src_dir / "cli.py": self._create_cli_stub(package_name, cli_commands),
+            # Shell scripts
+            Path("scripts") / "init.sh": self._create_init_script(package_name),
+        }
 
-        # Create shell scripts
-        init_script = scripts_dir / "init.sh"
-        files[init_script] = self._create_init_script(package_name)
-        executable_files.append(init_script)
+    def _project_directories(
+        self, package_name: str, file_paths: Iterable[Path]
+    ) -> list[Path]:
+        """
+        Get the directories of a project.
+
+        Args:
+            package_name: Python package name
+            file_paths: Relative paths of the project's files
 
-        # Phase 2: Mark create-new-feature.sh as executable (from base templates)
-        feature_script = scripts_dir / "bash" / "create-new-feature.sh"
-        if feature_script in files:
-            executable_files.append(feature_script)
+        Returns:
+            Sorted relative directory paths
+        """
+        # Parents of generated files (incl. templates/{source}/commands/ etc.)
+        directories = {path.parent for path in file_paths if path.parent != Path(".")}
 
-        # Additional directories
+        directories.add(Path("src") / package_name)
+        directories.add(Path("scripts"))
+        directories.add(Path("scripts") / "bash")  # Phase 2: bash scripts subdirectory
         directories.add(Path("templates"))
-        # Note: templates/{source}/commands/ and templates/{source}/templates/
-        # are automatically tracked via files dict (Line 414-416)
         directories.add(Path("memory"))
         directories.add(Path("examples"))
         directories.add(Path("specs"))  # Phase 2: Specifications directory
         directories.add(Path(".metaspec/commands"))  # MetaSpec development commands
         directories.add(Path(".metaspec/templates"))  # MetaSpec development templates
 
-        return SpecKitProject(
-            root_path=output_dir,
-            files=files,
-            directories=sorted(directories),
-            executable_files=executable_files,
-        )
+        return sorted(directories)
 
     def _create_cli_stub(self, package_name: str, commands: list[dict]) -> str:
         """
@@ -625,14 +1953,59 @@ if __name__ == "__main__":
         """)
 
 
-def create_generator(custom_template_dir: Path | None = None) -> Generator:
+# Per-process generator used by Generator.generate_many(use_processes=True)
+_worker_generator: Generator | None = None
+
+
+def _init_worker_generator(
+    custom_template_dir: Path | None,
+    use_cache: bool,
+    source_date_epoch: int | None = None,
+) -> None:
+    """Create the generator reused by every job in a worker process."""
+    global _worker_generator
+    _worker_generator = Generator(
+        custom_template_dir=custom_template_dir,
+        use_cache=use_cache,
+        source_date_epoch=source_date_epoch,
+    )
+
+
+def _generate_in_worker(
+    meta_spec: MetaSpecDefinition,
+    output_dir: Path,
+    force: bool,
+    dry_run: bool,
+    stream: bool = False,
+) -> GenerationResult:
+    """Generate one speckit with the worker process's generator."""
+    assert _worker_generator is not None, "worker generator not initialized"
+    return _worker_generator._generate_one(
+        meta_spec, output_dir, force, dry_run, stream
+    )
+
+
+def create_generator(
+    custom_template_dir: Path | None = None,
+    use_cache: bool = True,
+    render_workers: int = 0,
+    project_cache: ProjectCache | None = None,
+) -> Generator:
     """
     Factory function to create a Generator instance.
 
     Args:
         custom_template_dir: Optional path to custom templates
+        use_cache: Cache compiled templates on disk
+        render_workers: Threads used to render a project's templates
+        project_cache: Cache of generated speckits to restore from
 
     Returns:
         Configured Generator instance
     """
-    return Generator(custom_template_dir=custom_template_dir)
+    return Generator(
+        custom_template_dir=custom_template_dir,
+        use_cache=use_cache,
+        render_workers=render_workers,
+        project_cache=project_cache,
+    )
@@ -0,0 +1,480 @@
+"""
+HTTP generation service returning speckits as streamed archives.
+
+    metaspec serve --http 127.0.0.1:8000
+
+    curl -X POST --data @speckit.json http://127.0.0.1:8000/generate -o kit.zip
+
+Endpoints:
+- POST /generate: body is a speckit definition (JSON, as accepted by
+  MetaSpecDefinition.from_dict); responds with the zip archive, or tar.gz
+  with ?format=tar.gz, streamed with chunked transfer encoding
+- GET /metrics: request counts and latency histograms (Prometheus text
+  format)
+- GET /healthz: liveness check
+
+Generation runs on a bounded worker pool sharing one Generator. Requests
+beyond the pool and its queue are refused with 429, requests that do not
+finish within the timeout get 504 (or a truncated response once streaming
+has started), and archive chunks are handed over through a bounded queue,
+so a slow client holds up its own worker rather than buffering the whole
+archive in memory.
+"""
+
+import io
+import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, cast
+from urllib.parse import parse_qs, quote, urlsplit
+
+from metaspec.generator import Generator, create_generator
+from metaspec.models import MetaSpecDefinition
+from metaspec.output import ARCHIVE_FORMATS, check_archive_prefix
+
+# Concurrent generations
+DEFAULT_WORKERS = 4
+
+# Generations waiting for a worker before new requests get 429
+DEFAULT_QUEUE_SIZE = 16
+
+# Seconds a request may take (reading it, generating and sending the archive)
+DEFAULT_TIMEOUT = 30.0
+
+# Largest accepted definition
+MAX_BODY_SIZE = 1024 * 1024
+
+# Size of the chunks archives are streamed in, and how many may be pending
+CHUNK_SIZE = 64 * 1024
+PENDING_CHUNKS = 8
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPES = {"zip": "application/zip", "tar.gz": "application/gzip"}
+
+
+class GenerationCancelled(Exception):
+    """The request was abandoned while its archive was being written."""
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram (not thread-safe; see ServiceMetrics)."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds in seconds
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one latency."""
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class ServiceMetrics:
+    """Request counts, latencies and load of the service."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.requests: dict[tuple[str, int], int] = {}
+        self.latency: dict[str, LatencyHistogram] = {}
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, status: int, seconds: float) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            endpoint: Endpoint name, e.g. "generate"
+            status: HTTP status code sent
+            seconds: Time from receiving the request to the last byte sent
+        """
+        with self._lock:
+            key = (endpoint, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault(endpoint, LatencyHistogram()).observe(seconds)
+
+    def add_in_flight(self, delta: int) -> None:
+        """Track generations started (+1) or finished (-1)."""
+        with self._lock:
+            self.in_flight += delta
+
+    def render(self) -> str:
+        """
+        Format the metrics for Prometheus.
+
+        Returns:
+            Prometheus text exposition format
+        """
+        lines = [
+            "# HELP metaspec_http_requests_total HTTP requests by endpoint and status.",
+            "# TYPE metaspec_http_requests_total counter",
+        ]
+        with self._lock:
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'metaspec_http_requests_total{{endpoint="{endpoint}",'
+                    f'status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP metaspec_http_request_duration_seconds Request latency.",
+                "# TYPE metaspec_http_request_duration_seconds histogram",
+            ]
+            for endpoint, histogram in sorted(self.latency.items()):
+                name = "metaspec_http_request_duration_seconds"
+                labels = f'endpoint="{endpoint}"'
+                for bound, count in zip(
+                    histogram.buckets, histogram.counts, strict=True
+                ):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+            lines += [
+                "# HELP metaspec_generations_in_flight Generations running or queued.",
+                "# TYPE metaspec_generations_in_flight gauge",
+                f"metaspec_generations_in_flight {self.in_flight}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class GenerationHTTPServer(ThreadingHTTPServer):
+    """HTTP server generating speckits on a bounded worker pool."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        generator: Generator | None = None,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        """
+        Bind the server.
+
+        Args:
+            address: (host, port) to listen on (port 0 picks a free port)
+            generator: Generator to use (default: create_generator())
+            workers: Concurrent generations
+            queue_size: Generations that may wait for a worker
+            timeout: Seconds a request may take
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        self.generator = generator or create_generator()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.request_timeout = timeout
+        self.metrics = ServiceMetrics()
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="metaspec-http")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        super().__init__(address, _GenerationHandler)
+
+    def try_reserve(self) -> bool:
+        """Reserve a worker or queue slot; False if all are taken."""
+        if not self._slots.acquire(blocking=False):
+            return False
+        self.metrics.add_in_flight(1)
+        return True
+
+    def release(self, _: Future | None = None) -> None:
+        """Release a slot (when its generation has finished)."""
+        self.metrics.add_in_flight(-1)
+        self._slots.release()
+
+    def server_close(self) -> None:
+        """Close the socket and stop the worker pool."""
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ChunkPipe(io.RawIOBase):
+    """Bounded hand-over of archive chunks from a worker to a handler."""
+
+    def __init__(self, max_chunks: int = PENDING_CHUNKS):
+        self._queue: queue.Queue[bytes | BaseException | None] = queue.Queue(
+            max_chunks
+        )
+        self._cancelled = threading.Event()
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        # Archive writers make many small writes; hand over CHUNK_SIZE pieces
+        self._buffer += b
+        if len(self._buffer) >= CHUNK_SIZE:
+            self._put_buffer()
+        return len(b)
+
+    def finish(self) -> None:
+        """Hand over the rest of the archive and signal its end."""
+        self._put_buffer()
+        self._put(None)
+
+    def fail(self, error: BaseException) -> None:
+        """Pass a generation error to the reader."""
+        self._put(error)
+
+    def cancel(self) -> None:
+        """Make the writer's next write raise GenerationCancelled."""
+        self._cancelled.set()
+
+    def get(self, deadline: float) -> bytes | BaseException | None:
+        """
+        Get the next chunk, error or end marker (None).
+
+        Raises:
+            TimeoutError: If nothing arrives before deadline (monotonic time)
+        """
+        remaining = deadline - time.monotonic()
+        try:
+            return self._queue.get(timeout=max(remaining, 0))
+        except queue.Empty:
+            raise TimeoutError() from None
+
+    def _put_buffer(self) -> None:
+        if self._buffer and not self._put(bytes(self._buffer)):
+            raise GenerationCancelled()
+        self._buffer.clear()
+
+    def _put(self, item: bytes | BaseException | None) -> bool:
+        """Queue an item, waiting for room unless cancelled."""
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+class _GenerationHandler(BaseHTTPRequestHandler):
+    server: GenerationHTTPServer
+    protocol_version = "HTTP/1.1"  # For chunked transfer encoding
+
+    def setup(self) -> None:
+        super().setup()
+        # Drop clients that stall sending the request or reading the response
+        self.connection.settimeout(self.server.request_timeout)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        start = time.perf_counter()
+        if path == "/metrics":
+            body = self.server.metrics.render().encode("utf-8")
+            self._send_body(HTTPStatus.OK, body, "text/plain; version=0.0.4")
+            return  # Not observed: scrapes would dominate the latencies
+        if path == "/healthz":
+            self._send_json(HTTPStatus.OK, {"ok": True})
+            return
+        self._send_error(HTTPStatus.NOT_FOUND, f"Unknown path: {path}")
+        self.server.metrics.observe(
+            "other", HTTPStatus.NOT_FOUND, time.perf_counter() - start
+        )
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        start = time.perf_counter()
+        if url.path != "/generate":
+            status = self._send_error(
+                HTTPStatus.NOT_FOUND, f"Unknown path: {url.path}"
+            )
+            self.server.metrics.observe("other", status, time.perf_counter() - start)
+            return
+
+        status = self._generate(parse_qs(url.query))
+        self.server.metrics.observe("generate", status, time.perf_counter() - start)
+
+    def _generate(self, query: dict[str, list[str]]) -> int:
+        """Handle POST /generate; returns the status sent."""
+        deadline = time.monotonic() + self.server.request_timeout
+        archive_format = query.get("format", ["zip"])[-1]
+        if archive_format not in ARCHIVE_FORMATS:
+            return self._send_error(
+                HTTPStatus.BAD_REQUEST,
+                f"Unknown format: {archive_format!r} "
+                f"(expected one of: {', '.join(ARCHIVE_FORMATS)})",
+            )
+
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            return self._send_error(
+                HTTPStatus.LENGTH_REQUIRED, "Content-Length is required"
+            )
+        if int(length) > MAX_BODY_SIZE:
+            return self._send_error(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Definition exceeds {MAX_BODY_SIZE} bytes",
+            )
+
+        try:
+            data = json.loads(self.rfile.read(int(length)))
+            if not isinstance(data, dict):
+                raise ValueError("Definition must be a JSON object")
+            meta_spec = MetaSpecDefinition.from_dict(data)
+            # The name becomes the archive's top-level directory and filename
+            if not meta_spec.name:
+                raise ValueError("Speckit name is empty")
+            check_archive_prefix(meta_spec.name)
+            # Checked here so an unknown source is a client error, not a
+            # failure halfway through the archive
+            self.server.generator.check_slash_commands(meta_spec)
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send_error(
+                HTTPStatus.BAD_REQUEST, f"Invalid definition: {type(e).__name__}: {e}"
+            )
+
+        if not self.server.try_reserve():
+            self.close_connection = True
+            return self._send_error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "Too many generations in progress, retry later",
+                {"Retry-After": "1"},
+            )
+
+        pipe = _ChunkPipe()
+        try:
+            future = self.server.pool.submit(
+                self._produce, meta_spec, pipe, archive_format
+            )
+        except RuntimeError:  # Pool shut down
+            self.server.release()
+            return self._send_error(
+                HTTPStatus.SERVICE_UNAVAILABLE, "Server is shutting down"
+            )
+        future.add_done_callback(self.server.release)
+
+        try:
+            return self._stream(meta_spec, pipe, archive_format, deadline)
+        finally:
+            pipe.cancel()  # No-op once the archive is complete
+
+    def _stream(
+        self,
+        meta_spec: MetaSpecDefinition,
+        pipe: _ChunkPipe,
+        archive_format: str,
+        deadline: float,
+    ) -> int:
+        """Send the archive as it is produced; returns the status sent."""
+        try:
+            item = pipe.get(deadline)
+        except TimeoutError:
+            return self._send_error(
+                HTTPStatus.GATEWAY_TIMEOUT, "Generation timed out"
+            )
+        if isinstance(item, BaseException):
+            return self._send_error(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                f"Generation failed: {type(item).__name__}: {item}",
+            )
+
+        suffix = ".zip" if archive_format == "zip" else ".tar.gz"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[archive_format])
+        self.send_header(
+            "Content-Disposition", _content_disposition(f"{meta_spec.name}{suffix}")
+        )
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        try:
+            while item is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(item), item))
+                item = pipe.get(deadline)
+            self.wfile.write(b"0\r\n\r\n")
+        except Exception as e:
+            # Headers are out: all that is left is to truncate the response
+            self.close_connection = True
+            self.log_error("Generation aborted mid-stream: %r", e)
+            if isinstance(e, TimeoutError):
+                return HTTPStatus.GATEWAY_TIMEOUT
+            return HTTPStatus.INTERNAL_SERVER_ERROR
+        return HTTPStatus.OK
+
+    def _produce(
+        self, meta_spec: MetaSpecDefinition, pipe: _ChunkPipe, archive_format: str
+    ) -> None:
+        """Write the archive into the pipe (on a pool worker)."""
+        try:
+            self.server.generator.generate_archive(
+                meta_spec, cast(IO[bytes], pipe), archive_format
+            )
+            pipe.finish()
+        except GenerationCancelled:
+            pass
+        except Exception as e:
+            pipe.fail(e)
+
+    def _send_error(
+        self, status: int, message: str, headers: dict[str, str] | None = None
+    ) -> int:
+        self._send_json(status, {"ok": False, "error": message}, headers)
+        return status
+
+    def _send_json(
+        self,
+        status: int,
+        data: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        body = (json.dumps(data) + "\n").encode("utf-8")
+        self._send_body(status, body, "application/json", headers)
+
+    def _send_body(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _content_disposition(filename: str) -> str:
+    """
+    Build an attachment Content-Disposition header (RFC 6266).
+
+    Args:
+        filename: Suggested filename (any Unicode)
+
+    Returns:
+        Header value with an ASCII filename and the exact UTF-8 filename*
+    """
+    fallback = re.sub(r'[^\x20-\x7e]|["\\%]', "_", filename)
+    return (
+        f'attachment; filename="{fallback}"; '
+        f"filename*=UTF-8''{quote(filename, safe='')}"
+    )
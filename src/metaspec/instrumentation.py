@@ -0,0 +1,148 @@
+"""
+Timing instrumentation for speckit generation.
+
+Generator reports what it does through hooks: callables that receive a
+StageEvent when one of the generation steps finishes and a TemplateEvent
+for every template it renders.
+
+    collector = TimingCollector()
+    generator = Generator(hooks=[collector])
+    generator.generate(meta_spec, output_dir)
+    collector.dump(Path("timings.json"))
+
+Hooks are called on the rendering threads, so they must be thread-safe.
+When no hooks are registered nothing is measured.
+"""
+
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Generation stages, in order (see Generator.generate)
+STAGES = (
+    "validate",
+    "select_templates",
+    "create_context",
+    "render",
+    "construct_project",
+    "write",
+)
+
+# Reported instead of steps 2-6 when a speckit is restored from the
+# project cache
+RESTORE_STAGE = "restore"
+
+
+@dataclass(frozen=True)
+class StageEvent:
+    """A generation stage finished."""
+
+    speckit: str  # Name of the speckit being generated
+    stage: str  # One of STAGES, or RESTORE_STAGE
+    duration: float  # Wall time in seconds
+    files: int = 0  # Files produced or written by the stage
+    bytes: int = 0  # UTF-8 size of those files
+
+
+@dataclass(frozen=True)
+class TemplateEvent:
+    """A template was rendered (or served from the render cache)."""
+
+    speckit: str
+    template: str  # Template name, e.g. "base/README.md.j2"
+    duration: float  # Wall time in seconds
+    bytes: int  # UTF-8 size of the output
+    cached: bool  # Whether the output came from the render cache
+
+
+GenerationEvent = StageEvent | TemplateEvent
+GenerationHook = Callable[[GenerationEvent], None]
+
+
+class TimingCollector:
+    """
+    Hook that aggregates timings per stage and per template.
+
+    Call it with events (or pass it to Generator as a hook), then use
+    report() or dump() to get the totals.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty collector."""
+        self.events: list[GenerationEvent] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, event: GenerationEvent) -> None:
+        """Record an event."""
+        with self._lock:
+            self.events.append(event)
+
+    def report(self) -> dict[str, Any]:
+        """
+        Aggregate the recorded events.
+
+        Returns:
+            Dict with:
+            - speckits: number of distinct speckits seen
+            - stages: {stage: {count, total, max, files, bytes}} in stage order
+            - templates: {template: {count, total, max, bytes, cached}},
+              slowest total first
+        """
+        with self._lock:
+            events = list(self.events)
+
+        stages: dict[str, dict[str, Any]] = {}
+        templates: dict[str, dict[str, Any]] = {}
+        speckits = set()
+
+        for event in events:
+            speckits.add(event.speckit)
+            if isinstance(event, StageEvent):
+                entry = stages.setdefault(
+                    event.stage,
+                    {"count": 0, "total": 0.0, "max": 0.0, "files": 0, "bytes": 0},
+                )
+                entry["files"] += event.files
+            else:
+                entry = templates.setdefault(
+                    event.template,
+                    {"count": 0, "total": 0.0, "max": 0.0, "bytes": 0, "cached": 0},
+                )
+                entry["cached"] += event.cached
+            entry["count"] += 1
+            entry["total"] += event.duration
+            entry["max"] = max(entry["max"], event.duration)
+            entry["bytes"] += event.bytes
+
+        stage_order = {stage: i for i, stage in enumerate((*STAGES, RESTORE_STAGE))}
+        return {
+            "speckits": len(speckits),
+            "stages": dict(
+                sorted(
+                    stages.items(),
+                    key=lambda item: stage_order.get(item[0], len(STAGES)),
+                )
+            ),
+            "templates": dict(
+                sorted(
+                    templates.items(), key=lambda item: item[1]["total"], reverse=True
+                )
+            ),
+        }
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the report as JSON.
+
+        Args:
+            path: Output file
+        """
+        path.write_text(json.dumps(self.report(), indent=2) + "\n", encoding="utf-8")
+
+    def clear(self) -> None:
+        """Forget all recorded events."""
+        with self._lock:
+            self.events.clear()
@@ -14,12 +14,23 @@ This module defines the core data structures:
    - Represents generated speckit structure
    - Contains files, directories, executable scripts
    - Ready to write to disk
+
+3. GenerationResult (Batch output)
+   - Outcome of one speckit in a batch generation
+   - Holds the project or the error, plus timing
 """
 
+import asyncio
+import functools
+import json
+from collections.abc import Mapping
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from metaspec.output import DirectorySink, OutputSink, WriteSummary
+
 # ============================================================================
 # Entity 1: MetaSpecDefinition (Input)
 # ============================================================================
@@ -169,6 +180,44 @@ class MetaSpecDefinition:
 
         return MetaSpecDefinition(**kwargs)
 
+    @staticmethod
+    def from_file(path: Path) -> "MetaSpecDefinition":
+        """
+        Load a MetaSpecDefinition from a YAML or JSON file.
+
+        Args:
+            path: Definition file (.yaml, .yml or .json)
+
+        Returns:
+            Parsed MetaSpecDefinition
+
+        Raises:
+            ValueError: If the file type is unsupported, the file is not a
+                mapping, or PyYAML is needed but not installed
+            KeyError: If a required field is missing
+        """
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".json":
+            data = json.loads(text)
+        elif path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml  # type: ignore[import-untyped]
+            except ImportError as e:
+                raise ValueError(
+                    "Reading YAML definitions requires PyYAML\n"
+                    "Install it with: pip install 'meta-spec[yaml]'"
+                ) from e
+            data = yaml.safe_load(text)
+        else:
+            raise ValueError(
+                f"Unsupported definition file: {path}\n"
+                "Expected a .yaml, .yml or .json file"
+            )
+
+        if not isinstance(data, dict):
+            raise ValueError(f"Definition file must contain a mapping: {path}")
+        return MetaSpecDefinition.from_dict(data)
+
 
 # ============================================================================
 # Entity 2: SpecKitProject (Output)
@@ -184,44 +233,106 @@ class SpecKitProject:
     """
 
     root_path: Path
-    files: dict[Path, str] = field(default_factory=dict)  # Relative path -> content
+    files: Mapping[Path, str] = field(default_factory=dict)  # Relative path -> content
     directories: list[Path] = field(default_factory=list)  # Relative paths
     executable_files: list[Path] = field(default_factory=list)  # Relative paths
+    # Generator state stored in the project's manifest (see Generator.regenerate)
+    metadata: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    # Set by write_to_disk: what the write changed on disk
+    write_summary: WriteSummary | None = field(default=None, repr=False, compare=False)
 
-    def write_to_disk(self, force: bool = False) -> None:
+    def write_to_disk(self, force: bool = False, fsync: str = "none") -> WriteSummary:
         """
-        Write all files and directories to disk.
+        Write all files and directories to disk atomically.
+
+        A new project is written to a staging directory next to root_path,
+        which is renamed into place once complete, so an interrupted write
+        never leaves a partial project behind. Writing over an existing
+        project updates it in place: only files whose content changed are
+        replaced (each atomically), and generated files the project no
+        longer contains are removed.
+
+        Args:
+            force: If True, overwrite existing directory (files in it that
+                are not part of the project are kept)
+            fsync: fsync policy, one of "none", "files" or "all"
+
+        Returns:
+            Summary of created, updated, unchanged and removed files
+
+        Raises:
+            FileExistsError: If root_path exists and force=False
+        """
+        with DirectorySink(self.root_path, force=force, fsync=fsync) as sink:
+            self.write_to(sink)
+
+        self.write_summary = sink.summary
+        return sink.summary
+
+    async def awrite_to_disk(
+        self,
+        force: bool = False,
+        fsync: str = "none",
+        executor: Executor | None = None,
+    ) -> WriteSummary:
+        """
+        Write to disk like write_to_disk, without blocking the event loop.
 
         Args:
             force: If True, overwrite existing directory
+            fsync: fsync policy, one of "none", "files" or "all"
+            executor: Executor doing the file I/O (default: the event loop's
+                default executor)
+
+        Returns:
+            Summary of created, updated, unchanged and removed files
 
         Raises:
             FileExistsError: If root_path exists and force=False
         """
-        # Check if directory exists
-        if self.root_path.exists() and not force:
-            raise FileExistsError(
-                f"Output directory already exists: {self.root_path}\n"
-                "Use --force flag to overwrite."
-            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(self.write_to_disk, force=force, fsync=fsync)
+        )
 
-        # Create root directory
-        self.root_path.mkdir(parents=True, exist_ok=True)
+    def write_to(self, sink: OutputSink) -> None:
+        """
+        Write all directories and files into an open sink.
 
-        # Create all directories
+        Args:
+            sink: Output sink (DirectorySink, ZipSink, TarSink, ...)
+        """
+        sink.metadata.update(self.metadata)
         for dir_path in self.directories:
-            full_path = self.root_path / dir_path
-            full_path.mkdir(parents=True, exist_ok=True)
+            sink.add_directory(dir_path)
 
-        # Write all files
+        executable = set(self.executable_files)
         for file_path, content in self.files.items():
-            full_path = self.root_path / file_path
-            # Ensure parent directory exists
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text(content, encoding="utf-8")
-
-        # Set executable permissions
-        for file_path in self.executable_files:
-            full_path = self.root_path / file_path
-            if full_path.exists():
-                full_path.chmod(0o755)  # rwxr-xr-x
+            sink.write_file(file_path, content, executable=file_path in executable)
+
+
+# ============================================================================
+# Entity 3: GenerationResult (Batch output)
+# ============================================================================
+
+
+@dataclass
+class GenerationResult:
+    """
+    Outcome of generating one speckit as part of a batch.
+
+    On success, project is set (or summary, for streamed batches);
+    on failure, error is set.
+    """
+
+    name: str
+    output_dir: Path
+    project: SpecKitProject | None = None
+    error: Exception | None = None
+    summary: WriteSummary | None = None  # Streamed batches only
+    duration: float = 0.0  # Seconds spent generating (render + write)
+
+    @property
+    def ok(self) -> bool:
+        """Whether generation succeeded."""
+        return self.error is None
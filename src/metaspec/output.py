@@ -0,0 +1,1048 @@
+"""
+Output backends for generated speckits.
+
+A sink receives a project's directories and files and commits them as a
+unit. Sinks:
+- DirectorySink: the filesystem (atomic, incremental)
+- ZipSink: a zip archive written to any binary stream
+- TarSink: a gzip-compressed tar archive written to any binary stream
+
+Archive sinks write in a single pass without touching the disk, so a
+speckit can be zipped straight into an HTTP response or an in-memory
+buffer. Streams need not be seekable.
+
+DirectorySink writes a project to the filesystem:
+
+1. Lock the target path (concurrent writers to the same path serialize)
+2. Write new and changed files: into a hidden staging directory next to a
+   new target, or into temporary files next to the files they replace
+3. Set executable bits and fsync according to the chosen policy
+4. Rename the staging directory into place, or move each temporary file
+   over the file it replaces (os.replace)
+
+A crash or Ctrl+C before step 4 leaves the target untouched; every file is
+replaced atomically, so readers never see a partially written one.
+Temporary files left by a killed writer are removed the next time the path
+is written.
+
+An existing target is updated in place: the directory itself, files whose
+content did not change and entries the project does not produce (user
+files, specs, .git, ...) are not touched, so they keep their inode and
+mtime, and regenerating an unchanged project writes nothing. Every written
+project carries a manifest of per-file content hashes
+(.metaspec/manifest.json); with one, files the previous generation produced
+but the new one does not are deleted.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import secrets
+import shutil
+import stat
+import tarfile
+import time
+import zipfile
+from collections.abc import Collection, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType, TracebackType
+from typing import IO, Any
+
+fcntl: ModuleType | None
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# fsync policies for DirectorySink:
+#   none  - rely on the OS to flush (fast; survives process crashes)
+#   files - fsync every written file before the rename
+#   all   - also fsync directories, so the rename itself is durable
+FSYNC_POLICIES = ("none", "files", "all")
+
+# Manifest of generated files, relative to the project root
+MANIFEST_PATH = Path(".metaspec") / "manifest.json"
+MANIFEST_VERSION = 1
+
+# Ways DirectorySink.copy_file can add an existing file:
+#   copy     - copy the content
+#   reflink  - share blocks copy-on-write where the filesystem supports it
+#              (Btrfs, XFS, ...), falling back to copy
+#   hardlink - link to the source (which then must never be modified)
+COPY_METHODS = ("copy", "reflink", "hardlink")
+
+# Linux ioctl that clones a file's extents (FICLONE)
+_FICLONE = 0x40049409
+
+# Archive formats supported by open_archive_sink()
+ARCHIVE_FORMATS = ("zip", "tar.gz")
+
+# Characters an archive prefix may not contain: path separators, drive
+# colons and control characters
+_UNSAFE_PREFIX_CHARS = re.compile(r"[/\\:\x00-\x1f\x7f-\x9f]")
+
+
+@dataclass
+class WriteSummary:
+    """What writing a project changed on disk (paths relative to the root)."""
+
+    created: list[Path] = field(default_factory=list)
+    updated: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    removed: list[Path] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Whether anything was created, updated or removed."""
+        return bool(self.created or self.updated or self.removed)
+
+
+def read_manifest(root: Path) -> dict[str, dict[str, Any]] | None:
+    """
+    Read the file manifest of a generated project.
+
+    Args:
+        root: Project root directory
+
+    Returns:
+        Dict of {relative_posix_path: {"sha256": ..., "executable": ...}},
+        or None if the project has no valid manifest
+    """
+    data = _read_manifest_data(root)
+    files = data.get("files") if data is not None else None
+    return files if isinstance(files, dict) else None
+
+
+def read_manifest_metadata(root: Path) -> dict[str, Any]:
+    """
+    Read the generator metadata stored in a project's manifest.
+
+    Args:
+        root: Project root directory
+
+    Returns:
+        Metadata dict (empty if the project has no valid manifest or none
+        was stored)
+    """
+    data = _read_manifest_data(root)
+    metadata = data.get("metadata") if data is not None else None
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def _read_manifest_data(root: Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads((root / MANIFEST_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+class OutputSink:
+    """
+    Base class for output sinks.
+
+    Use as a context manager: the project is committed when the block exits
+    normally and discarded if it raises. Subclasses implement open(),
+    add_directory(), write_file(), commit() and abort().
+    """
+
+    def __init__(self) -> None:
+        # Generator state stored with the manifest (JSON-serializable)
+        self.metadata: dict[str, Any] = {}
+        # Manifest entries of the files written so far
+        self._manifest: dict[str, dict[str, Any]] = {}
+
+    def __enter__(self) -> "OutputSink":
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def open(self) -> None:
+        """Prepare for writing."""
+        raise NotImplementedError
+
+    def add_directory(self, path: Path) -> None:
+        """
+        Create a (possibly empty) directory.
+
+        Args:
+            path: Path relative to the project root
+        """
+        raise NotImplementedError
+
+    def write_file(
+        self, path: Path, content: str | Iterable[str], executable: bool = False
+    ) -> None:
+        """
+        Write a file.
+
+        Args:
+            path: Path relative to the project root
+            content: File content, or an iterable of content chunks
+            executable: If True, mark the file rwxr-xr-x
+        """
+        raise NotImplementedError
+
+    def commit(self) -> None:
+        """Finish writing the project."""
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        """Stop writing and discard what can be discarded."""
+        raise NotImplementedError
+
+    def _record(self, path: Path, digest: str, executable: bool) -> None:
+        """Add a written file to the manifest."""
+        self._manifest[path.as_posix()] = {"sha256": digest, "executable": executable}
+
+    def _manifest_content(self) -> str:
+        """Serialize the manifest of all files written so far."""
+        manifest: dict[str, Any] = {
+            "version": MANIFEST_VERSION,
+            "files": dict(sorted(self._manifest.items())),
+        }
+        if self.metadata:
+            manifest["metadata"] = self.metadata
+        return json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+
+
+class DirectorySink(OutputSink):
+    """
+    Write a project into a directory.
+
+    After commit, summary describes what changed.
+
+    A new target is written into a staging directory next to it, which is
+    renamed into place on commit. An existing target (force=True) is
+    updated in place, touching only what changed:
+    - files whose content differs are written to temporary files next to
+      them and moved over the old ones on commit (os.replace)
+    - files whose content is unchanged are not touched, so they keep their
+      inode and mtime, and nothing at all is written if nothing changed
+    - entries the project does not produce (user files, specs, .git, ...)
+      and the target directory itself are left alone
+    - with a manifest, files the previous generation produced but this one
+      does not are deleted, unless the user edited them
+    """
+
+    def __init__(self, root: Path, force: bool = False, fsync: str = "none"):
+        """
+        Initialize sink.
+
+        Args:
+            root: Target directory; resolved, so that for a relative path
+                such as "." the staging directory and lock are created next
+                to it rather than inside it
+            force: If True, update an existing target directory
+            fsync: One of FSYNC_POLICIES
+
+        Raises:
+            ValueError: If fsync is not a known policy
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy: {fsync!r}\n"
+                f"Expected one of: {', '.join(FSYNC_POLICIES)}"
+            )
+
+        super().__init__()
+        self.root = root.resolve()
+        self.force = force
+        self.fsync = fsync
+        self.summary = WriteSummary()
+        self._staging: Path | None = None
+        self._lock_fd: int | None = None
+        self._is_open = False
+        # Manifest of the project being regenerated, if any
+        self._previous: dict[str, dict[str, Any]] | None = None
+        # Updating an existing target: temporary files to move over their
+        # targets on commit, and directories created for them
+        self._pending: dict[Path, Path] = {}
+        self._created_dirs: list[Path] = []
+
+    def __enter__(self) -> "DirectorySink":
+        self.open()
+        return self
+
+    @property
+    def _lock_path(self) -> Path:
+        return self.root.parent / f".{self.root.name}.lock"
+
+    @property
+    def incremental(self) -> bool:
+        """Whether the sink regenerates a project that has a manifest."""
+        return self._previous is not None
+
+    def open(self) -> None:
+        """
+        Lock the target and prepare for writing.
+
+        Raises:
+            FileExistsError: If the target exists and force=False
+        """
+        self.root.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = _acquire_lock(self._lock_path)
+
+        try:
+            _recover(self.root)
+            # Checked under the lock so concurrent writers cannot both pass
+            if self.root.exists() and not self.force:
+                raise FileExistsError(
+                    f"Output directory already exists: {self.root}\n"
+                    "Use --force flag to overwrite."
+                )
+            if self.root.is_dir():
+                self._previous = read_manifest(self.root)
+                _remove_temp_files(self.root, self._previous or {})
+            else:
+                self._staging = _make_staging_dir(self.root)
+        except BaseException:
+            self._release()
+            raise
+
+        self._is_open = True
+
+    def add_directory(self, path: Path) -> None:
+        """Create a (possibly empty) directory (see OutputSink)."""
+        self._check_open()
+        self._make_parents(self._base / path / "_")
+
+    def write_file(
+        self, path: Path, content: str | Iterable[str], executable: bool = False
+    ) -> None:
+        """Write a file (see OutputSink)."""
+        self._check_open()
+        old_digest = self._old_digest(path)
+
+        if isinstance(content, str):
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            if digest != old_digest:
+                self._write_new(self._new_path(path), content)
+        else:
+            # Chunks can only be consumed once: write them, then compare
+            new_path = self._new_path(path)
+            digest = self._write_new(new_path, content)
+            if digest == old_digest:
+                new_path.unlink()
+                self._pending.pop(path, None)
+
+        if digest == old_digest:
+            self._keep_unchanged(path, executable)
+        else:
+            self._stage_new(path, old_digest, executable)
+        self._record(path, digest, executable)
+
+    def copy_file(
+        self,
+        path: Path,
+        source: Path,
+        digest: str,
+        executable: bool = False,
+        method: str = "copy",
+    ) -> None:
+        """
+        Add an existing file (e.g. from a cache) to the project.
+
+        Args:
+            path: Path relative to the project root
+            source: File to copy; must not be modified afterwards when
+                method is "hardlink"
+            digest: SHA-256 of source's content
+            executable: If True, mark the file rwxr-xr-x
+            method: One of COPY_METHODS
+
+        Raises:
+            ValueError: If method is not a known copy method
+        """
+        self._check_open()
+        if method not in COPY_METHODS:
+            raise ValueError(
+                f"Unknown copy method: {method!r}\n"
+                f"Expected one of: {', '.join(COPY_METHODS)}"
+            )
+
+        old_digest = self._old_digest(path)
+        if digest == old_digest:
+            self._keep_unchanged(path, executable)
+        else:
+            if (
+                method == "hardlink"
+                and executable
+                and stat.S_IMODE(source.stat().st_mode) != 0o755
+            ):
+                method = "copy"  # chmod would change the source's mode too
+            self._copy_new(source, self._new_path(path), method)
+            self._stage_new(path, old_digest, executable)
+        self._record(path, digest, executable)
+
+    def keep_file(self, path: Path, executable: bool = False) -> bool:
+        """
+        Keep a file from the previous generation without rewriting it.
+
+        Only possible when regenerating a project that has a manifest, and
+        only if the file is still exactly as generated (user edits are not
+        kept, so the caller regenerates the file).
+
+        Args:
+            path: Path relative to the project root
+            executable: If True, mark the file rwxr-xr-x
+
+        Returns:
+            True if the file was kept; False if the caller must write it
+        """
+        self._check_open()
+        entry = self._previous.get(path.as_posix()) if self._previous else None
+        if entry is None or _file_digest(self.root / path) != entry.get("sha256"):
+            return False
+
+        self._keep_unchanged(path, executable)
+        self._record(path, entry["sha256"], executable)
+        return True
+
+    def commit(self) -> None:
+        """Move the written project into place and release the lock."""
+        self._check_open()
+        try:
+            if self._staging is not None:
+                self._commit_staged()
+            else:
+                self._commit_in_place()
+        finally:
+            # Releases the lock; also discards anything not moved into place
+            self.abort()
+
+        for paths in (
+            self.summary.created,
+            self.summary.updated,
+            self.summary.unchanged,
+            self.summary.removed,
+        ):
+            paths.sort()
+
+    def abort(self) -> None:
+        """Discard everything not yet committed and release the lock."""
+        if self._staging is not None:
+            shutil.rmtree(self._staging, ignore_errors=True)
+            self._staging = None
+        for temp_path in self._pending.values():
+            temp_path.unlink(missing_ok=True)
+        self._pending.clear()
+        for directory in reversed(self._created_dirs):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass  # Not empty: holds committed files
+        self._created_dirs.clear()
+        self._is_open = False
+        self._release()
+
+    @property
+    def _base(self) -> Path:
+        """Directory files are written into: the staging directory or root."""
+        return self._staging if self._staging is not None else self.root
+
+    def _old_digest(self, path: Path) -> str | None:
+        """Get the SHA-256 of the file an existing target has at path."""
+        return None if self._staging is not None else _file_digest(self.root / path)
+
+    def _new_path(self, path: Path) -> Path:
+        """Get the path to write a new file for path to."""
+        if self._staging is not None:
+            new_path = self._staging / path
+        else:
+            target = self.root / path
+            if target.is_dir() and not target.is_symlink():
+                raise IsADirectoryError(
+                    f"Cannot write {path.as_posix()}: {target} is a directory"
+                )
+            new_path = self._pending.get(path) or _sibling_path(target, "tmp")
+            self._pending[path] = new_path
+        self._make_parents(new_path)
+        return new_path
+
+    def _make_parents(self, path: Path) -> None:
+        """Create the missing parent directories of path, remembering them."""
+        missing = []
+        parent = path.parent
+        while not parent.is_dir():
+            missing.append(parent)
+            parent = parent.parent
+        for directory in reversed(missing):
+            directory.mkdir(exist_ok=True)
+            if self._staging is None:
+                self._created_dirs.append(directory)
+
+    def _write_new(self, full_path: Path, content: str | Iterable[str]) -> str:
+        """Write content to a new file, returning its SHA-256."""
+        digest = hashlib.sha256()
+
+        with open(full_path, "w", encoding="utf-8") as f:
+            chunks = [content] if isinstance(content, str) else content
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk.encode("utf-8"))
+            if self.fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+
+        return digest.hexdigest()
+
+    def _copy_new(self, source: Path, full_path: Path, method: str) -> None:
+        """Copy source to a new file."""
+        if method == "hardlink":
+            os.link(source, full_path)
+            return
+
+        if method != "reflink" or not _reflink(source, full_path):
+            shutil.copyfile(source, full_path)
+        if self.fsync != "none":
+            fd = os.open(full_path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def _stage_new(self, path: Path, old_digest: str | None, executable: bool) -> None:
+        """Set the mode of a newly written file and classify it."""
+        if executable:
+            self._new_path(path).chmod(0o755)  # rwxr-xr-x
+        if old_digest is None:
+            self.summary.created.append(path)
+        else:
+            self.summary.updated.append(path)
+
+    def _keep_unchanged(self, path: Path, executable: bool) -> None:
+        """Keep the target's file at path, whose content is already right."""
+        source = self.root / path
+        if executable and not os.access(source, os.X_OK):
+            # A copy, since the file may be hard-linked (e.g. to a cache)
+            new_path = self._new_path(path)
+            self._copy_new(source, new_path, "copy")
+            new_path.chmod(0o755)  # rwxr-xr-x
+            self.summary.updated.append(path)
+        else:
+            self.summary.unchanged.append(path)
+
+    def _commit_staged(self) -> None:
+        """Write the manifest and rename the staging directory into place."""
+        staging = self._staging_dir
+        self._write_manifest(staging)
+        if self.fsync == "all":
+            for dirpath, _, _ in os.walk(staging):
+                _fsync_dir(Path(dirpath))
+        os.rename(staging, self.root)
+        self._staging = None
+        if self.fsync == "all":
+            _fsync_dir(self.root.parent)
+
+    def _commit_in_place(self) -> None:
+        """
+        Move changed files over the target's and delete stale ones.
+
+        Does nothing at all when no file changed and the manifest is
+        already up to date.
+        """
+        stale = self._stale_files()
+        manifest = self._manifest_content()
+        try:
+            manifest_changed = (self.root / MANIFEST_PATH).read_text(
+                encoding="utf-8"
+            ) != manifest
+        except (OSError, UnicodeDecodeError):
+            manifest_changed = True
+        if not (self._pending or self._created_dirs or stale or manifest_changed):
+            return
+
+        changed_dirs = set()
+        for path, temp_path in list(self._pending.items()):
+            os.replace(temp_path, self.root / path)
+            del self._pending[path]
+            changed_dirs.add(temp_path.parent)
+        self._created_dirs.clear()  # Hold committed files now
+        for path in stale:
+            (self.root / path).unlink(missing_ok=True)
+            changed_dirs.add(self._remove_empty_parents(path))
+        if manifest_changed:
+            self._write_manifest(self.root)
+            changed_dirs.add((self.root / MANIFEST_PATH).parent)
+
+        if self.fsync == "all":
+            for directory in changed_dirs:
+                _fsync_dir(directory)
+
+    def _remove_empty_parents(self, path: Path) -> Path:
+        """
+        Remove the directories above a deleted file that are now empty.
+
+        Returns:
+            The closest directory that remains
+        """
+        directory = (self.root / path).parent
+        while directory != self.root:
+            try:
+                directory.rmdir()
+            except OSError:
+                break  # Not empty (or already gone)
+            directory = directory.parent
+        return directory
+
+    def _stale_files(self) -> list[Path]:
+        """
+        Find files the previous generation produced and this one does not.
+
+        Only files still exactly as generated count (user edits are kept);
+        they are recorded as removed.
+
+        Returns:
+            Their paths, relative to the root
+        """
+        stale = []
+        for posix_path, entry in sorted((self._previous or {}).items()):
+            if posix_path in self._manifest or entry.get("sha256") is None:
+                continue
+            path = Path(posix_path)
+            if _file_digest(self.root / path) == entry["sha256"]:
+                stale.append(path)
+                self.summary.removed.append(path)
+        return stale
+
+    def _write_manifest(self, root: Path) -> None:
+        """Atomically write the manifest of all files written so far."""
+        target = root / MANIFEST_PATH
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = _sibling_path(target, "tmp")
+        try:
+            self._write_new(temp_path, self._manifest_content())
+            os.replace(temp_path, target)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def _check_open(self) -> None:
+        if not self._is_open:
+            raise RuntimeError("DirectorySink is not open")
+
+    @property
+    def _staging_dir(self) -> Path:
+        if self._staging is None:
+            raise RuntimeError("DirectorySink has no staging directory")
+        return self._staging
+
+    def _release(self) -> None:
+        if self._lock_fd is not None:
+            _release_lock(self._lock_path, self._lock_fd)
+            self._lock_fd = None
+
+
+class ArchiveSink(OutputSink):
+    """
+    Base class for sinks writing an archive to a binary stream.
+
+    Entries are stored under prefix (e.g. "my-speckit/README.md"), with
+    rw-r--r-- / rwxr-xr-x modes and the given modification time. The
+    manifest is included, so an extracted archive regenerates incrementally
+    like a written directory. Given a fixed mtime, the same content always
+    produces a byte-identical archive.
+
+    The stream is not closed. If writing fails, the archive is incomplete
+    and must be discarded by the caller.
+    """
+
+    def __init__(
+        self, fileobj: IO[bytes], prefix: str = "", mtime: float | None = None
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            fileobj: Writable binary stream (need not be seekable)
+            prefix: Directory name to store entries under ("" for none)
+            mtime: Modification time of entries (default: now)
+
+        Raises:
+            ValueError: If prefix is not a safe directory name
+        """
+        super().__init__()
+        self.fileobj = fileobj
+        self.prefix = check_archive_prefix(prefix)
+        self.mtime = time.time() if mtime is None else mtime
+        self._mtime_is_now = mtime is None
+        self._is_open = False
+
+    def open(self) -> None:
+        """Start the archive."""
+        self._open_archive()
+        self._is_open = True
+
+    def add_directory(self, path: Path) -> None:
+        """Add a directory entry (see OutputSink)."""
+        self._check_open()
+        self._add_directory(self._arcname(path) + "/")
+
+    def write_file(
+        self, path: Path, content: str | Iterable[str], executable: bool = False
+    ) -> None:
+        """Add a file entry (see OutputSink)."""
+        self._check_open()
+        chunks = [content] if isinstance(content, str) else content
+        digest = hashlib.sha256()
+
+        def encoded() -> Iterable[bytes]:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                digest.update(data)
+                yield data
+
+        self._add_file(self._arcname(path), encoded(), 0o755 if executable else 0o644)
+        self._record(path, digest.hexdigest(), executable)
+
+    def commit(self) -> None:
+        """Add the manifest and finish the archive."""
+        self._check_open()
+        data = self._manifest_content().encode("utf-8")
+        self._add_file(self._arcname(MANIFEST_PATH), iter([data]), 0o644)
+        self._close_archive()
+        self._is_open = False
+
+    def abort(self) -> None:
+        """Stop writing; the partial archive must be discarded."""
+        if self._is_open:
+            self._is_open = False
+            self._close_archive()
+
+    def _arcname(self, path: Path) -> str:
+        return f"{self.prefix}/{path.as_posix()}" if self.prefix else path.as_posix()
+
+    def _check_open(self) -> None:
+        if not self._is_open:
+            raise RuntimeError(f"{type(self).__name__} is not open")
+
+    def _open_archive(self) -> None:
+        raise NotImplementedError
+
+    def _add_directory(self, name: str) -> None:
+        raise NotImplementedError
+
+    def _add_file(self, name: str, data: Iterable[bytes], mode: int) -> None:
+        raise NotImplementedError
+
+    def _close_archive(self) -> None:
+        raise NotImplementedError
+
+
+class ZipSink(ArchiveSink):
+    """
+    Write a project as a deflate-compressed zip archive.
+
+    File content is compressed as it is produced, so streamed content is
+    never held in memory as a whole.
+    """
+
+    _zip: zipfile.ZipFile
+
+    def _open_archive(self) -> None:
+        self._zip = zipfile.ZipFile(self.fileobj, "w", zipfile.ZIP_DEFLATED)
+
+    def _add_directory(self, name: str) -> None:
+        info = self._zip_info(name, stat.S_IFDIR | 0o755)
+        info.external_attr |= 0x10  # MS-DOS directory flag
+        self._zip.writestr(info, b"")
+
+    def _add_file(self, name: str, data: Iterable[bytes], mode: int) -> None:
+        info = self._zip_info(name, stat.S_IFREG | mode)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with self._zip.open(info, "w") as f:
+            for chunk in data:
+                f.write(chunk)
+
+    def _close_archive(self) -> None:
+        self._zip.close()
+
+    def _zip_info(self, name: str, mode: int) -> zipfile.ZipInfo:
+        # Zip timestamps are local time without a zone, have 2-second
+        # resolution and start in 1980; a fixed mtime is stored as UTC so
+        # the archive does not depend on the machine's time zone
+        to_time = time.localtime if self._mtime_is_now else time.gmtime
+        date_time = to_time(max(self.mtime, 315532800))[:6]
+        info = zipfile.ZipInfo(name, date_time=date_time)
+        info.external_attr = mode << 16
+        info.create_system = 3  # Unix, so extractors honor the mode bits
+        return info
+
+
+class TarSink(ArchiveSink):
+    """
+    Write a project as a gzip-compressed tar archive.
+
+    Tar headers carry the file size, so each file's content is collected
+    before it is added; memory is bounded by the largest single file.
+    """
+
+    _tar: tarfile.TarFile
+
+    _gzip: gzip.GzipFile
+
+    def _open_archive(self) -> None:
+        # Compress through GzipFile rather than tarfile's "w|gz", which
+        # stamps the current time into the gzip header; stream mode ("w|")
+        # never seeks
+        self._gzip = gzip.GzipFile(
+            filename="", mode="wb", fileobj=self.fileobj, mtime=int(self.mtime)
+        )
+        self._tar = tarfile.open(fileobj=self._gzip, mode="w|")
+
+    def _add_directory(self, name: str) -> None:
+        info = self._tar_info(name.rstrip("/"), 0o755)
+        info.type = tarfile.DIRTYPE
+        self._tar.addfile(info)
+
+    def _add_file(self, name: str, data: Iterable[bytes], mode: int) -> None:
+        content = b"".join(data)
+        info = self._tar_info(name, mode)
+        info.size = len(content)
+        self._tar.addfile(info, io.BytesIO(content))
+
+    def _close_archive(self) -> None:
+        self._tar.close()
+        self._gzip.close()  # Leaves fileobj open
+
+    def _tar_info(self, name: str, mode: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.mode = mode
+        info.mtime = int(self.mtime)
+        return info
+
+
+def open_archive_sink(
+    fileobj: IO[bytes],
+    archive_format: str = "zip",
+    prefix: str = "",
+    mtime: float | None = None,
+) -> ArchiveSink:
+    """
+    Create an archive sink for a format.
+
+    Args:
+        fileobj: Writable binary stream
+        archive_format: One of ARCHIVE_FORMATS
+        prefix: Directory name to store entries under
+        mtime: Modification time of entries (default: now)
+
+    Returns:
+        Unopened ZipSink or TarSink
+
+    Raises:
+        ValueError: If archive_format is not supported, or prefix is not a
+            safe directory name
+    """
+    sink_class: type[ArchiveSink]
+    if archive_format == "zip":
+        sink_class = ZipSink
+    elif archive_format == "tar.gz":
+        sink_class = TarSink
+    else:
+        raise ValueError(
+            f"Unknown archive format: {archive_format!r}\n"
+            f"Expected one of: {', '.join(ARCHIVE_FORMATS)}"
+        )
+
+    return sink_class(fileobj, prefix=prefix, mtime=mtime)
+
+
+def check_archive_prefix(prefix: str) -> str:
+    """
+    Check that a prefix is a single, safe directory name.
+
+    Archive entries are stored under the prefix, so a prefix that is
+    absolute or climbs up ("../evil", "/etc") would make them extract
+    outside the directory the archive is unpacked into.
+
+    Args:
+        prefix: Directory name ("" for none)
+
+    Returns:
+        prefix
+
+    Raises:
+        ValueError: If prefix contains "..", path separators, a drive colon
+            or control characters
+    """
+    if ".." in prefix or _UNSAFE_PREFIX_CHARS.search(prefix):
+        raise ValueError(
+            f"Unsafe archive directory name: {prefix!r} "
+            "(it may not contain '..', '/', '\\', ':' or control characters)"
+        )
+    return prefix
+
+
+def _file_digest(path: Path) -> str | None:
+    """Get the SHA-256 of a file's content, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """
+    Clone source to a new file target, sharing its blocks copy-on-write.
+
+    Returns:
+        True on success; False (with no target left behind) if the
+        platform or filesystem does not support it
+    """
+    if fcntl is None or not hasattr(fcntl, "ioctl"):  # pragma: no cover
+        return False
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+    target.unlink()
+    return False
+
+
+def _sibling_path(root: Path, kind: str) -> Path:
+    """Get a random, currently unused hidden path next to root."""
+    while True:
+        path = root.parent / f".{root.name}.{secrets.token_hex(4)}.{kind}"
+        if not os.path.lexists(path):
+            return path
+
+
+def _make_staging_dir(root: Path) -> Path:
+    """
+    Create a staging directory next to root.
+
+    Unlike tempfile.mkdtemp, the directory gets the default (umask) mode,
+    so it can be renamed into place as is.
+    """
+    while True:
+        path = _sibling_path(root, "tmp")
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            continue
+
+
+def _remove_temp_files(root: Path, files: Collection[str]) -> None:
+    """
+    Remove temporary files left in root by a writer killed mid-write.
+
+    Called with root locked. Only the directories of generated files (and
+    of the manifest) can hold them, so only those are scanned.
+
+    Args:
+        root: Project root directory
+        files: Relative POSIX paths of the files the project was generated
+            with
+    """
+    names_by_dir: dict[Path, set[str]] = {}
+    for posix_path in [*files, MANIFEST_PATH.as_posix()]:
+        path = root / posix_path
+        names_by_dir.setdefault(path.parent, set()).add(path.name)
+
+    pattern = re.compile(r"\.(.+)\.[0-9a-f]{8}\.tmp")
+    for directory, names in names_by_dir.items():
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            match = pattern.fullmatch(entry.name)
+            if match and match[1] in names and entry.is_file(follow_symlinks=False):
+                Path(entry.path).unlink(missing_ok=True)
+
+
+def _recover(root: Path) -> None:
+    """
+    Clean up after a writer of root that was killed mid-write.
+
+    Called with root locked, so no other writer is using its siblings:
+    staging directories left next to root are removed.
+    """
+    pattern = re.compile(rf"\.{re.escape(root.name)}\.[0-9a-f]{{8}}\.tmp")
+    try:
+        leftovers = [
+            Path(entry.path)
+            for entry in os.scandir(root.parent)
+            if pattern.fullmatch(entry.name)
+        ]
+    except OSError:
+        return
+
+    for path in leftovers:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+
+def _fsync_dir(path: Path) -> None:
+    """fsync a directory so renames inside it are durable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:  # pragma: no cover - platforms without directory fds
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
+
+
+def _acquire_lock(path: Path) -> int | None:
+    """
+    Take an exclusive lock on a lock file.
+
+    The lock file is deleted on release, so after locking we check that the
+    file we hold is still the one at path; otherwise another writer released
+    and removed it in the meantime and we retry.
+
+    Returns:
+        Locked file descriptor, or None where file locking is unavailable
+    """
+    if fcntl is None:  # pragma: no cover - Windows
+        return None
+
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+
+def _release_lock(path: Path, fd: int | None) -> None:
+    """Delete the lock file and release the lock."""
+    if fd is None:  # pragma: no cover - Windows
+        return
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    os.close(fd)
@@ -0,0 +1,298 @@
+"""
+On-disk cache of generated speckits.
+
+Generating the same definition with the same MetaSpec version and
+templates gives the same speckit, so Generator can keep generated trees
+and materialize a repeat generation by copying, reflinking or hardlinking
+the cached files instead of rendering.
+
+Layout under ~/.metaspec/cache/projects/:
+- <fingerprint>/       the generated tree (with its .metaspec/manifest.json)
+- <fingerprint>.json   entry metadata; its mtime is the entry's last use
+
+Entries are evicted least recently used first once the cache grows past
+its size limit (DEFAULT_MAX_SIZE). The cache is opt-in: `metaspec init
+--cache` and `metaspec serve` use it, plain `metaspec init` does not.
+"""
+
+import json
+import os
+import shutil
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from metaspec.models import SpecKitProject
+from metaspec.output import (
+    COPY_METHODS,
+    DirectorySink,
+    read_manifest,
+    read_manifest_metadata,
+)
+
+# Default size limit for cached trees (a speckit is about 1 MB)
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def get_project_cache_dir() -> Path:
+    """
+    Get the directory holding cached speckits.
+
+    Returns:
+        Path to ~/.metaspec/cache/projects
+    """
+    return Path.home() / ".metaspec" / "cache" / "projects"
+
+
+class RestoredFiles(Mapping[Path, str]):
+    """File contents of a restored speckit, read from disk on first access."""
+
+    def __init__(self, root: Path, paths: Iterable[Path]):
+        """
+        Initialize mapping.
+
+        Args:
+            root: Directory the speckit was restored into
+            paths: Relative paths of its files
+        """
+        self.root = root
+        self._contents: dict[Path, str | None] = dict.fromkeys(paths)
+
+    def __getitem__(self, path: Path) -> str:
+        content = self._contents[path]
+        if content is None:
+            content = (self.root / path).read_text(encoding="utf-8")
+            self._contents[path] = content
+        return content
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._contents)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+
+class ProjectCache:
+    """
+    Cache of generated speckit trees keyed by definition fingerprint.
+
+    See Generator.fingerprint() for how keys are computed.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        method: str = "reflink",
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            directory: Cache directory (default: ~/.metaspec/cache/projects)
+            max_size: Evict entries once cached trees exceed this many bytes
+            method: How restored files are created, one of COPY_METHODS.
+                With "hardlink", generated files share storage with the
+                cache and must not be edited in place.
+
+        Raises:
+            ValueError: If method is not a known copy method
+        """
+        if method not in COPY_METHODS:
+            raise ValueError(
+                f"Unknown copy method: {method!r}\n"
+                f"Expected one of: {', '.join(COPY_METHODS)}"
+            )
+
+        self.directory = directory or get_project_cache_dir()
+        self.max_size = max_size
+        self.method = method
+
+    def contains(self, fingerprint: str) -> bool:
+        """Check whether a speckit is cached."""
+        return self._load_entry(fingerprint) is not None
+
+    def restore(
+        self,
+        fingerprint: str,
+        output_dir: Path,
+        force: bool = False,
+        fsync: str = "none",
+    ) -> SpecKitProject | None:
+        """
+        Materialize a cached speckit.
+
+        Writes like SpecKitProject.write_to_disk (atomically, and
+        incrementally over an earlier generation), copying files from the
+        cache instead of rendering them. The project's files are read from
+        output_dir only when accessed.
+
+        Args:
+            fingerprint: Definition fingerprint
+            output_dir: Output directory
+            force: If True, overwrite existing directory
+            fsync: fsync policy ("none", "files" or "all")
+
+        Returns:
+            The restored project, or None if it is not cached
+
+        Raises:
+            FileExistsError: If output_dir exists and force=False
+        """
+        entry = self._load_entry(fingerprint)
+        tree = self._tree_path(fingerprint)
+        manifest = read_manifest(tree) if entry is not None else None
+        if entry is None or manifest is None:
+            return None
+
+        project = SpecKitProject(
+            root_path=output_dir,
+            metadata=read_manifest_metadata(tree),
+            directories=[Path(path) for path in entry["directories"]],
+            executable_files=[
+                Path(path) for path, info in manifest.items() if info.get("executable")
+            ],
+        )
+
+        try:
+            with DirectorySink(output_dir, force=force, fsync=fsync) as sink:
+                sink.metadata.update(project.metadata)
+                for dir_path in project.directories:
+                    sink.add_directory(dir_path)
+                for posix_path, info in manifest.items():
+                    path = Path(posix_path)
+                    source = tree / path
+                    sink.copy_file(
+                        path,
+                        source,
+                        info["sha256"],
+                        executable=bool(info.get("executable")),
+                        method=self.method,
+                    )
+        except FileNotFoundError:
+            # Evicted concurrently; the sink left output_dir untouched
+            if not self._tree_path(fingerprint).exists():
+                return None
+            raise
+
+        project.files = RestoredFiles(output_dir, map(Path, manifest))
+        project.write_summary = sink.summary
+        self._touch(fingerprint)
+        return project
+
+    def store(self, fingerprint: str, project: SpecKitProject) -> None:
+        """
+        Add a generated speckit to the cache and evict old entries.
+
+        Args:
+            fingerprint: Definition fingerprint
+            project: Generated project
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.contains(fingerprint):
+            self._touch(fingerprint)
+            return
+
+        tree = self._tree_path(fingerprint)
+        if tree.exists():
+            # Tree without metadata (interrupted store) - replace it
+            shutil.rmtree(tree, ignore_errors=True)
+        try:
+            with DirectorySink(tree) as sink:
+                project.write_to(sink)
+        except FileExistsError:
+            return  # Stored concurrently
+
+        entry = {
+            "directories": sorted(path.as_posix() for path in project.directories),
+            "size": _tree_size(tree),
+        }
+        entry_path = self._entry_path(fingerprint)
+        temp_path = entry_path.with_name(f".{entry_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps(entry, indent=2) + "\n", encoding="utf-8")
+        os.replace(temp_path, entry_path)
+
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """
+        Remove least recently used entries until the cache fits max_size.
+
+        Returns:
+            Fingerprints of the removed entries
+        """
+        entries = []
+        total = 0
+        for entry_path in self.directory.glob("*.json"):
+            fingerprint = entry_path.stem
+            entry = self._load_entry(fingerprint)
+            if entry is None:
+                continue
+            try:
+                last_used = entry_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((last_used, fingerprint, entry["size"]))
+            total += entry["size"]
+
+        removed = []
+        for _, fingerprint, size in sorted(entries):
+            if total <= self.max_size:
+                break
+            self.remove(fingerprint)
+            removed.append(fingerprint)
+            total -= size
+
+        return removed
+
+    def remove(self, fingerprint: str) -> None:
+        """Remove one entry."""
+        # Metadata first, so a half-removed entry is never considered cached
+        self._entry_path(fingerprint).unlink(missing_ok=True)
+        shutil.rmtree(self._tree_path(fingerprint), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+
+    def size(self) -> int:
+        """Get the total size of cached trees in bytes."""
+        total = 0
+        for entry_path in self.directory.glob("*.json"):
+            entry = self._load_entry(entry_path.stem)
+            if entry is not None:
+                total += entry["size"]
+        return total
+
+    def _load_entry(self, fingerprint: str) -> dict[str, Any] | None:
+        try:
+            entry = json.loads(
+                self._entry_path(fingerprint).read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("size"), int):
+            return None
+        return entry
+
+    def _touch(self, fingerprint: str) -> None:
+        try:
+            os.utime(self._entry_path(fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def _entry_path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+    def _tree_path(self, fingerprint: str) -> Path:
+        return self.directory / fingerprint
+
+
+def _tree_size(root: Path) -> int:
+    """Get the total size of the files under root (manifest included)."""
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            total += os.path.getsize(os.path.join(dirpath, filename))
+    return total
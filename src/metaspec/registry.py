@@ -4,14 +4,37 @@ Community Speckit Registry
 Manages discovery and installation of community-contributed speckits.
 """
 
+import gzip
 import json
+import marshal
+import os
 import shutil
 import subprocess
+import sys
+import threading
+import time
+from collections.abc import Sequence
+from datetime import timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, get_args, get_origin
 
 from pydantic import BaseModel, Field
 
+from metaspec.search_index import SUGGESTIONS, SearchIndex
+
+# Cached registry and the HTTP validators (ETag, Last-Modified) it was
+# downloaded with, under CommunityRegistry.cache_dir
+CACHE_FILE = "community_speckits.json"
+VALIDATORS_FILE = "community_speckits.validators.json"
+
+# Binary (marshal) snapshot of the cached registry: validated records and the
+# search index, loaded instead of parsing and validating the JSON
+SNAPSHOT_FILE = "community_speckits.snapshot"
+SNAPSHOT_FORMAT = 3
+
+# Age after which the cached registry is revalidated
+CACHE_TTL = timedelta(hours=24)
+
 
 class CommunitySpeckit(BaseModel):
     """Community speckit metadata."""
@@ -29,6 +52,182 @@ class CommunitySpeckit(BaseModel):
     )
 
 
+# CommunitySpeckit fields, in the order of the snapshot's record columns
+RECORD_FIELDS = tuple(CommunitySpeckit.model_fields)
+
+
+class RegistrySnapshot:
+    """
+    Speckits of one registry download, indexed for O(1) lookups.
+
+    A snapshot restored from the binary cache (from_data()) keeps the
+    already validated fields of every speckit in one column per field, and
+    only turns a speckit into a CommunitySpeckit (without validation) when
+    it is first looked up: a search over thousands of speckits builds a
+    handful. The lookups by name, command and PyPI package are built from
+    the columns on the first lookup, which a search does not need.
+
+    Snapshots are shared by every CommunityRegistry of the process reading
+    the same cache, until the cache file or its validators change.
+    """
+
+    def __init__(self, speckits: Sequence[CommunitySpeckit] = ()):
+        """
+        Index validated speckits.
+
+        Args:
+            speckits: Speckits in registry order
+        """
+        self._speckits: list[CommunitySpeckit | None] = list(speckits)
+        self._columns: Sequence[list[Any]] | None = None
+        self.search_index: SearchIndex | None = None  # Built on first search
+        # Positions of the speckits by name, command and PyPI package, built
+        # on first lookup
+        self._lookups: tuple[dict[str, int], ...] | None = None
+
+    def __len__(self) -> int:
+        return len(self._speckits)
+
+    @property
+    def speckits(self) -> list[CommunitySpeckit]:
+        """All speckits, in registry order."""
+        return [self.speckit(doc) for doc in range(len(self._speckits))]
+
+    def speckit(self, doc: int) -> CommunitySpeckit:
+        """
+        Get the speckit at a position.
+
+        Args:
+            doc: Position in the registry
+
+        Returns:
+            CommunitySpeckit (the same object on every call)
+        """
+        speckit = self._speckits[doc]
+        if speckit is None:
+            assert self._columns is not None
+            speckit = CommunitySpeckit.model_construct(
+                **{
+                    field: column[doc]
+                    for field, column in zip(RECORD_FIELDS, self._columns, strict=True)
+                }
+            )
+            self._speckits[doc] = speckit
+        return speckit
+
+    def get(self, key: str) -> CommunitySpeckit | None:
+        """
+        Look up a speckit by name, command or PyPI package, in that order.
+
+        Args:
+            key: Speckit name, command or PyPI package
+
+        Returns:
+            CommunitySpeckit if found, None otherwise
+        """
+        if self._lookups is None:
+            self._lookups = tuple(
+                _first_positions(self._column(field))
+                for field in ("name", "command", "pypi_package")
+            )
+        for positions in self._lookups:
+            doc = positions.get(key)
+            if doc is not None:
+                return self.speckit(doc)
+        return None
+
+    def _column(self, field: str) -> list[Any]:
+        """Get the values of a field for every speckit, in registry order."""
+        if self._columns is not None:
+            return self._columns[RECORD_FIELDS.index(field)]
+        return [getattr(speckit, field) for speckit in self.speckits]
+
+    def to_data(self) -> tuple[Any, ...]:
+        """
+        Get the snapshot as plain data, for the binary cache.
+
+        Returns:
+            Tuple of builtin types, accepted by from_data()
+        """
+        if self.search_index is None:
+            self.search_index = SearchIndex.build(self.speckits)
+        return (
+            RECORD_FIELDS,
+            [self._column(field) for field in RECORD_FIELDS],
+            self.search_index.to_data(),
+        )
+
+    @classmethod
+    def from_data(cls, data: Any) -> "RegistrySnapshot | None":
+        """
+        Restore a snapshot from to_data() output.
+
+        Args:
+            data: Stored snapshot data
+
+        Returns:
+            Snapshot, or None if data is not a valid snapshot of these fields
+        """
+        try:
+            fields, columns, index_data = data
+        except (TypeError, ValueError):
+            return None
+        if fields != RECORD_FIELDS or not (
+            isinstance(columns, list) and len(columns) == len(RECORD_FIELDS)
+        ):
+            return None
+        count = len(columns[0]) if columns else 0
+        index = SearchIndex.from_data(index_data)
+        if (
+            not all(
+                _valid_column(column, count, field.annotation)
+                for column, field in zip(
+                    columns, CommunitySpeckit.model_fields.values(), strict=True
+                )
+            )
+            or index is None
+            or index.doc_count != count
+        ):
+            return None
+
+        snapshot = cls()
+        snapshot._speckits = [None] * count
+        snapshot._columns = columns
+        snapshot.search_index = index
+        return snapshot
+
+
+def _valid_column(column: Any, count: int, annotation: Any) -> bool:
+    """Check that a record column holds count values of a field's type."""
+    if not isinstance(column, list) or len(column) != count:
+        return False
+    if get_origin(annotation) is list:
+        return set(map(type, column)) <= {list} and {
+            type(item) for value in column for item in value
+        } <= set(get_args(annotation))
+    return set(map(type, column)) <= set(get_args(annotation) or (annotation,))
+
+
+def _first_positions(keys: list[str | None]) -> dict[str, int]:
+    """Map every key to the position of its first occurrence (empty: skipped)."""
+    return {key: doc for doc, key in reversed(list(enumerate(keys))) if key}
+
+
+# State of a registry cache: (cache mtime_ns, cache size, validators mtime_ns)
+_CacheState = tuple[int, int, int | None]
+
+# Snapshots per (registry URL, cache file), with the cache state they were
+# read from
+_snapshots: dict[tuple[str, Path], tuple[_CacheState, RegistrySnapshot]] = {}
+_snapshots_lock = threading.Lock()
+
+
+def clear_registry_snapshots() -> None:
+    """Forget the registries memoized in this process."""
+    with _snapshots_lock:
+        _snapshots.clear()
+
+
 class CommunityRegistry:
     """
     Client for community speckit registry.
@@ -38,120 +237,352 @@ class CommunityRegistry:
 
     DEFAULT_REGISTRY_URL = "https://raw.githubusercontent.com/ACNet-AI/awesome-spec-kits/main/speckits.json"
 
-    def __init__(self, registry_url: str | None = None):
+    def __init__(self, registry_url: str | None = None, cache_dir: Path | None = None):
         """
         Initialize community registry client.
 
         Args:
             registry_url: Custom registry URL (default: GitHub awesome-spec-kits)
+            cache_dir: Directory of the registry cache (default:
+                ~/.metaspec/cache), created if missing
         """
         self.registry_url = registry_url or self.DEFAULT_REGISTRY_URL
-        self.cache_dir = Path.home() / ".metaspec" / "cache"
+        self.cache_dir = cache_dir or Path.home() / ".metaspec" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
     def fetch_speckits(self, use_cache: bool = True) -> list[CommunitySpeckit]:
         """
         Fetch speckits from community registry.
 
+        Once the cache is older than CACHE_TTL it is revalidated with a
+        conditional request (If-None-Match / If-Modified-Since from the
+        validators stored with it): a 304 response renews the cache for
+        another CACHE_TTL without downloading the registry again.
+
         Args:
-            use_cache: Use cached data if available (default: True, 24h TTL)
+            use_cache: Use cached data if available (default: True, 24h TTL);
+                False downloads the registry unconditionally
 
         Returns:
             List of community speckits
         """
+        return self._fetch(use_cache).speckits
+
+    def _fetch(self, use_cache: bool) -> RegistrySnapshot:
+        """Fetch the registry as fetch_speckits() does, as a snapshot."""
+        import urllib.error
         import urllib.request
-        from datetime import datetime, timedelta
+        from datetime import datetime
 
-        cache_path = self.cache_dir / "community_speckits.json"
-        cache_ttl = timedelta(hours=24)
+        cache_path = self.cache_dir / CACHE_FILE
+        validators: dict[str, str] = {}
 
         # Check cache
         if use_cache and cache_path.exists():
             cache_age = datetime.now() - datetime.fromtimestamp(
                 cache_path.stat().st_mtime
             )
-            if cache_age < cache_ttl:
-                try:
-                    with open(cache_path, encoding="utf-8") as f:
-                        data = json.load(f)
-                        return [
-                            CommunitySpeckit(**item)
-                            for item in data.get("speckits", [])
-                        ]
-                except Exception:
-                    pass  # Cache corrupted, refetch
+            if cache_age < CACHE_TTL:
+                cached = self._load_cache(cache_path)
+                if cached is not None:
+                    return cached
+                # Cache corrupted, refetch
+            else:
+                validators = self._load_validators()
 
         # Fetch from remote
+        request = urllib.request.Request(
+            self.registry_url, headers={"Accept-Encoding": "gzip"}
+        )
+        if "etag" in validators:
+            request.add_header("If-None-Match", validators["etag"])
+        if "last_modified" in validators:
+            request.add_header("If-Modified-Since", validators["last_modified"])
+
         try:
-            with urllib.request.urlopen(self.registry_url, timeout=5) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                speckits = [
-                    CommunitySpeckit(**item) for item in data.get("speckits", [])
-                ]
-
-                # Update cache
-                with open(cache_path, "w", encoding="utf-8") as f:
-                    json.dump(
-                        {"speckits": [s.model_dump() for s in speckits]}, f, indent=2
-                    )
-
-                return speckits
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    body = response.read()
+                    if _header(response, "Content-Encoding") == "gzip":
+                        body = gzip.decompress(body)
+                    data = json.loads(body.decode("utf-8"))
+                    speckits = [
+                        CommunitySpeckit(**item) for item in data.get("speckits", [])
+                    ]
+                    validators = {
+                        key: value
+                        for key, value in (
+                            ("etag", _header(response, "ETag")),
+                            ("last_modified", _header(response, "Last-Modified")),
+                        )
+                        if value is not None
+                    }
+            except urllib.error.HTTPError as e:
+                if e.code != 304 or not validators:
+                    raise
+                # Not modified: the cache is current again
+                cached = self._load_cache(cache_path)
+                if cached is None:
+                    raise
+                os.utime(cache_path)
+                self._store(cache_path, cached)
+                return cached
+
+            # Update cache (JSON stays readable by older MetaSpec versions)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"speckits": [s.model_dump() for s in speckits]}, f)
+            self._save_validators(validators)
+            snapshot = RegistrySnapshot(speckits)
+            self._store(cache_path, snapshot)
+
+            return snapshot
         except Exception:
             # Fallback to cache if network fails
             if cache_path.exists():
-                try:
-                    with open(cache_path, encoding="utf-8") as f:
-                        data = json.load(f)
-                        return [
-                            CommunitySpeckit(**item)
-                            for item in data.get("speckits", [])
-                        ]
-                except Exception:
-                    pass
+                cached = self._load_cache(cache_path)
+                if cached is not None:
+                    return cached
 
             # No cache and network failed
-            return []
+            return RegistrySnapshot()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        Get the registry, indexed, fetching it if necessary.
 
-    def search(self, query: str) -> list[CommunitySpeckit]:
+        Returns:
+            The snapshot memoized for this registry's cache, unless the cache
+            has expired or changed since it was read
         """
-        Search community speckits by name, description, or tags.
+        snapshot = self._memoized(self.cache_dir / CACHE_FILE, fresh=True)
+        if snapshot is not None:
+            return snapshot
+        return self._fetch(use_cache=True)
+
+    def _memoized(
+        self, cache_path: Path, fresh: bool = False
+    ) -> RegistrySnapshot | None:
+        """
+        Get the snapshot read from the cache in its current state.
 
         Args:
-            query: Search query
+            cache_path: Cache file
+            fresh: Also require the cache to be younger than CACHE_TTL
 
         Returns:
-            List of matching speckits
+            Memoized snapshot, or None if there is none for the current cache
+        """
+        state = self._cache_state(cache_path)
+        if state is None:
+            return None
+        if fresh and time.time() - state[0] / 1e9 >= CACHE_TTL.total_seconds():
+            return None
+        with _snapshots_lock:
+            entry = _snapshots.get((self.registry_url, cache_path))
+        if entry is None or entry[0] != state:
+            return None
+        return entry[1]
+
+    def _remember(
+        self, cache_path: Path, state: _CacheState, snapshot: RegistrySnapshot
+    ) -> None:
+        """Memoize a snapshot read from the cache in this state."""
+        with _snapshots_lock:
+            _snapshots[(self.registry_url, cache_path)] = (state, snapshot)
+
+    def _store(self, cache_path: Path, snapshot: RegistrySnapshot) -> None:
         """
-        all_speckits = self.fetch_speckits()
-        query_lower = query.lower()
+        Index a snapshot of the cache and save it as the binary snapshot.
 
-        matches = []
-        for speckit in all_speckits:
+        Args:
+            cache_path: Cache file the snapshot holds, in its current state
+            snapshot: Snapshot of the cache
+        """
+        state = self._cache_state(cache_path)
+        if state is None:
+            return
+        data = (SNAPSHOT_FORMAT, sys.version_info[:2], state, snapshot.to_data())
+        path = self.cache_dir / SNAPSHOT_FILE
+        temp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_bytes(marshal.dumps(data))
+            temp_path.replace(path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)  # Read from JSON next time
+        self._remember(cache_path, state, snapshot)
+
+    def _read_snapshot(self, state: _CacheState) -> RegistrySnapshot | None:
+        """
+        Read the binary snapshot of the cache.
+
+        Args:
+            state: Current state of the cache
+
+        Returns:
+            Snapshot, or None if it is missing, corrupted, written by another
+            version of MetaSpec or Python (whose marshal format may differ),
+            or does not match the cache state
+        """
+        try:
+            data = marshal.loads((self.cache_dir / SNAPSHOT_FILE).read_bytes())
+            snapshot_format, python_version, snapshot_state, snapshot_data = data
             if (
-                query_lower in speckit.name.lower()
-                or query_lower in speckit.description.lower()
-                or query_lower in speckit.command.lower()
-                or any(query_lower in tag.lower() for tag in speckit.tags)
+                snapshot_format != SNAPSHOT_FORMAT
+                or python_version != sys.version_info[:2]
+                or snapshot_state != state
             ):
-                matches.append(speckit)
+                return None
+            return RegistrySnapshot.from_data(snapshot_data)
+        except Exception:
+            return None
+
+    def _cache_state(self, cache_path: Path) -> _CacheState | None:
+        """Get (mtime_ns, size, validators mtime_ns) of a cache, None if missing."""
+        try:
+            stat = cache_path.stat()
+        except OSError:
+            return None
+        try:
+            validators_mtime: int | None = (
+                (self.cache_dir / VALIDATORS_FILE).stat().st_mtime_ns
+            )
+        except OSError:
+            validators_mtime = None
+        return (stat.st_mtime_ns, stat.st_size, validators_mtime)
+
+    def _load_cache(self, cache_path: Path) -> RegistrySnapshot | None:
+        """
+        Read the cached registry, unless it is memoized in its current state.
+
+        The binary snapshot is used when it matches the cache; otherwise the
+        JSON is parsed and validated, and the binary snapshot rewritten.
+
+        Returns:
+            Snapshot of the cache, or None if it is unreadable
+        """
+        snapshot = self._memoized(cache_path)
+        if snapshot is not None:
+            return snapshot
+        state = self._cache_state(cache_path)
+        if state is None:
+            return None
+
+        snapshot = self._read_snapshot(state)
+        if snapshot is not None:
+            self._remember(cache_path, state, snapshot)
+            return snapshot
+
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+                snapshot = RegistrySnapshot(
+                    [CommunitySpeckit(**item) for item in data.get("speckits", [])]
+                )
+        except Exception:
+            return None
+        self._store(cache_path, snapshot)
+        return snapshot
+
+    def _load_validators(self) -> dict[str, str]:
+        """
+        Read the validators of the cached registry.
+
+        Returns:
+            Dict with "etag" and/or "last_modified", empty if there are none
+            or they belong to another registry URL
+        """
+        try:
+            with open(self.cache_dir / VALIDATORS_FILE, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("registry_url") != self.registry_url:
+            return {}
+        return {
+            key: data[key]
+            for key in ("etag", "last_modified")
+            if isinstance(data.get(key), str)
+        }
+
+    def _save_validators(self, validators: dict[str, str]) -> None:
+        """Store the validators of the cached registry (removed if empty)."""
+        path = self.cache_dir / VALIDATORS_FILE
+        if not validators:
+            path.unlink(missing_ok=True)
+            return
+        path.write_text(
+            json.dumps({"registry_url": self.registry_url, **validators}, indent=2),
+            encoding="utf-8",
+        )
+
+    def search(
+        self, query: str, limit: int | None = None, offset: int = 0
+    ) -> list[CommunitySpeckit]:
+        """
+        Search community speckits by name, command, tags and description.
+
+        Results are ranked with BM25 (see metaspec.search_index): matches in
+        the name count most, then command, tags and description. Every term
+        of a multi-term query must match, as a word, a word prefix or
+        anywhere inside a word (ranked in that order).
+
+        Args:
+            query: Search query (empty: all speckits, in registry order)
+            limit: Maximum number of results (default: all)
+            offset: Number of best results to skip
+
+        Returns:
+            List of matching speckits, best match first
+        """
+        snapshot = self.snapshot()
+        index = self._search_index(snapshot)
+        return [
+            snapshot.speckit(doc)
+            for doc in index.search(query, limit=limit, offset=offset)
+        ]
+
+    def suggest(self, query: str, limit: int = SUGGESTIONS) -> list[CommunitySpeckit]:
+        """
+        Find speckits whose name, command or a tag resembles query.
 
-        return matches
+        For typos ("opnspec", "api-spekit") where search() finds nothing.
+
+        Args:
+            query: Possibly misspelled name, command or tag
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of speckits, closest match first
+        """
+        snapshot = self.snapshot()
+        index = self._search_index(snapshot)
+        return [snapshot.speckit(doc) for doc in index.suggest(query, limit=limit)]
+
+    def _search_index(self, snapshot: RegistrySnapshot) -> SearchIndex:
+        """
+        Get the search index of a snapshot.
+
+        Snapshots of the cache carry the index saved in the binary snapshot,
+        so it is only rebuilt when the cached registry changes.
+
+        Returns:
+            Index of the snapshot, built now if it has none
+        """
+        if snapshot.search_index is None:
+            snapshot.search_index = SearchIndex.build(snapshot.speckits)
+        return snapshot.search_index
 
     def get(self, name_or_command: str) -> CommunitySpeckit | None:
         """
-        Get speckit by name or command.
+        Get speckit by name, command or PyPI package.
 
         Args:
-            name_or_command: Speckit name or command
+            name_or_command: Speckit name, command or PyPI package
 
         Returns:
             CommunitySpeckit if found, None otherwise
         """
-        all_speckits = self.fetch_speckits()
-        for speckit in all_speckits:
-            if speckit.name == name_or_command or speckit.command == name_or_command:
-                return speckit
-        return None
+        return self.snapshot().get(name_or_command)
 
     def install(self, name_or_command: str) -> tuple[bool, str]:
         """
@@ -287,6 +718,13 @@ class CommunityRegistry:
         return shutil.which(command) is not None
 
 
+def _header(response: Any, name: str) -> str | None:
+    """Get a response header, or None if it is missing."""
+    headers = getattr(response, "headers", None)
+    value = headers.get(name) if headers is not None else None
+    return value if isinstance(value, str) else None
+
+
 # Global registry instance
 _registry: CommunityRegistry | None = None
 
@@ -0,0 +1,500 @@
+"""
+Ranked full-text search over registry speckits.
+
+SearchIndex is an inverted index from tokens to the speckits containing
+them, weighted with BM25F: a token's weight in a speckit combines its
+frequency in each field, scaled by the field's boost (name > command >
+tags > description) and normalized by field length, then saturated and
+multiplied by the token's inverse document frequency. Weights are
+precomputed, so a query only adds up postings:
+
+    index = SearchIndex.build(speckits)
+    for doc in index.search("api spec", limit=10):
+        print(speckits[doc].name)
+
+Every query term must match a token exactly, as a prefix ("dev" finds
+"devops") or anywhere inside it ("kit" finds "speckit", as registry search
+did before it was ranked); prefix matches count less than exact ones, and
+substring matches less than prefix matches. Tokens are runs of Unicode
+letters and digits, so non-ASCII names and descriptions are searchable.
+
+For misspelled queries ("opnspec", "api-spekit") the index also maps the
+character trigrams of every name, command and tag to those terms;
+suggest() ranks the terms by trigram similarity to the query:
+
+    for doc in index.suggest("opnspec"):
+        print(f"Did you mean {speckits[doc].name}?")
+
+The index is stored with the registry's binary cache snapshot (see
+CommunityRegistry) and rebuilt when the registry changes. Its document
+numbers, weights and positions are kept in packed arrays (PackedLists),
+which load from the snapshot as a few bytes objects.
+"""
+
+import heapq
+import math
+import re
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from itertools import chain
+from typing import Any, Protocol
+
+# Field weights: a match in the name counts most
+FIELD_BOOSTS = {"name": 4.0, "command": 3.0, "tags": 2.0, "description": 1.0}
+
+# BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+# Weight of a token matched by prefix relative to an exact match
+PREFIX_WEIGHT = 0.5
+
+# Weight of a token matched inside (not at the start of) a token
+SUBSTRING_WEIGHT = 0.25
+
+# Minimum trigram similarity (shared / all trigrams) of a suggestion
+SIMILARITY_THRESHOLD = 0.3
+
+# Suggestions returned by default
+SUGGESTIONS = 5
+
+INDEX_FORMAT = 4
+
+# Letters and digits of any script; underscores separate tokens
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+class Searchable(Protocol):
+    """A registry entry (CommunitySpeckit)."""
+
+    name: str
+    command: str
+    description: str
+    tags: list[str]
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase tokens of letters and digits.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Tokens, e.g. ["api", "speckit"] for "API-Speckit" (letters of any
+        script count: ["日本語"] for "日本語")
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(text: str) -> set[str]:
+    """
+    Get the character trigrams of text.
+
+    Words are padded with two spaces in front and one behind, so short
+    words and word starts get trigrams of their own.
+
+    Args:
+        text: Text (lowercased, runs of whitespace collapsed)
+
+    Returns:
+        Set of trigrams, e.g. {"  a", " ap", "api", "pi "} for "api"
+        (empty for blank text)
+    """
+    words = " ".join(text.lower().split())
+    if not words:
+        return set()
+    padded = f"  {words} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class PackedLists:
+    """
+    Lists of numbers stored back to back in one array.
+
+    List i is values[offsets[i]:offsets[i + 1]]. Unlike a list of lists,
+    the whole collection is stored as two bytes objects, which load
+    without creating an object per number.
+    """
+
+    def __init__(self, offsets: array, values: array):
+        """
+        Initialize from arrays.
+
+        Args:
+            offsets: Start of every list in values, then len(values)
+            values: Numbers of all lists
+        """
+        self.offsets = offsets
+        self.values = values
+
+    @classmethod
+    def pack(cls, lists: Iterable[Iterable[Any]], typecode: str = "I") -> "PackedLists":
+        """
+        Pack lists into one array.
+
+        Args:
+            lists: Lists of numbers
+            typecode: array typecode of the numbers ("I" or "d")
+
+        Returns:
+            Packed lists
+        """
+        offsets = array("I", [0])
+        values = array(typecode)
+        for items in lists:
+            values.extend(items)
+            offsets.append(len(values))
+        return cls(offsets, values)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> array:
+        return self.values[self.offsets[position] : self.offsets[position + 1]]
+
+    def to_data(self) -> tuple[bytes, bytes]:
+        """Get the offsets and values as bytes, accepted by from_data()."""
+        return self.offsets.tobytes(), self.values.tobytes()
+
+    @classmethod
+    def from_data(cls, data: Any, typecode: str = "I") -> "PackedLists":
+        """
+        Restore lists from to_data() output.
+
+        Raises:
+            TypeError, ValueError: If data is not packed lists of typecode
+        """
+        offsets_data, values_data = data
+        offsets, values = array("I"), array(typecode)
+        offsets.frombytes(offsets_data)
+        values.frombytes(values_data)
+        if not offsets or offsets[0] != 0 or offsets[-1] != len(values):
+            raise ValueError("Inconsistent packed lists")
+        return cls(offsets, values)
+
+
+class SearchIndex:
+    """Inverted index with precomputed BM25F weights."""
+
+    def __init__(
+        self,
+        doc_count: int,
+        tokens: list[str],
+        postings: PackedLists,
+        weights: PackedLists,
+        terms: list[str],
+        term_docs: PackedLists,
+        term_sizes: array,
+        grams: list[str],
+        gram_terms: PackedLists,
+    ):
+        """
+        Initialize from index data.
+
+        Args:
+            doc_count: Number of indexed entries
+            tokens: Indexed tokens, sorted
+            postings: For each token, the documents containing it (ascending)
+            weights: For each token, its weight in each of those documents
+            terms: Every distinct lowercased name, command and tag
+            term_docs: For each term, the documents having it
+            term_sizes: For each term, its number of trigrams
+            grams: Trigrams of the terms, sorted
+            gram_terms: For each trigram, the positions in terms of the terms
+                having it
+        """
+        self.doc_count = doc_count
+        self.tokens = tokens
+        self.postings = postings
+        self.weights = weights
+        self.terms = terms
+        self.term_docs = term_docs
+        self.term_sizes = term_sizes
+        self.grams = grams
+        self.gram_terms = gram_terms
+
+    @classmethod
+    def build(cls, speckits: Iterable[Searchable]) -> "SearchIndex":
+        """
+        Index speckits.
+
+        Args:
+            speckits: Entries; their positions are the document numbers
+
+        Returns:
+            New index
+        """
+        speckits = list(speckits)
+        fields: list[dict[str, list[str]]] = [
+            {
+                "name": tokenize(speckit.name),
+                "command": tokenize(speckit.command),
+                "tags": [token for tag in speckit.tags for token in tokenize(tag)],
+                "description": tokenize(speckit.description),
+            }
+            for speckit in speckits
+        ]
+        doc_count = len(fields)
+        average = {
+            field: sum(len(doc[field]) for doc in fields) / max(doc_count, 1) or 1.0
+            for field in FIELD_BOOSTS
+        }
+
+        # Length-normalized, boosted term frequencies per token and document
+        frequencies: dict[str, dict[int, float]] = {}
+        for doc, doc_fields in enumerate(fields):
+            for field, tokens in doc_fields.items():
+                if not tokens:
+                    continue
+                norm = FIELD_BOOSTS[field] / (1 - B + B * len(tokens) / average[field])
+                for token in tokens:
+                    tf = frequencies.setdefault(token, {})
+                    tf[doc] = tf.get(doc, 0.0) + norm
+
+        tokens = sorted(frequencies)
+        postings = [sorted(frequencies[token]) for token in tokens]
+        weights = []
+        for token, docs in zip(tokens, postings, strict=True):
+            tf = frequencies[token]
+            idf = math.log(1 + (doc_count - len(tf) + 0.5) / (len(tf) + 0.5))
+            weights.append(
+                [round(idf * tf[doc] * (K1 + 1) / (tf[doc] + K1), 6) for doc in docs]
+            )
+
+        # Names, commands and tags for suggestions
+        term_docs: dict[str, list[int]] = {}
+        for doc, speckit in enumerate(speckits):
+            for term in (speckit.name, speckit.command, *speckit.tags):
+                docs = term_docs.setdefault(term.lower(), [])
+                if not docs or docs[-1] != doc:
+                    docs.append(doc)
+        term_sizes = array("I")
+        gram_terms: dict[str, list[int]] = {}
+        for position, term in enumerate(term_docs):
+            term_grams = trigrams(term)
+            term_sizes.append(len(term_grams))
+            for gram in term_grams:
+                gram_terms.setdefault(gram, []).append(position)
+        grams = sorted(gram_terms)
+
+        return cls(
+            doc_count,
+            tokens,
+            PackedLists.pack(postings),
+            PackedLists.pack(weights, "d"),
+            list(term_docs),
+            PackedLists.pack(term_docs.values()),
+            term_sizes,
+            grams,
+            PackedLists.pack(gram_terms[gram] for gram in grams),
+        )
+
+    def search(
+        self, query: str, limit: int | None = None, offset: int = 0
+    ) -> list[int]:
+        """
+        Find the entries matching every term of a query, best first.
+
+        Terms match tokens exactly, by prefix or anywhere inside a token.
+
+        Args:
+            query: Search terms; a blank query matches every entry, a query
+                without letters or digits ("++") none
+            limit: Maximum number of results (default: all)
+            offset: Number of best results to skip
+
+        Returns:
+            Document numbers, by descending score, ties in registry order
+        """
+        if not query.strip():
+            docs = range(self.doc_count)[offset:]
+            return list(docs if limit is None else docs[:limit])
+
+        scores = self._score(tokenize(query))
+        if not scores:
+            return []
+        ranked = ((-score, doc) for doc, score in scores.items())
+        if limit is None:
+            return [doc for _, doc in sorted(ranked)][offset:]
+        return [doc for _, doc in heapq.nsmallest(offset + limit, ranked)][offset:]
+
+    def _score(self, terms: list[str]) -> dict[int, float]:
+        """Add up the scores of the documents matching every term."""
+        scores: dict[int, float] | None = None
+        for term in dict.fromkeys(terms):
+            term_scores = self._match(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc: score + term_scores[doc]
+                    for doc, score in scores.items()
+                    if doc in term_scores
+                }
+            if not scores:
+                return {}
+        return scores or {}
+
+    def _match(self, term: str) -> dict[int, float]:
+        """Score the documents containing term in a token."""
+        tokens = self.tokens
+        # Tokens starting with term are adjacent in sorted order
+        start = end = bisect_left(tokens, term)
+        while end < len(tokens) and tokens[end].startswith(term):
+            end += 1
+        matches = [
+            (position, 1.0 if tokens[position] == term else PREFIX_WEIGHT)
+            for position in range(start, end)
+        ]
+        matches += [
+            (position, SUBSTRING_WEIGHT)
+            for position in chain(range(start), range(end, len(tokens)))
+            if term in tokens[position]
+        ]
+
+        scores: dict[int, float] = {}
+        for position, factor in matches:
+            docs, weights = self.postings[position], self.weights[position]
+            for doc, weight in zip(docs, weights, strict=True):
+                # A term matching several tokens counts its best match
+                score = weight * factor
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+    def suggest(
+        self,
+        query: str,
+        limit: int = SUGGESTIONS,
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> list[int]:
+        """
+        Find entries whose name, command or a tag resembles query.
+
+        Args:
+            query: Possibly misspelled name, command or tag
+            limit: Maximum number of entries
+            threshold: Minimum trigram similarity (0-1) of a matching term
+
+        Returns:
+            Document numbers, most similar first (by their best term)
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        # Shared trigrams per term
+        shared: Counter[int] = Counter()
+        for gram in query_grams:
+            position = bisect_left(self.grams, gram)
+            if position < len(self.grams) and self.grams[position] == gram:
+                shared.update(self.gram_terms[position])
+        scored = []
+        for position, count in shared.items():
+            size = self.term_sizes[position]
+            similarity = count / (len(query_grams) + size - count)
+            if similarity >= threshold:
+                scored.append((-similarity, position))
+        scored.sort()
+
+        docs: dict[int, None] = {}
+        for _, position in scored:
+            for doc in self.term_docs[position]:
+                docs.setdefault(doc)
+            if len(docs) >= limit:
+                break
+        return list(docs)[:limit]
+
+    def to_data(self) -> tuple[Any, ...]:
+        """
+        Get the index as plain data, for storage (e.g. with marshal).
+
+        Numbers are stored as packed arrays, with a CRC-32 of their bytes.
+
+        Returns:
+            Tuple of builtin types, accepted by from_data()
+        """
+        packed = (
+            *self.postings.to_data(),
+            *self.weights.to_data(),
+            *self.term_docs.to_data(),
+            self.term_sizes.tobytes(),
+            *self.gram_terms.to_data(),
+        )
+        return (
+            INDEX_FORMAT,
+            self.doc_count,
+            self.tokens,
+            self.terms,
+            self.grams,
+            packed,
+            _checksum(packed),
+        )
+
+    @classmethod
+    def from_data(cls, data: Any) -> "SearchIndex | None":
+        """
+        Restore an index from to_data() output.
+
+        Packed numbers are checked against their checksum rather than one
+        by one, since a warm registry search starts with this.
+
+        Args:
+            data: Stored index data
+
+        Returns:
+            Index, or None if data is not an index of this format
+        """
+        if not isinstance(data, tuple) or len(data) != 7 or data[0] != INDEX_FORMAT:
+            return None
+        _, doc_count, tokens, terms, grams, packed, checksum = data
+        try:
+            if not (
+                isinstance(doc_count, int)
+                and all(
+                    isinstance(strings, list) and set(map(type, strings)) <= {str}
+                    for strings in (tokens, terms, grams)
+                )
+                and isinstance(packed, tuple)
+                and len(packed) == 9
+                and set(map(type, packed)) <= {bytes}
+                and _checksum(packed) == checksum
+            ):
+                return None
+            postings = PackedLists.from_data(packed[0:2])
+            weights = PackedLists.from_data(packed[2:4], "d")
+            term_docs = PackedLists.from_data(packed[4:6])
+            term_sizes = array("I")
+            term_sizes.frombytes(packed[6])
+            gram_terms = PackedLists.from_data(packed[7:9])
+        except (TypeError, ValueError):
+            return None
+        if not (
+            len(postings) == len(weights) == len(tokens)
+            and len(term_docs) == len(term_sizes) == len(terms)
+            and len(gram_terms) == len(grams)
+        ):
+            return None
+        return cls(
+            doc_count,
+            tokens,
+            postings,
+            weights,
+            terms,
+            term_docs,
+            term_sizes,
+            grams,
+            gram_terms,
+        )
+
+
+def _checksum(chunks: Iterable[bytes]) -> int:
+    """Get the CRC-32 of byte strings, in order."""
+    checksum = 0
+    for chunk in chunks:
+        checksum = zlib.crc32(chunk, checksum)
+    return checksum
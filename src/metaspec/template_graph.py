@@ -0,0 +1,117 @@
+"""
+Dependency graph from templates to the context keys they read.
+
+A template depends on the undeclared variables it reads plus, through
+{% include %}, {% extends %} and {% import %}, on those of every template
+it references. Generator.regenerate uses the graph to re-render only the
+templates whose context keys changed.
+"""
+
+from collections.abc import Iterable
+
+from jinja2 import BaseLoader, ChoiceLoader, Environment, TemplateNotFound, meta
+
+
+class TemplateDependencyGraph:
+    """
+    Lazily computed, memoized template dependencies.
+
+    Templates whose variables TemplateEnvironment already recorded (they
+    reference no other templates) cost a dictionary lookup; others are
+    parsed once to follow their references.
+    """
+
+    def __init__(self, env: Environment):
+        """
+        Initialize graph.
+
+        Args:
+            env: Environment templates are loaded from
+        """
+        self.env = env
+        self._dependencies: dict[str, frozenset[str] | None] = {}
+
+    def dependencies(self, name: str) -> frozenset[str] | None:
+        """
+        Get the context keys a template's output depends on.
+
+        Args:
+            name: Template name
+
+        Returns:
+            Context keys read by the template or any template it references,
+            or None if that cannot be determined (dynamic references), in
+            which case the template depends on everything
+
+        Raises:
+            TemplateNotFound: If the template does not exist
+        """
+        if name not in self._dependencies:
+            self._dependencies[name] = self._resolve(name, set())
+        return self._dependencies[name]
+
+    def affected(self, names: Iterable[str], changed_keys: set[str]) -> list[str]:
+        """
+        Get the templates whose output may change with some context keys.
+
+        Args:
+            names: Template names to check
+            changed_keys: Context keys whose values changed
+
+        Returns:
+            Names (in input order) that depend on a changed key or whose
+            dependencies are unknown
+        """
+        result = []
+        for name in names:
+            dependencies = self.dependencies(name)
+            if dependencies is None or dependencies & changed_keys:
+                result.append(name)
+        return result
+
+    def _resolve(self, name: str, visiting: set[str]) -> frozenset[str] | None:
+        if name in self._dependencies:
+            return self._dependencies[name]
+
+        # Loading records the analysis on TemplateEnvironment (from the
+        # parse, the bytecode cache or the compiled template manifest)
+        self.env.get_template(name)
+        known = getattr(self.env, "template_variables", {}).get(name)
+        if known is not None:
+            return frozenset(known)
+
+        ast = self.env.parse(_get_source(self.env, name), name)
+        variables = set(meta.find_undeclared_variables(ast))
+
+        visiting = visiting | {name}
+        for reference in meta.find_referenced_templates(ast):
+            if reference is None:
+                return None  # Computed template name
+            if reference in visiting:
+                continue  # Recursive import; its variables are already counted
+            dependencies = self._resolve(reference, visiting)
+            if dependencies is None:
+                return None
+            variables |= dependencies
+
+        return frozenset(variables)
+
+
+def _get_source(env: Environment, name: str) -> str:
+    """Get a template's source, skipping loaders without source access."""
+    loaders: list[BaseLoader] = []
+    if isinstance(env.loader, ChoiceLoader):
+        loaders = list(env.loader.loaders)
+    elif env.loader is not None:
+        loaders = [env.loader]
+
+    for loader in loaders:
+        if not loader.has_source_access:
+            continue  # e.g. compiled templates
+        try:
+            source, _, _ = loader.get_source(env, name)
+            return source
+        except TemplateNotFound:
+            continue
+
+    raise TemplateNotFound(name)
@@ -0,0 +1,188 @@
+"""
+Index of the templates available to a Generator.
+
+Template selection works from this index instead of hardcoded lists, so
+adding a library (e.g. library/sdd/my-framework/commands/*.md.j2) or a
+MetaSpec command group (meta/<group>/commands/*.md.j2) needs no code
+changes, and optional templates are looked up instead of probed through
+the loader.
+
+Template layout:
+- library/<source>/<kind>/<name>.j2, where <source> may be nested
+  ("generic/greenfield", "sdd/spec-kit") and <kind> is "commands" or
+  "templates"
+- meta/<group>/commands/<name>.j2 (MetaSpec development commands)
+- meta/<group>/templates/<name>.j2 (templates a command group reads from
+  the MetaSpec source tree; not copied into speckits)
+- meta/templates/<name>.j2 (MetaSpec output templates, copied into speckits)
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from jinja2 import Environment
+
+LIBRARY_DIR = "library"
+META_DIR = "meta"
+TEMPLATE_SUFFIX = ".j2"
+
+# Template kinds inside a library or MetaSpec command group
+KINDS = ("commands", "templates")
+
+# Library sources whose commands come from their nested libraries
+# (library/generic/greenfield/, library/generic/brownfield/); other sources,
+# e.g. "sdd", only name a directory of separate libraries
+ROUTED_SOURCES = frozenset({"generic"})
+
+
+@dataclass(frozen=True)
+class TemplateEntry:
+    """One indexed template."""
+
+    path: str  # Template name, e.g. "library/sdd/spec-kit/commands/plan.md.j2"
+    source: str  # Library or command group, e.g. "sdd/spec-kit", "sds"
+    kind: str  # One of KINDS
+    name: str  # Output file name, e.g. "plan.md"
+
+    @property
+    def root(self) -> str:
+        """Directory holding the entry's kind directories."""
+        return self.path.rsplit("/", 2)[0]
+
+
+class TemplateIndex:
+    """
+    Lookup tables over a set of template names.
+
+    Routed library sources (ROUTED_SOURCES) resolve to nested libraries:
+    "generic" finds commands in library/generic/greenfield/ and
+    library/generic/brownfield/ unless library/generic/ itself provides
+    them.
+    """
+
+    def __init__(self, template_names: Iterable[str]):
+        """
+        Build the index.
+
+        Args:
+            template_names: Names of all available templates
+
+        Raises:
+            ValueError: If nested libraries of a routed source provide the
+                same template, so the source cannot pick one
+        """
+        self.paths = frozenset(template_names)
+        self._library: dict[tuple[str, str, str], TemplateEntry] = {}
+        self._meta_commands: dict[str, list[TemplateEntry]] = {}
+        self._meta_templates: list[TemplateEntry] = []
+
+        library_entries = []
+        for path in sorted(self.paths):
+            entry = _parse_entry(path)
+            if entry is None:
+                continue
+            if path.startswith(f"{LIBRARY_DIR}/"):
+                library_entries.append(entry)
+            elif entry.kind == "commands":
+                self._meta_commands.setdefault(entry.source, []).append(entry)
+            elif entry.source == "":
+                self._meta_templates.append(entry)
+
+        # Exact sources first, so they win over entries of nested libraries
+        for entry in library_entries:
+            self._library[(entry.source, entry.kind, entry.name)] = entry
+        routed: dict[tuple[str, str, str], TemplateEntry] = {}
+        for entry in library_entries:
+            parent = entry.source.split("/", 1)[0]
+            if parent not in ROUTED_SOURCES or parent == entry.source:
+                continue
+            key = (parent, entry.kind, entry.name)
+            if key in self._library:
+                continue
+            other = routed.setdefault(key, entry)
+            if other is not entry:
+                raise ValueError(
+                    f"Ambiguous template for source '{parent}': "
+                    f"{other.path} and {entry.path}"
+                )
+        self._library.update(routed)
+
+    @classmethod
+    def from_environment(cls, env: Environment) -> "TemplateIndex":
+        """
+        Index every template an environment's loader can list.
+
+        Args:
+            env: Jinja2 environment
+
+        Returns:
+            TemplateIndex
+        """
+        return cls(env.list_templates())
+
+    def __contains__(self, path: object) -> bool:
+        return path in self.paths
+
+    def get(self, source: str, kind: str, name: str) -> TemplateEntry | None:
+        """
+        Look up a library template.
+
+        Args:
+            source: Library, e.g. "generic" or "sdd/spec-kit"
+            kind: One of KINDS
+            name: Output file name, e.g. "plan.md"
+
+        Returns:
+            TemplateEntry, or None if the library has no such template
+        """
+        return self._library.get((source, kind, name))
+
+    def library_root(self, source: str, command: str) -> str:
+        """
+        Get the library directory providing a slash command.
+
+        Args:
+            source: Library the command comes from
+            command: Command name, e.g. "plan"
+
+        Returns:
+            Directory of the library holding the command's command file or
+            template, or library/<source> if it has neither
+        """
+        entry = self.get(source, "commands", f"{command}.md") or self.get(
+            source, "templates", f"{command}-template.md"
+        )
+        return entry.root if entry else f"{LIBRARY_DIR}/{source}"
+
+    def meta_command_groups(self) -> dict[str, list[TemplateEntry]]:
+        """
+        Get the MetaSpec development commands.
+
+        Returns:
+            Dict of {group: entries}, e.g. {"sds": [...], "sdd": [...]}
+        """
+        return self._meta_commands
+
+    def meta_templates(self) -> list[TemplateEntry]:
+        """Get the MetaSpec output templates copied into speckits."""
+        return self._meta_templates
+
+
+def _parse_entry(path: str) -> TemplateEntry | None:
+    """Parse a library or meta template path into an entry."""
+    if not path.endswith(TEMPLATE_SUFFIX):
+        return None
+
+    parts = path[: -len(TEMPLATE_SUFFIX)].split("/")
+    if len(parts) < 3 or parts[0] not in (LIBRARY_DIR, META_DIR):
+        return None
+
+    kind = parts[-2]
+    if kind not in KINDS:
+        return None
+
+    source = "/".join(parts[1:-2])
+    if parts[0] == LIBRARY_DIR and not source:
+        return None
+
+    return TemplateEntry(path=path, source=source, kind=kind, name=parts[-1])
@@ -0,0 +1,386 @@
+"""
+Watch mode: regenerate a speckit whenever its inputs change.
+
+    watcher = DefinitionWatcher(Path("speckit.yaml"), Path("my-speckit"))
+    watcher.run(on_update=print)
+
+The definition file and the custom template directory (if any) are
+watched with inotify on Linux and by polling elsewhere. Each change runs
+Generator.regenerate, so only templates reading the changed definition
+values are re-rendered and only files whose content changed are rewritten.
+"""
+
+import ctypes
+import ctypes.util
+import difflib
+import os
+import select
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from metaspec.generator import Generator, create_generator
+from metaspec.models import MetaSpecDefinition
+from metaspec.output import WriteSummary
+
+# Seconds between checks when polling
+POLL_INTERVAL = 0.5
+
+# Seconds to wait for more events after the first one, so an editor's
+# write-rename-chmod sequence triggers a single regeneration
+DEBOUNCE = 0.05
+
+# inotify event mask: anything that can change a file's content or existence
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """One file touched by a regeneration."""
+
+    status: str  # "A" (created), "M" (updated) or "D" (removed)
+    path: Path
+    added: int = 0  # Lines added
+    removed: int = 0  # Lines removed
+
+    def __str__(self) -> str:
+        return f"{self.status} {self.path.as_posix()} (+{self.added} -{self.removed})"
+
+
+@dataclass
+class WatchUpdate:
+    """Outcome of one regeneration."""
+
+    summary: WriteSummary
+    changes: list[FileChange] = field(default_factory=list)
+    duration: float = 0.0  # Wall time in seconds
+    changed_inputs: list[Path] = field(default_factory=list)  # Empty at start
+
+
+class FileWatcher:
+    """
+    Detect changes to files and directory trees.
+
+    Changes are found by comparing (mtime, size) snapshots; inotify, when
+    available, only wakes the watcher up so it does not have to poll.
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        """
+        Initialize watcher and take the first snapshot.
+
+        Args:
+            paths: Files and directories (watched recursively)
+            poll_interval: Seconds between checks when polling
+            use_inotify: Use inotify if the platform supports it
+        """
+        self.paths = [path.resolve() for path in paths]
+        self.poll_interval = poll_interval
+        self._inotify = _Inotify.create() if use_inotify else None
+        self._snapshot = self._take_snapshot()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether changes are detected through inotify."""
+        return self._inotify is not None
+
+    def wait(
+        self, timeout: float | None = None, stop: threading.Event | None = None
+    ) -> set[Path]:
+        """
+        Block until watched files change.
+
+        Args:
+            timeout: Give up after this many seconds (default: wait forever)
+            stop: Return early once this event is set
+
+        Returns:
+            Paths of the files that were created, modified or removed
+            (empty on timeout or stop)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while stop is None or not stop.is_set():
+            remaining = self.poll_interval
+            if deadline is not None:
+                remaining = min(remaining, deadline - time.monotonic())
+                if remaining <= 0:
+                    break
+
+            if self._inotify is not None:
+                self._inotify.watch(self._directories())
+                if self._inotify.wait(remaining):
+                    time.sleep(DEBOUNCE)
+                    self._inotify.drain()
+            else:
+                time.sleep(remaining)
+
+            snapshot = self._take_snapshot()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            if changed:
+                return changed
+
+        return set()
+
+    def close(self) -> None:
+        """Release the inotify instance, if any."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _directories(self) -> set[Path]:
+        """Directories to watch with inotify (parents of watched files)."""
+        directories = set()
+        for path in self.paths:
+            if path.is_dir():
+                directories.add(path)
+                for dirpath, _, _ in os.walk(path):
+                    directories.add(Path(dirpath))
+            else:
+                # Editors often replace files by renaming, which a watch on
+                # the file itself would miss
+                directories.add(path.parent)
+        return directories
+
+    def _take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        """Get (mtime_ns, size) of every watched file."""
+        snapshot = {}
+        for path in self.paths:
+            files: Iterable[Path] = [path]
+            if path.is_dir():
+                files = (
+                    Path(dirpath) / filename
+                    for dirpath, _, filenames in os.walk(path)
+                    for filename in filenames
+                )
+            for file_path in files:
+                try:
+                    stat = file_path.stat()
+                except OSError:
+                    continue  # Missing or removed while walking
+                snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+
+class DefinitionWatcher:
+    """Regenerate a speckit from a definition file whenever inputs change."""
+
+    def __init__(
+        self,
+        definition_path: Path,
+        output_dir: Path,
+        custom_template_dir: Path | None = None,
+        fsync: str = "none",
+        poll_interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        """
+        Initialize watcher.
+
+        Args:
+            definition_path: YAML or JSON definition file
+            output_dir: Speckit directory (created or updated in place)
+            custom_template_dir: Optional path to custom templates (watched too)
+            fsync: fsync policy for writing ("none", "files" or "all")
+            poll_interval: Seconds between checks when polling
+            use_inotify: Use inotify if the platform supports it
+        """
+        self.definition_path = definition_path
+        self.output_dir = output_dir
+        self.custom_template_dir = custom_template_dir
+        self.fsync = fsync
+        self.generator = self._create_generator()
+        self.watcher = FileWatcher(
+            [definition_path, *([custom_template_dir] if custom_template_dir else [])],
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        # Content of generated files as of the last update, for diffs
+        self._contents: dict[Path, str] = {}
+
+    def update(self, changed_inputs: Iterable[Path] = ()) -> WatchUpdate:
+        """
+        Regenerate the speckit once.
+
+        Args:
+            changed_inputs: Files that changed since the last update
+
+        Returns:
+            What was regenerated
+
+        Raises:
+            Exception: Whatever loading the definition or generating raises
+                (the output directory is left as it was)
+        """
+        start = time.perf_counter()
+        changed_inputs = sorted(changed_inputs)
+        template_dir = self.custom_template_dir
+        if template_dir is not None and any(
+            path.is_relative_to(template_dir.resolve()) for path in changed_inputs
+        ):
+            # Templates changed: drop compiled templates, indexes and memoized
+            # renders (regenerate then re-renders every template)
+            self.generator = self._create_generator()
+
+        meta_spec = MetaSpecDefinition.from_file(self.definition_path)
+        summary = self.generator.regenerate(meta_spec, self.output_dir, self.fsync)
+        changes = self._diff(summary)
+
+        return WatchUpdate(
+            summary=summary,
+            changes=changes,
+            duration=time.perf_counter() - start,
+            changed_inputs=changed_inputs,
+        )
+
+    def run(
+        self,
+        on_update: Callable[[WatchUpdate], None],
+        on_error: Callable[[Exception], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """
+        Generate once, then regenerate on every change until stopped.
+
+        Args:
+            on_update: Called with the outcome of each regeneration
+            on_error: Called when a regeneration fails, e.g. on an invalid
+                definition (default: re-raise); watching continues
+            stop: Stop watching once this event is set (default: run until
+                interrupted)
+        """
+        changed: set[Path] = set()
+        try:
+            while True:
+                try:
+                    on_update(self.update(changed))
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    on_error(e)
+
+                changed = set()
+                while not changed:
+                    if stop is not None and stop.is_set():
+                        return
+                    changed = self.watcher.wait(stop=stop)
+        finally:
+            self.watcher.close()
+
+    def _create_generator(self) -> Generator:
+        # The project cache is skipped: every edit would add a cached tree
+        return create_generator(custom_template_dir=self.custom_template_dir)
+
+    def _diff(self, summary: WriteSummary) -> list[FileChange]:
+        """Compare touched files with their content as of the last update."""
+        first = not self._contents
+        changes = []
+
+        for status, paths in (("A", summary.created), ("M", summary.updated)):
+            for path in paths:
+                content = (self.output_dir / path).read_text(encoding="utf-8")
+                old_lines = self._contents.get(path, "").splitlines()
+                self._contents[path] = content
+                if not first:
+                    added, removed = _count_changed_lines(
+                        old_lines, content.splitlines()
+                    )
+                    changes.append(FileChange(status, path, added, removed))
+
+        for path in summary.unchanged:
+            if first:
+                self._contents[path] = (self.output_dir / path).read_text(
+                    encoding="utf-8"
+                )
+
+        for path in summary.removed:
+            old = self._contents.pop(path, "")
+            changes.append(FileChange("D", path, 0, len(old.splitlines())))
+
+        return sorted(changes, key=lambda change: change.path)
+
+
+def _count_changed_lines(old: list[str], new: list[str]) -> tuple[int, int]:
+    """Count lines added and removed between two versions of a file."""
+    added = removed = 0
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ("replace", "delete"):
+            removed += i2 - i1
+        if tag in ("replace", "insert"):
+            added += j2 - j1
+    return added, removed
+
+
+class _Inotify:
+    """Minimal inotify(7) binding used to wake FileWatcher up."""
+
+    def __init__(self, libc: ctypes.CDLL, fd: int):
+        self._libc = libc
+        self._fd = fd
+
+    @classmethod
+    def create(cls) -> "_Inotify | None":
+        """Create an inotify instance, or None if unsupported."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None  # e.g. out of inotify instances
+        return cls(libc, fd)
+
+    def watch(self, directories: Iterable[Path]) -> None:
+        """Watch directories (re-adding an existing watch is a no-op)."""
+        for directory in directories:
+            # Fails for directories removed meanwhile; they are not watched
+            self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_MASK)
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for events; True if there are some."""
+        readable, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        return bool(readable)
+
+    def drain(self) -> None:
+        """Discard pending events (the snapshot tells what changed)."""
+        while True:
+            try:
+                if not os.read(self._fd, 65536):
+                    return
+            except BlockingIOError:
+                return
+
+    def close(self) -> None:
+        os.close(self._fd)
@@ -0,0 +1,3 @@
+"""
+Performance tests for MetaSpec.
+"""
@@ -0,0 +1,76 @@
+"""
+Performance suite: MetaSpec's hot paths on synthetic inputs.
+
+Slow; deselect with -m "not slow". Set METASPEC_BENCH_RESULTS to a path to
+keep the measured results as JSON (compare runs with
+`metaspec bench --baseline`).
+
+Budgets are generous ceilings that catch gross regressions on slow CI
+machines, not targets.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from metaspec.bench import BENCHMARKS, run_benchmarks, write_results
+
+pytestmark = pytest.mark.slow
+
+SIZES = (1, 10, 100)
+
+# Median seconds allowed per benchmark at the largest size
+BUDGETS = {
+    "cli_startup": 1.0,
+    "environment": 2.0,
+    "context": 0.1,
+    "render": 1.0,
+    "write": 1.0,
+    "registry_load": 0.5,
+    "search": 0.5,
+    "list_discovery": 5.0,
+}
+
+
+@pytest.fixture(scope="module")
+def results() -> dict[str, Any]:
+    """Run every benchmark once per module."""
+    results = run_benchmarks(sizes=SIZES, repeat=3)
+    path = os.environ.get("METASPEC_BENCH_RESULTS")
+    if path:
+        write_results(results, Path(path))
+    return results
+
+
+def _medians(results: dict[str, Any], benchmark: str) -> dict[int | None, float]:
+    """Get a benchmark's median per size."""
+    return {
+        result["size"]: result["median"]
+        for result in results["results"]
+        if result["benchmark"] == benchmark
+    }
+
+
+class TestBenchmarks:
+    """Budgets and scaling of the benchmarked paths."""
+
+    def test_every_benchmark_ran(self, results: dict[str, Any]) -> None:
+        """Test the suite covers every benchmark."""
+        assert {result["benchmark"] for result in results["results"]} == set(BENCHMARKS)
+
+    @pytest.mark.parametrize("benchmark", BENCHMARKS)
+    def test_within_budget(self, results: dict[str, Any], benchmark: str) -> None:
+        """Test the median at the largest size stays within budget."""
+        medians = _medians(results, benchmark)
+        largest = medians[max(medians, key=lambda size: size or 0)]
+        assert largest < BUDGETS[benchmark]
+
+    @pytest.mark.parametrize("benchmark", ["context", "render", "write"])
+    def test_generation_scales_sublinearly(
+        self, results: dict[str, Any], benchmark: str
+    ) -> None:
+        """Test 100x larger definitions take far less than 100x longer."""
+        medians = _medians(results, benchmark)
+        assert medians[100] < 20 * medians[1]
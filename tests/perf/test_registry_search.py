@@ -0,0 +1,76 @@
+"""
+Performance target of a warm registry search.
+
+A warm search (a new process reading an unchanged cache) loads the binary
+snapshot and queries its index; over 10,000 speckits it must answer in
+under 50 ms. Unlike the benchmark budgets this is a target, so the best of
+several runs is checked.
+"""
+
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from metaspec.registry import (
+    CACHE_FILE,
+    SNAPSHOT_FILE,
+    CommunityRegistry,
+    clear_registry_snapshots,
+)
+
+pytestmark = pytest.mark.slow
+
+SPECKITS = 10_000
+
+# Seconds a warm search may take
+TARGET = 0.05
+
+
+@pytest.fixture(scope="module")
+def cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Write a registry cache of SPECKITS speckits with varied text."""
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 10)))
+        for _ in range(5000)
+    ]
+    speckits = [
+        {
+            "name": f"{rng.choice(words)}-{rng.choice(words)}-{i}",
+            "command": f"cmd{i}",
+            "description": " ".join(rng.choices(words, k=20)),
+            "tags": rng.choices(words, k=3),
+            "author": rng.choice(words),
+            "repository": f"https://github.com/example/speckit-{i}",
+            "pypi_package": f"speckit-{i}",
+        }
+        for i in range(SPECKITS)
+    ]
+    directory = tmp_path_factory.mktemp("registry")
+    (directory / CACHE_FILE).write_text(json.dumps({"speckits": speckits}))
+    return directory
+
+
+def _registry(cache_dir: Path) -> CommunityRegistry:
+    """Create a registry client reading the cache, offline."""
+    return CommunityRegistry(
+        registry_url="http://127.0.0.1:9/speckits.json", cache_dir=cache_dir
+    )
+
+
+@pytest.mark.parametrize("query", ["kit", "abc", "ab cd"])
+def test_warm_search(cache_dir: Path, query: str) -> None:
+    """Test a warm search over 10,000 speckits meets the target."""
+    _registry(cache_dir).snapshot()
+    assert (cache_dir / SNAPSHOT_FILE).exists()
+
+    timings = []
+    for _ in range(5):
+        clear_registry_snapshots()
+        start = time.perf_counter()
+        _registry(cache_dir).search(query, limit=20)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < TARGET
@@ -2,6 +2,7 @@
 Pytest configuration and fixtures for unit tests.
 """
 
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -16,6 +17,15 @@ from metaspec.models import (
 )
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_home(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Keep caches under ~/.metaspec out of the developer's home directory."""
+    home = tmp_path_factory.mktemp("home")
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("HOME", str(home))
+        yield home
+
+
 @pytest.fixture
 def sample_field() -> Field:
     """Sample field for testing."""
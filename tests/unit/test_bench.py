@@ -0,0 +1,179 @@
+"""
+Unit tests for metaspec.bench module.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from metaspec.bench import (
+    BENCHMARKS,
+    REGISTRY_SCALE,
+    compare_results,
+    measure,
+    read_results,
+    run_benchmarks,
+    synthetic_definition,
+    synthetic_registry,
+    write_results,
+)
+from metaspec.cli.main import app
+from metaspec.generator import Generator
+
+runner = CliRunner()
+
+
+def _results(*entries: tuple[str, int | None, float]) -> dict:
+    """Build minimal benchmark results."""
+    return {
+        "results": [
+            {"benchmark": name, "size": size, "median": median}
+            for name, size, median in entries
+        ]
+    }
+
+
+class TestSyntheticInputs:
+    """Tests for synthetic benchmark inputs."""
+
+    def test_definition_grows_with_size(self) -> None:
+        """Test entity fields and CLI commands scale with size."""
+        small = synthetic_definition(1)
+        large = synthetic_definition(10)
+        assert len(small.entity.fields) == 5
+        assert len(large.entity.fields) == 50
+        assert len(large.cli_commands) == 10
+        assert large.name == "bench-10"
+        assert synthetic_definition(2, name="custom").name == "custom"
+
+    def test_definition_generates(self, tmp_path: Path) -> None:
+        """Test synthetic definitions only use templates that exist."""
+        project = Generator(use_cache=False).generate(
+            synthetic_definition(3), tmp_path / "kit", dry_run=True
+        )
+        assert Path("templates/generic/templates/plan-template.md") in project.files
+
+    def test_registry_grows_with_size(self) -> None:
+        """Test registry data has REGISTRY_SCALE speckits per size unit."""
+        assert len(synthetic_registry(3)["speckits"]) == 3 * REGISTRY_SCALE
+
+
+class TestRunBenchmarks:
+    """Tests for running benchmarks."""
+
+    def test_measure(self) -> None:
+        """Test measure() reports statistics over all runs."""
+        calls = []
+        stats = measure(lambda: calls.append(1), 3)
+        assert len(calls) == 3
+        assert stats["runs"] == 3
+        assert stats["min"] <= stats["median"] <= stats["max"]
+
+    def test_run_selected(self) -> None:
+        """Test selected benchmarks run for every size, in benchmark order."""
+        seen = []
+        results = run_benchmarks(
+            names=["search", "context"], sizes=(2, 1), repeat=1, on_result=seen.append
+        )
+        assert [(r["benchmark"], r["size"]) for r in results["results"]] == [
+            ("context", 1),
+            ("context", 2),
+            ("search", 1),
+            ("search", 2),
+        ]
+        assert seen == results["results"]
+        assert results["sizes"] == [1, 2]
+        assert results["metaspec"]
+
+    def test_size_independent_runs_once(self) -> None:
+        """Test size-independent benchmarks report size None."""
+        results = run_benchmarks(names=["environment"], sizes=(1, 2), repeat=1)
+        assert [(r["benchmark"], r["size"]) for r in results["results"]] == [
+            ("environment", None)
+        ]
+
+    def test_registry_benchmarks_leave_home_alone(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test registry benchmarks keep their cache in the temporary directory."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        run_benchmarks(names=["registry_load", "search"], sizes=(1,), repeat=1)
+        assert not (tmp_path / ".metaspec").exists()
+
+    def test_unknown_benchmark(self) -> None:
+        """Test unknown benchmark names are rejected."""
+        with pytest.raises(ValueError, match="Unknown benchmark: nope"):
+            run_benchmarks(names=["nope"])
+
+    def test_invalid_sizes(self) -> None:
+        """Test sizes and repeat must be positive."""
+        with pytest.raises(ValueError):
+            run_benchmarks(sizes=(0,))
+        with pytest.raises(ValueError):
+            run_benchmarks(repeat=0)
+
+
+class TestResults:
+    """Tests for storing and comparing results."""
+
+    def test_write_and_read(self, tmp_path: Path) -> None:
+        """Test results round-trip through JSON."""
+        path = tmp_path / "bench.json"
+        results = _results(("render", 1, 0.5))
+        write_results(results, path)
+        assert read_results(path) == results
+
+    def test_read_invalid(self, tmp_path: Path) -> None:
+        """Test files that are not results are rejected."""
+        path = tmp_path / "bench.json"
+        path.write_text("not json")
+        with pytest.raises(ValueError, match="Invalid benchmark results"):
+            read_results(path)
+        path.write_text(json.dumps({"speckits": []}))
+        with pytest.raises(ValueError, match="Invalid benchmark results"):
+            read_results(path)
+
+    def test_compare(self) -> None:
+        """Test only medians slower than the threshold are regressions."""
+        baseline = _results(("render", 1, 1.0), ("write", 1, 1.0), ("search", 1, 1.0))
+        current = _results(
+            ("render", 1, 2.0), ("write", 1, 1.1), ("search", 1, 1.5), ("new", 1, 9.0)
+        )
+        regressions = compare_results(current, baseline, threshold=0.25)
+        assert [(r["benchmark"], r["ratio"]) for r in regressions] == [
+            ("render", 2.0),
+            ("search", 1.5),
+        ]
+
+
+class TestBenchCommand:
+    """Tests for the bench command."""
+
+    def test_bench_writes_results(self, tmp_path: Path) -> None:
+        """Test bench prints a table and writes JSON results."""
+        output = tmp_path / "bench.json"
+        result = runner.invoke(
+            app, ["bench", "--only", "context", "-s", "1", "-r", "1", "-o", str(output)]
+        )
+        assert result.exit_code == 0
+        assert "context" in result.stdout
+        assert read_results(output)["results"][0]["benchmark"] == "context"
+
+    def test_bench_baseline_regression(self, tmp_path: Path) -> None:
+        """Test bench exits 1 when slower than the baseline."""
+        baseline = tmp_path / "baseline.json"
+        write_results(_results(("context", 1, 1e-9)), baseline)
+        result = runner.invoke(
+            app,
+            ["bench", "--only", "context", "-s", "1", "-r", "1", "-b", str(baseline)],
+        )
+        assert result.exit_code == 1
+        assert "regression" in result.stdout
+
+    def test_bench_unknown_benchmark(self) -> None:
+        """Test bench rejects unknown benchmarks."""
+        result = runner.invoke(app, ["bench", "--only", "nope"])
+        assert result.exit_code == 1
+        assert BENCHMARKS[0] in result.stdout
@@ -2,6 +2,7 @@
 Unit tests for metaspec.cli.init module.
 """
 
+import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -373,6 +374,84 @@ class TestInitCommand:
         assert call_args[1]["output_dir"] == output_dir
         assert call_args[1]["dry_run"] is False
 
+    @patch("metaspec.cli.init.create_generator")
+    def test_init_timings_report(self, mock_gen: MagicMock, tmp_path: Path) -> None:
+        """Test --timings registers a collector and writes its report."""
+        mock_generator = MagicMock()
+        mock_generator.generate.return_value.files = {"README.md": "# Generated"}
+        mock_gen.return_value = mock_generator
+        timings = tmp_path / "timings.json"
+
+        result = runner.invoke(
+            app,
+            [
+                "init",
+                "timed-kit",
+                "--output",
+                str(tmp_path / "timed-kit"),
+                "--timings",
+                str(timings),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert mock_generator.add_hook.called
+        assert json.loads(timings.read_text())["stages"] == {}
+
+    @patch("metaspec.cli.init.create_generator")
+    def test_init_from_definition_file(
+        self, mock_gen: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test --definition reads the speckit definition from a file."""
+        mock_generator = MagicMock()
+        mock_generator.generate.return_value.files = {"README.md": "# Generated"}
+        mock_gen.return_value = mock_generator
+        definition = tmp_path / "speckit.json"
+        definition.write_text(
+            json.dumps({"name": "file-kit", "entity": {"name": "E", "fields": []}})
+        )
+
+        result = runner.invoke(
+            app,
+            ["init", "-d", str(definition), "-o", str(tmp_path / "file-kit")],
+        )
+
+        assert result.exit_code == 0
+        meta_spec = mock_generator.generate.call_args[1]["meta_spec"]
+        assert meta_spec.name == "file-kit"
+
+    def test_init_watch_requires_definition(self) -> None:
+        """Test --watch without --definition is rejected."""
+        result = runner.invoke(app, ["init", "my-kit", "--watch"])
+
+        assert result.exit_code == 1
+        assert "--watch requires --definition" in result.stdout
+
+    @patch("metaspec.cli.init.DefinitionWatcher")
+    def test_init_watch_runs_watcher(
+        self, mock_watcher: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test --watch runs the watcher on a previously generated speckit."""
+        definition = tmp_path / "speckit.json"
+        definition.write_text(
+            json.dumps({"name": "watch-kit", "entity": {"name": "E", "fields": []}})
+        )
+        output_dir = tmp_path / "watch-kit"
+        (output_dir / ".metaspec").mkdir(parents=True)
+        (output_dir / ".metaspec" / "manifest.json").write_text(
+            json.dumps({"version": 1, "files": {}})
+        )
+
+        result = runner.invoke(
+            app, ["init", "-d", str(definition), "-o", str(output_dir), "--watch"]
+        )
+
+        assert result.exit_code == 0
+        mock_watcher.assert_called_once_with(
+            definition, output_dir, custom_template_dir=None
+        )
+        assert mock_watcher.return_value.run.called
+
     @patch("metaspec.cli.init.create_generator")
     def test_init_force_overwrites_existing(
         self, mock_gen: MagicMock, tmp_path: Path
@@ -471,3 +550,18 @@ class TestInitCommand:
         assert result.exit_code == 130
         assert "Cancelled" in result.stdout
 
+    @patch("metaspec.cli.init.ProjectCache")
+    @patch("metaspec.cli.init.create_generator")
+    def test_init_project_cache_opt_in(
+        self, mock_gen: MagicMock, mock_cache: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test the project cache is only used with --cache."""
+        mock_gen.return_value.generate.return_value.files = {"README.md": "#"}
+
+        result = runner.invoke(app, ["init", "kit", "-o", str(tmp_path / "a")])
+        assert result.exit_code == 0
+        assert mock_gen.call_args[1]["project_cache"] is None
+
+        result = runner.invoke(app, ["init", "kit", "-o", str(tmp_path / "b"), "--cache"])
+        assert result.exit_code == 0
+        assert mock_gen.call_args[1]["project_cache"] is mock_cache.return_value
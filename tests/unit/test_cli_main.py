@@ -2,9 +2,12 @@
 Unit tests for metaspec.cli.main module.
 """
 
+import subprocess
+import sys
+
 from typer.testing import CliRunner
 
-from metaspec.cli.main import app
+from metaspec.cli.main import LAZY_COMMANDS, app, load_command
 
 runner = CliRunner()
 
@@ -19,6 +22,11 @@ class TestMainCLI:
         assert "MetaSpec" in result.stdout
         assert "meta-framework" in result.stdout.lower() or "spec-driven" in result.stdout.lower()
 
+    def test_serve_requires_one_transport(self) -> None:
+        """Test serve needs exactly one of --stdio and --socket."""
+        result = runner.invoke(app, ["serve"])
+        assert result.exit_code == 1
+
     def test_version_command(self) -> None:
         """Test version command."""
         result = runner.invoke(app, ["version"])
@@ -82,3 +90,85 @@ class TestMainCLI:
         result = runner.invoke(app, ["search"])
         assert result.exit_code != 0
 
+
+class TestLazyCommands:
+    """Tests for lazily loaded subcommands."""
+
+    @staticmethod
+    def _imported_modules(code: str) -> dict[str, int]:
+        """Run code in a fresh interpreter; map imported modules to cumulative us."""
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = {}
+        for line in result.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                modules[parts[2].strip()] = int(parts[1])
+        return modules
+
+    def test_help_lists_every_command(self) -> None:
+        """Test --help lists lazy commands with their short help."""
+        result = runner.invoke(app, ["--help"])
+        assert result.exit_code == 0
+        for name in [*LAZY_COMMANDS, "version"]:
+            assert name in result.stdout
+        assert "Run a generation daemon" in result.stdout
+
+    def test_short_help_heads_command_help(self) -> None:
+        """Test the command help starts with the short help of LAZY_COMMANDS."""
+        for name, (_, _, short_help) in LAZY_COMMANDS.items():
+            command = load_command(name)
+            assert command.name == name
+            assert command.short_help == short_help
+            assert (command.help or "").startswith(f"{short_help}\n\n")
+            assert (command.help or "").count(short_help) == 1
+
+    def test_command_help_shows_summary_and_details(self) -> None:
+        """Test a command's --help shows the summary, then its docstring."""
+        result = runner.invoke(app, ["install", "--help"])
+        assert result.exit_code == 0
+        summary = result.stdout.index("Install a speckit from the community registry.")
+        assert summary < result.stdout.index("Speckit name or command to install")
+
+    def test_startup_skips_heavy_imports(self) -> None:
+        """Test importing the CLI does not import generation or registry code."""
+        modules = self._imported_modules("import metaspec.cli.main")
+        assert "metaspec.cli.main" in modules
+        for heavy in [
+            "metaspec.generator",
+            "metaspec.registry",
+            "metaspec.cli.init",
+            "jinja2",
+            "pydantic",
+            "rich.console",
+        ]:
+            assert heavy not in modules, f"{heavy} imported at startup"
+
+    def test_startup_import_budget(self) -> None:
+        """Test metaspec.cli.main's own import time, excluding typer, is small."""
+        modules = self._imported_modules("import metaspec.cli.main")
+        own = modules["metaspec.cli.main"] - modules.get("typer", 0)
+        # Generous for slow CI machines; eager imports took ~400 ms
+        assert own < 100_000
+
+    def test_command_module_imported_on_use(self) -> None:
+        """Test running a command imports its module and no other."""
+        code = (
+            "import sys\n"
+            "from metaspec.cli.main import app\n"
+            "try:\n"
+            "    app(['search', '--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(sorted(m for m in sys.modules if m.startswith('metaspec.cli.')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        loaded = result.stdout.strip().splitlines()[-1]
+        assert "'metaspec.cli.search'" in loaded
+        assert "'metaspec.cli.init'" not in loaded
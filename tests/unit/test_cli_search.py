@@ -33,6 +33,48 @@ class TestSearchCommand:
         result = runner.invoke(app, ["search", "test"])
         assert result.exit_code == 0
 
+    @patch("metaspec.cli.search.get_community_registry")
+    def test_search_limit_and_offset(self, mock_registry: MagicMock) -> None:
+        """Test --limit and --offset are passed to the registry."""
+        mock_reg = MagicMock()
+        mock_reg.search.return_value = []
+        mock_registry.return_value = mock_reg
+
+        result = runner.invoke(app, ["search", "api", "--limit", "5", "--offset", "10"])
+        assert result.exit_code == 0
+        mock_reg.search.assert_called_once_with("api", limit=5, offset=10)
+
+    @patch("metaspec.cli.search.get_community_registry")
+    def test_search_suggests_similar(self, mock_registry: MagicMock) -> None:
+        """Test a search without results offers similar speckits."""
+        mock_reg = MagicMock()
+        mock_reg.search.return_value = []
+        mock_reg.suggest.return_value = [
+            CommunitySpeckit(name="openspec", command="openspec", description="Open"),
+        ]
+        mock_registry.return_value = mock_reg
+
+        result = runner.invoke(app, ["search", "opnspec"])
+        assert result.exit_code == 0
+        assert "Did you mean" in result.stdout
+        assert "openspec" in result.stdout
+
+    @patch("metaspec.cli.search.get_community_registry")
+    def test_install_suggests_similar(self, mock_registry: MagicMock) -> None:
+        """Test installing an unknown speckit suggests close matches."""
+        mock_reg = MagicMock()
+        mock_reg.get.return_value = None
+        mock_reg.suggest.return_value = [
+            CommunitySpeckit(name="api-speckit", command="api", description="API"),
+        ]
+        mock_registry.return_value = mock_reg
+
+        result = runner.invoke(app, ["install", "api-spekit"])
+        assert result.exit_code == 1
+        assert "Did you mean" in result.stdout
+        assert "api-speckit" in result.stdout
+        mock_reg.suggest.assert_called_once_with("api-spekit")
+
     @patch("metaspec.cli.search.get_community_registry")
     def test_search_no_results(self, mock_registry: MagicMock) -> None:
         """Test search with no results."""
@@ -0,0 +1,133 @@
+"""
+Unit tests for metaspec.daemon module.
+"""
+
+import io
+import json
+import socket
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from metaspec.daemon import GenerationService
+from metaspec.generator import Generator
+
+DEFINITION = {
+    "name": "daemon-kit",
+    "domain": "testing",
+    "entity": {"name": "Spec", "fields": [{"name": "id"}]},
+}
+
+
+@pytest.fixture(scope="module")
+def service() -> GenerationService:
+    """Service with a warm generator (shared: warming up takes a while)."""
+    return GenerationService(Generator(use_cache=False))
+
+
+def request(service: GenerationService, **fields: object) -> dict:
+    """Send one request line and decode the response."""
+    return json.loads(service.handle_line(json.dumps(fields)))
+
+
+class TestGenerationService:
+    """Tests for GenerationService."""
+
+    def test_generate_directory(self, service: GenerationService, tmp_path: Path) -> None:
+        """Test a generate request writes the speckit and reports timings."""
+        output = tmp_path / "daemon-kit"
+
+        response = request(service, id=7, definition=DEFINITION, output=str(output))
+
+        assert response["id"] == 7
+        assert response["ok"] is True
+        assert response["files"] > 0
+        assert response["summary"]["created"] == response["files"]
+        assert "render" in response["timings"]["stages"]
+        assert (output / "README.md").exists()
+
+    def test_generate_archive(self, service: GenerationService, tmp_path: Path) -> None:
+        """Test a zip output format writes an archive file."""
+        output = tmp_path / "daemon-kit.zip"
+
+        response = request(
+            service, id=1, definition=DEFINITION, output=str(output), format="zip"
+        )
+
+        assert response["ok"] is True
+        with zipfile.ZipFile(output) as archive:
+            assert "daemon-kit/README.md" in archive.namelist()
+
+    @pytest.mark.parametrize(
+        ("line", "error_type"),
+        [
+            ("not json", "JSONDecodeError"),
+            ("[1, 2]", "RequestError"),
+            ('{"id": 1, "op": "explode"}', "RequestError"),
+            ('{"id": 1, "definition": {"name": "x"}, "output": "x"}', "KeyError"),
+            ('{"id": 1, "definition": {}, "output": "x", "format": "rar"}', "RequestError"),
+        ],
+    )
+    def test_errors_are_responses(
+        self, service: GenerationService, line: str, error_type: str
+    ) -> None:
+        """Test malformed and failing requests get error responses."""
+        response = json.loads(service.handle_line(line))
+
+        assert response["ok"] is False
+        assert response["error"]["type"] == error_type
+
+    def test_existing_output_requires_force(
+        self, service: GenerationService, tmp_path: Path
+    ) -> None:
+        """Test generation errors (existing output) are reported, force overwrites."""
+        output = tmp_path / "daemon-kit"
+        output.mkdir()
+
+        refused = request(service, definition=DEFINITION, output=str(output))
+        forced = request(service, definition=DEFINITION, output=str(output), force=True)
+
+        assert refused["error"]["type"] == "FileExistsError"
+        assert forced["ok"] is True
+
+    def test_serve_stream_until_shutdown(self) -> None:
+        """Test each line gets a response and shutdown stops serving."""
+        service = GenerationService(Generator(use_cache=False), warm_up=False)
+        reader = io.StringIO(
+            '{"id": 1, "op": "ping"}\n\n{"id": 2, "op": "shutdown"}\n{"id": 3, "op": "ping"}\n'
+        )
+        writer = io.StringIO()
+
+        service.serve_stream(reader, writer)
+
+        responses = [json.loads(line) for line in writer.getvalue().splitlines()]
+        assert [response["id"] for response in responses] == [1, 2]
+        assert service.shutdown_requested.is_set()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Unix domain sockets")
+    def test_serve_socket(self, tmp_path: Path) -> None:
+        """Test requests over a Unix domain socket."""
+        service = GenerationService(Generator(use_cache=False), warm_up=False)
+        socket_path = tmp_path / "metaspec.sock"
+        thread = threading.Thread(target=service.serve_socket, args=(socket_path,))
+        thread.start()
+
+        deadline = time.monotonic() + 10
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(socket_path))
+            stream = client.makefile("rw", encoding="utf-8")
+            stream.write('{"id": "a", "op": "ping"}\n{"id": "b", "op": "shutdown"}\n')
+            stream.flush()
+            responses = [json.loads(stream.readline()) for _ in range(2)]
+
+        thread.join(timeout=10)
+        assert [response["id"] for response in responses] == ["a", "b"]
+        assert not thread.is_alive()
+        assert not socket_path.exists()
@@ -7,7 +7,15 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from metaspec.generator import Generator, create_generator
+from metaspec.generator import (
+    Generator,
+    TemplateBytecodeCache,
+    clear_template_cache,
+    compile_templates,
+    create_generator,
+    get_template_cache_dir,
+    load_compiled_templates,
+)
 from metaspec.models import MetaSpecDefinition, SpecKitProject
 
 
@@ -320,3 +328,970 @@ class TestGeneratorRealScenarios:
         assert isinstance(project, SpecKitProject)
         assert len(project.files) >= 2
 
+
+
+class TestTemplateBytecodeCache:
+    """Tests for the on-disk compiled template cache."""
+
+    @pytest.fixture(autouse=True)
+    def isolated_home(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Point the cache at a temporary home directory."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("METASPEC_NO_CACHE", raising=False)
+        return tmp_path
+
+    def test_cache_enabled_by_default(self) -> None:
+        """Test that a generator gets a bytecode cache by default."""
+        gen = Generator()
+        assert isinstance(gen.env.bytecode_cache, TemplateBytecodeCache)
+
+    def test_cache_populated_after_render(self) -> None:
+        """Test that rendering stores compiled templates per version."""
+        gen = Generator()
+        gen.env.get_template("base/.gitignore.j2")
+
+        version_dir = get_template_cache_dir() / gen._get_metaspec_version()
+        assert len(list(version_dir.glob("*.cache"))) == 1
+
+    def test_cache_reused_by_new_generator(self) -> None:
+        """Test that a second generator loads bytecode instead of compiling."""
+        Generator().env.get_template("base/.gitignore.j2")
+
+        gen = Generator()
+        with patch.object(gen.env, "compile", wraps=gen.env.compile) as mock_compile:
+            template = gen.env.get_template("base/.gitignore.j2")
+        mock_compile.assert_not_called()
+        assert template.render(name="x", package_name="x")
+
+    def test_cache_disabled_by_argument(self) -> None:
+        """Test disabling the cache explicitly."""
+        gen = Generator(use_cache=False)
+        assert gen.env.bytecode_cache is None
+
+    def test_cache_disabled_by_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test disabling the cache via METASPEC_NO_CACHE."""
+        monkeypatch.setenv("METASPEC_NO_CACHE", "1")
+        gen = Generator()
+        assert gen.env.bytecode_cache is None
+
+    def test_clear_template_cache(self) -> None:
+        """Test clearing the cache removes all entries."""
+        Generator().env.get_template("base/.gitignore.j2")
+        assert get_template_cache_dir().exists()
+
+        clear_template_cache()
+        assert not get_template_cache_dir().exists()
+
+    def test_unwritable_cache_does_not_break_rendering(self) -> None:
+        """Test a failed bytecode write disables writes instead of raising."""
+        gen = Generator()
+        cache = gen.env.bytecode_cache
+        assert isinstance(cache, TemplateBytecodeCache)
+
+        with patch("tempfile.NamedTemporaryFile", side_effect=PermissionError):
+            assert gen.env.get_template("base/.gitignore.j2")
+            assert not cache.writable
+            assert gen.env.get_template("base/README.md.j2")
+
+
+class TestCompiledTemplates:
+    """Tests for ahead-of-time compiled templates."""
+
+    def test_compile_templates_writes_modules(self, tmp_path: Path) -> None:
+        """Test compiling templates writes modules and a manifest."""
+        compiled = compile_templates(tmp_path / "compiled")
+
+        assert "base/README.md.j2" in compiled
+        assert (tmp_path / "compiled" / "manifest.json").exists()
+        assert len(list((tmp_path / "compiled").glob("tmpl_*.py"))) == len(compiled)
+
+    def test_compile_templates_skips_invalid(self, tmp_path: Path) -> None:
+        """Test templates with syntax errors are left to the source loader."""
+        compiled = compile_templates(tmp_path / "compiled")
+        assert "base/scripts/bash/check-prerequisites.sh.j2" not in compiled
+
+    def test_compiled_output_matches_source(
+        self, sample_meta_spec: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test compiled templates render exactly like source templates."""
+        compile_templates(tmp_path / "compiled")
+        sample_meta_spec.slash_commands = []
+        source_gen = Generator(use_cache=False)
+        context = source_gen._create_template_context(sample_meta_spec)
+
+        with patch("metaspec.generator.COMPILED_TEMPLATES_DIR", tmp_path / "compiled"):
+            compiled_gen = Generator(use_cache=False)
+
+        template_map = source_gen._select_templates(sample_meta_spec)
+        assert compiled_gen._render_templates(
+            template_map, context
+        ) == source_gen._render_templates(template_map, context)
+
+    def test_load_compiled_templates_missing(self, tmp_path: Path) -> None:
+        """Test no loader is returned without compiled templates."""
+        assert load_compiled_templates(tmp_path / "missing") is None
+
+    def test_load_compiled_templates_version_mismatch(self, tmp_path: Path) -> None:
+        """Test compiled templates for another version are ignored."""
+        import json
+
+        compile_templates(tmp_path / "compiled")
+        manifest_path = tmp_path / "compiled" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["metaspec_version"] = "0.0.0-other"
+        manifest_path.write_text(json.dumps(manifest))
+
+        assert load_compiled_templates(tmp_path / "compiled") is None
+
+    def test_generator_prefers_compiled_templates(self, tmp_path: Path) -> None:
+        """Test the generator loads compiled modules before source."""
+        from jinja2 import ChoiceLoader, ModuleLoader
+
+        compile_templates(tmp_path / "compiled")
+        with patch("metaspec.generator.COMPILED_TEMPLATES_DIR", tmp_path / "compiled"):
+            gen = Generator(use_cache=False)
+
+        assert isinstance(gen.env.loader, ChoiceLoader)
+        assert isinstance(gen.env.loader.loaders[0], ModuleLoader)
+        assert "base/README.md.j2" in gen.env.list_templates()
+        with patch.object(gen.env, "compile") as mock_compile:
+            gen.env.get_template("base/README.md.j2")
+        mock_compile.assert_not_called()
+
+    def test_stale_compiled_template_falls_back_to_source(self, tmp_path: Path) -> None:
+        """Test a compiled template whose source changed is not used."""
+        import json
+
+        compile_templates(tmp_path / "compiled")
+        manifest_path = tmp_path / "compiled" / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        assert len(manifest["sources"]["base/README.md.j2"]) == 64
+        manifest["sources"]["base/README.md.j2"] = "0" * 64
+        manifest_path.write_text(json.dumps(manifest))
+        with patch("metaspec.generator.COMPILED_TEMPLATES_DIR", tmp_path / "compiled"):
+            gen = Generator(use_cache=False)
+
+        with patch.object(gen.env, "compile", wraps=gen.env.compile) as mock_compile:
+            gen.env.get_template("base/README.md.j2")
+            mock_compile.assert_called_once()
+            gen.env.get_template("base/AGENTS.md.j2")
+            mock_compile.assert_called_once()
+
+    def test_sources_hashed_once_per_change(self, tmp_path: Path) -> None:
+        """Test a compiled template's source is only re-read when it changes."""
+        import shutil
+
+        from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+
+        import metaspec
+
+        compile_templates(tmp_path / "compiled")
+        sources = tmp_path / "templates"
+        shutil.copytree(Path(metaspec.__file__).parent / "templates", sources)
+        source_loader = FileSystemLoader(str(sources))
+        loader = load_compiled_templates(tmp_path / "compiled", source_loader)
+        assert loader is not None
+        env = Environment()
+
+        with patch.object(
+            source_loader, "get_source", wraps=source_loader.get_source
+        ) as mock_get_source:
+            loader.load(env, "base/README.md.j2")
+            loader.load(env, "base/README.md.j2")
+            assert mock_get_source.call_count == 1
+
+            with open(sources / "base" / "README.md.j2", "a") as f:
+                f.write("edited\n")
+            with pytest.raises(TemplateNotFound):
+                loader.load(env, "base/README.md.j2")
+            assert mock_get_source.call_count == 2
+
+
+class TestRenderCache:
+    """Tests for memoized rendering of context-independent templates."""
+
+    @pytest.fixture
+    def template_dir(self, tmp_path: Path) -> Path:
+        """Custom templates with and without context variables."""
+        template_dir = tmp_path / "templates"
+        template_dir.mkdir()
+        (template_dir / "static.md.j2").write_text("static content\n")
+        (template_dir / "named.md.j2").write_text("name: {{ name }}\n")
+        (template_dir / "base.md.j2").write_text("{% block body %}{% endblock %}")
+        (template_dir / "child.md.j2").write_text(
+            '{% extends "base.md.j2" %}{% block body %}{{ name }}{% endblock %}'
+        )
+        return template_dir
+
+    def test_variables_recorded_on_compile(self, template_dir: Path) -> None:
+        """Test template variables are analysed while compiling."""
+        gen = Generator(custom_template_dir=template_dir, use_cache=False)
+        gen.env.get_template("static.md.j2")
+        gen.env.get_template("named.md.j2")
+        gen.env.get_template("child.md.j2")
+
+        assert gen.env.template_variables["static.md.j2"] == frozenset()
+        assert gen.env.template_variables["named.md.j2"] == frozenset({"name"})
+        assert gen.env.template_variables["child.md.j2"] is None
+
+    def test_static_template_rendered_once(self, template_dir: Path) -> None:
+        """Test templates without variables render once for any context."""
+        gen = Generator(custom_template_dir=template_dir, use_cache=False)
+        template = gen.env.get_template("static.md.j2")
+
+        with patch.object(type(template), "render", autospec=True, return_value="x") as mock:
+            gen._render_template("static.md.j2", {"name": "a", "domain": "x"})
+            gen._render_template("static.md.j2", {"name": "b", "domain": "y"})
+        assert mock.call_count == 1
+
+    def test_render_keyed_by_used_variables(self, template_dir: Path) -> None:
+        """Test output is reused only when the variables it reads match."""
+        gen = Generator(custom_template_dir=template_dir, use_cache=False)
+
+        assert gen._render_template("named.md.j2", {"name": "a", "domain": "x"}) == "name: a\n"
+        assert gen._render_template("named.md.j2", {"name": "a", "domain": "y"}) == "name: a\n"
+        assert gen._render_template("named.md.j2", {"name": "b", "domain": "x"}) == "name: b\n"
+        assert len(gen._render_cache) == 2
+
+    def test_templates_with_references_not_memoized(self, template_dir: Path) -> None:
+        """Test templates extending others always render."""
+        gen = Generator(custom_template_dir=template_dir, use_cache=False)
+
+        assert gen._render_template("child.md.j2", {"name": "a"}) == "a"
+        assert gen._render_template("child.md.j2", {"name": "b"}) == "b"
+        assert len(gen._render_cache) == 0
+
+    def test_render_cache_is_bounded(
+        self, template_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the least recently used output is evicted."""
+        monkeypatch.setattr("metaspec.generator.RENDER_CACHE_SIZE", 2)
+        gen = Generator(custom_template_dir=template_dir, use_cache=False)
+
+        for name in ["a", "b", "c"]:
+            gen._render_template("named.md.j2", {"name": name})
+
+        assert [key[1] for key in gen._render_cache] == ['{"name": "b"}', '{"name": "c"}']
+
+    def test_variables_restored_from_bytecode_cache(
+        self, template_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test analysis survives a bytecode cache hit."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("METASPEC_NO_CACHE", raising=False)
+        Generator(custom_template_dir=template_dir).env.get_template("named.md.j2")
+
+        gen = Generator(custom_template_dir=template_dir)
+        with patch.object(gen.env, "compile", wraps=gen.env.compile) as mock_compile:
+            gen.env.get_template("named.md.j2")
+        mock_compile.assert_not_called()
+        assert gen.env.template_variables["named.md.j2"] == frozenset({"name"})
+
+    def test_variables_restored_from_compiled_manifest(self, tmp_path: Path) -> None:
+        """Test analysis is shipped with ahead-of-time compiled templates."""
+        compile_templates(tmp_path / "compiled")
+        with patch("metaspec.generator.COMPILED_TEMPLATES_DIR", tmp_path / "compiled"):
+            gen = Generator(use_cache=False)
+
+        gen.env.get_template("meta/sdd/commands/plan.md.j2")
+        assert gen.env.template_variables["meta/sdd/commands/plan.md.j2"] == frozenset()
+
+    def test_meta_templates_shared_across_definitions(
+        self, sample_meta_spec: MetaSpecDefinition
+    ) -> None:
+        """Test meta command output is reused for a different speckit."""
+        gen = Generator(use_cache=False)
+        template_map = {"meta/sds/commands/plan.md.j2": ".metaspec/commands/plan.md"}
+
+        first = gen._render_templates(template_map, gen._create_template_context(sample_meta_spec))
+        sample_meta_spec.name = "another-kit"
+        second = gen._render_templates(template_map, gen._create_template_context(sample_meta_spec))
+
+        assert first == second
+        assert len(gen._render_cache) == 1
+
+
+class TestGenerateMany:
+    """Tests for batch generation."""
+
+    @pytest.fixture
+    def definitions(self, sample_meta_spec: MetaSpecDefinition) -> list[MetaSpecDefinition]:
+        """Three speckit definitions with renderable templates."""
+        from dataclasses import replace
+
+        return [
+            replace(sample_meta_spec, name=f"kit-{i}", slash_commands=[])
+            for i in range(3)
+        ]
+
+    def test_generate_many_threads(
+        self, definitions: list[MetaSpecDefinition], tmp_path: Path
+    ) -> None:
+        """Test generating several speckits on a thread pool."""
+        gen = Generator(use_cache=False)
+        jobs = [(d, tmp_path / d.name) for d in definitions]
+
+        results = gen.generate_many(jobs, max_workers=2)
+
+        assert [r.name for r in results] == ["kit-0", "kit-1", "kit-2"]
+        assert all(r.ok and r.duration > 0 for r in results)
+        for d in definitions:
+            assert (tmp_path / d.name / "README.md").exists()
+
+    def test_generate_many_reports_errors(
+        self, definitions: list[MetaSpecDefinition], tmp_path: Path
+    ) -> None:
+        """Test a failing job does not abort the batch."""
+        (tmp_path / "kit-1").mkdir()
+        gen = Generator(use_cache=False)
+
+        results = gen.generate_many([(d, tmp_path / d.name) for d in definitions])
+
+        assert [r.ok for r in results] == [True, False, True]
+        assert isinstance(results[1].error, FileExistsError)
+        assert results[1].project is None
+        assert results[0].project is not None
+
+    def test_generate_many_shares_render_cache(
+        self, definitions: list[MetaSpecDefinition], tmp_path: Path
+    ) -> None:
+        """Test thread workers reuse one environment and its render cache."""
+        gen = Generator(use_cache=False)
+        gen.generate_many([(d, tmp_path / d.name) for d in definitions], dry_run=True)
+
+        plan_keys = [k for k in gen._render_cache if k[0] == "meta/sds/commands/plan.md.j2"]
+        assert len(plan_keys) == 1
+
+    def test_generate_many_processes(
+        self, definitions: list[MetaSpecDefinition], tmp_path: Path
+    ) -> None:
+        """Test generating several speckits on a process pool."""
+        gen = Generator(use_cache=False)
+        jobs = [(d, tmp_path / d.name) for d in definitions]
+
+        results = gen.generate_many(jobs, max_workers=2, use_processes=True)
+
+        assert all(r.ok for r in results)
+        assert results[2].project is not None
+        assert results[2].project.root_path == tmp_path / "kit-2"
+        assert (tmp_path / "kit-2" / "AGENTS.md").exists()
+
+
+class TestConcurrentRendering:
+    """Tests for rendering one project's templates on a thread pool."""
+
+    def test_concurrent_matches_sequential(self, sample_meta_spec: MetaSpecDefinition) -> None:
+        """Test concurrent rendering produces identical, ordered output."""
+        sample_meta_spec.slash_commands = []
+        sequential = Generator(use_cache=False)
+        concurrent = Generator(use_cache=False, render_workers=4)
+        template_map = sequential._select_templates(sample_meta_spec)
+        context = sequential._create_template_context(sample_meta_spec)
+
+        expected = sequential._render_templates(template_map, context)
+        rendered = concurrent._render_templates(template_map, context)
+
+        assert rendered == expected
+        assert list(rendered) == list(expected)
+
+    def test_concurrent_skips_optional_commands(
+        self, sample_meta_spec: MetaSpecDefinition
+    ) -> None:
+        """Test missing optional library commands are still skipped."""
+        gen = Generator(use_cache=False, render_workers=2)
+        context = gen._create_template_context(sample_meta_spec)
+        template_map = {
+            "library/generic/commands/optional.md.j2": "commands/optional.md",
+            "base/.gitignore.j2": ".gitignore",
+        }
+
+        rendered = gen._render_templates(template_map, context)
+        assert list(rendered) == [".gitignore"]
+
+    def test_concurrent_raises_for_required(
+        self, sample_meta_spec: MetaSpecDefinition
+    ) -> None:
+        """Test missing required templates still raise TemplateNotFound."""
+        from jinja2 import TemplateNotFound
+
+        gen = Generator(use_cache=False, render_workers=2)
+        context = gen._create_template_context(sample_meta_spec)
+        template_map = {
+            "base/.gitignore.j2": ".gitignore",
+            "nonexistent/required.md.j2": "output/required.md",
+        }
+
+        with pytest.raises(TemplateNotFound, match="nonexistent/required.md.j2"):
+            gen._render_templates(template_map, context)
+
+    def test_render_pool_reused(self, sample_meta_spec: MetaSpecDefinition) -> None:
+        """Test the worker pool is created once per generator."""
+        gen = Generator(use_cache=False, render_workers=2)
+        assert gen._get_render_pool() is gen._get_render_pool()
+
+
+class TestStreaming:
+    """Tests for streaming generation."""
+
+    @pytest.fixture
+    def definition(self, sample_meta_spec: MetaSpecDefinition) -> MetaSpecDefinition:
+        """A speckit definition with renderable templates."""
+        from dataclasses import replace
+
+        return replace(sample_meta_spec, slash_commands=[])
+
+    def test_stream_matches_generate(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test joined stream chunks equal the in-memory project's files."""
+        project = Generator(use_cache=False).generate(
+            definition, tmp_path / "kit", dry_run=True
+        )
+
+        streamed: dict[Path, str] = {}
+        for path, chunk in Generator(use_cache=False).stream(definition):
+            streamed[path] = streamed.get(path, "") + chunk
+
+        assert streamed == project.files
+
+    def test_stream_is_lazy(self, definition: MetaSpecDefinition) -> None:
+        """Test templates are rendered only as the stream is consumed."""
+        gen = Generator(use_cache=False)
+        with patch.object(gen, "_stream_template", wraps=gen._stream_template) as spy:
+            stream = gen.stream(definition)
+            next(stream)
+
+        assert spy.call_count == 1
+
+    def test_generate_into_matches_write_to_disk(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test streaming into a sink writes the same tree as write_to_disk."""
+        from metaspec.output import DirectorySink
+
+        gen = Generator(use_cache=False)
+        gen.generate(definition, tmp_path / "memory")
+        with DirectorySink(tmp_path / "streamed") as sink:
+            paths = gen.generate_into(definition, sink)
+
+        def tree(root: Path) -> dict[str, tuple[bytes | None, int]]:
+            return {
+                p.relative_to(root).as_posix(): (
+                    p.read_bytes() if p.is_file() else None,
+                    p.stat().st_mode,
+                )
+                for p in root.rglob("*")
+            }
+
+        assert tree(tmp_path / "streamed") == tree(tmp_path / "memory")
+        assert Path("scripts/init.sh") in paths
+
+    def test_generate_many_stream(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test streamed batches return write summaries instead of projects."""
+        gen = Generator(use_cache=False)
+
+        results = gen.generate_many([(definition, tmp_path / "kit")], stream=True)
+
+        assert results[0].ok
+        assert results[0].project is None
+        assert results[0].summary is not None
+        assert Path("README.md") in results[0].summary.created
+        assert (tmp_path / "kit" / "README.md").exists()
+
+    def test_generate_archive(self, definition: MetaSpecDefinition, tmp_path: Path) -> None:
+        """Test a zipped speckit has the same files as a written one."""
+        import io
+        import zipfile
+
+        gen = Generator(use_cache=False)
+        project = gen.generate(definition, tmp_path / "kit", dry_run=True)
+        buffer = io.BytesIO()
+
+        gen.generate_archive(definition, buffer, prefix="kit")
+
+        with zipfile.ZipFile(buffer) as zf:
+            for path, content in project.files.items():
+                assert zf.read(f"kit/{path.as_posix()}").decode() == content
+
+    @pytest.mark.parametrize(
+        "name", ["../evil", "/etc", "kit/../../evil", "..\\evil", "C:evil", "kit\r\nx"]
+    )
+    def test_generate_archive_hostile_name(
+        self, definition: MetaSpecDefinition, name: str
+    ) -> None:
+        """Test a hostile speckit name cannot place entries outside the prefix."""
+        import io
+
+        definition.name = name
+        buffer = io.BytesIO()
+
+        with pytest.raises(ValueError, match="Unsafe archive directory name"):
+            Generator(use_cache=False).generate_archive(definition, buffer)
+        assert buffer.getvalue() == b""
+
+
+class TestHooks:
+    """Tests for generation timing hooks."""
+
+    def test_generate_reports_stages_and_templates(
+        self, sample_meta_spec: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test hooks receive every stage and every rendered template."""
+        from dataclasses import replace
+
+        from metaspec.instrumentation import STAGES, StageEvent, TemplateEvent
+
+        definition = replace(sample_meta_spec, slash_commands=[])
+        events: list = []
+        gen = Generator(use_cache=False, hooks=[events.append])
+
+        project = gen.generate(definition, tmp_path / "kit")
+
+        stages = [e for e in events if isinstance(e, StageEvent)]
+        templates = [e for e in events if isinstance(e, TemplateEvent)]
+        assert [e.stage for e in stages] == list(STAGES)
+        assert stages[-1].files == len(project.files)
+        assert len(templates) == len(gen._select_templates(definition))
+        assert all(e.speckit == definition.name for e in events)
+        readme = next(e for e in templates if e.template == "base/README.md.j2")
+        assert readme.bytes == len(project.files[Path("README.md")].encode())
+
+    def test_generate_archive_reports_stages(
+        self, sample_meta_spec: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test archive generation reports the stages generate() does."""
+        import io
+        from dataclasses import replace
+
+        from metaspec.instrumentation import STAGES, StageEvent
+
+        definition = replace(sample_meta_spec, slash_commands=[])
+        events: list = []
+        gen = Generator(use_cache=False, hooks=[events.append])
+
+        project = gen.generate(definition, tmp_path / "kit")
+        expected = [e for e in events if isinstance(e, StageEvent)]
+        events.clear()
+        paths = gen.generate_archive(definition, io.BytesIO())
+
+        stages = [e for e in events if isinstance(e, StageEvent)]
+        assert [e.stage for e in stages] == list(STAGES)
+        assert stages[-1].files == len(paths) == len(project.files)
+        assert stages[-1].bytes == expected[-1].bytes
+        assert all(e.speckit == definition.name and e.duration >= 0 for e in stages)
+
+    def test_stream_reports_templates(self, sample_meta_spec: MetaSpecDefinition) -> None:
+        """Test streamed templates are reported once fully consumed."""
+        from dataclasses import replace
+
+        definition = replace(sample_meta_spec, slash_commands=[])
+        events: list = []
+        gen = Generator(use_cache=False)
+        gen.add_hook(events.append)
+
+        sizes: dict[str, int] = {}
+        for path, chunk in gen.stream(definition):
+            sizes[path.as_posix()] = sizes.get(path.as_posix(), 0) + len(chunk.encode())
+
+        readme = next(e for e in events if e.template == "base/README.md.j2")
+        assert readme.bytes == sizes["README.md"]
+        assert readme.duration > 0
+
+
+class TestProjectCacheIntegration:
+    """Tests for restoring generated speckits from the project cache."""
+
+    @pytest.fixture
+    def definition(self, sample_meta_spec: MetaSpecDefinition) -> MetaSpecDefinition:
+        """A speckit definition with renderable templates."""
+        from dataclasses import replace
+
+        return replace(sample_meta_spec, slash_commands=[])
+
+    def test_fingerprint_is_stable(self, definition: MetaSpecDefinition) -> None:
+        """Test equal definitions share a fingerprint and others do not."""
+        from dataclasses import replace
+
+        gen = Generator(use_cache=False)
+
+        assert gen.fingerprint(definition) == Generator(use_cache=False).fingerprint(
+            replace(definition)
+        )
+        assert gen.fingerprint(definition) != gen.fingerprint(
+            replace(definition, description="other")
+        )
+
+    def test_fingerprint_covers_templates(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test editing a custom template changes the fingerprint."""
+        (tmp_path / "a.j2").write_text("one")
+        before = Generator(custom_template_dir=tmp_path).fingerprint(definition)
+        (tmp_path / "a.j2").write_text("two")
+
+        assert Generator(custom_template_dir=tmp_path).fingerprint(definition) != before
+
+    def test_templates_fingerprint_follows_edits(self, tmp_path: Path) -> None:
+        """Test one generator re-reads only templates edited since last time."""
+        (tmp_path / "a.j2").write_text("one")
+        (tmp_path / "b.j2").write_text("two")
+        gen = Generator(custom_template_dir=tmp_path, use_cache=False)
+        before = gen._get_templates_fingerprint()
+        assert gen._source_digests is not None
+        source_loader = gen._source_digests.loader
+
+        with patch.object(
+            source_loader, "get_source", wraps=source_loader.get_source
+        ) as mock_get_source:
+            assert gen._get_templates_fingerprint() == before
+            mock_get_source.assert_not_called()
+
+            (tmp_path / "a.j2").write_text("three")
+            assert gen._get_templates_fingerprint() != before
+            assert [c.args[1] for c in mock_get_source.call_args_list] == ["a.j2"]
+
+    def test_repeat_generation_restores_from_cache(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test a second generation copies the cached tree without rendering."""
+        from metaspec.project_cache import ProjectCache
+
+        cache = ProjectCache(tmp_path / "cache")
+        first = Generator(use_cache=False, project_cache=cache).generate(
+            definition, tmp_path / "one"
+        )
+
+        gen = Generator(use_cache=False, project_cache=cache)
+        with patch.object(gen, "_render_templates") as mock_render:
+            second = gen.generate(definition, tmp_path / "two")
+
+        mock_render.assert_not_called()
+        assert second.files == first.files
+        assert sorted(second.executable_files) == sorted(first.executable_files)
+        assert (tmp_path / "two" / "README.md").read_text() == (
+            tmp_path / "one" / "README.md"
+        ).read_text()
+
+    def test_no_cache_env_disables_project_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test METASPEC_NO_CACHE also turns off the project cache."""
+        from metaspec.project_cache import ProjectCache
+
+        monkeypatch.setenv("METASPEC_NO_CACHE", "1")
+
+        gen = Generator(use_cache=False, project_cache=ProjectCache(tmp_path))
+
+        assert gen.project_cache is None
+
+
+class TestReproducibleOutput:
+    """Tests for SOURCE_DATE_EPOCH support."""
+
+    @pytest.fixture
+    def definition(self, sample_meta_spec: MetaSpecDefinition) -> MetaSpecDefinition:
+        """A speckit definition with renderable templates."""
+        from dataclasses import replace
+
+        return replace(sample_meta_spec, slash_commands=[])
+
+    def test_source_date_epoch_sets_dates(
+        self, definition: MetaSpecDefinition, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test SOURCE_DATE_EPOCH replaces the current date in the context."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "946684800")  # 2000-01-01 UTC
+
+        context = Generator(use_cache=False)._create_template_context(definition)
+
+        assert context["year"] == 2000
+        assert context["date"] == "2000-01-01"
+
+    def test_invalid_source_date_epoch(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test an invalid SOURCE_DATE_EPOCH is rejected."""
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+
+        with pytest.raises(ValueError, match="SOURCE_DATE_EPOCH"):
+            Generator(use_cache=False)
+
+    @pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+    def test_archives_are_byte_identical(
+        self, definition: MetaSpecDefinition, archive_format: str
+    ) -> None:
+        """Test the same inputs give byte-identical archives."""
+        import io
+
+        archives = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            gen = Generator(use_cache=False, source_date_epoch=946684800)
+            gen.generate_archive(definition, buffer, archive_format)
+            archives.append(buffer.getvalue())
+
+        assert archives[0] == archives[1]
+
+    def test_fingerprint_ignores_wall_clock(
+        self, definition: MetaSpecDefinition
+    ) -> None:
+        """Test a fixed epoch makes the fingerprint independent of today."""
+        from datetime import datetime
+
+        gen = Generator(use_cache=False, source_date_epoch=946684800)
+        before = gen.fingerprint(definition)
+        with patch("metaspec.generator.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2099, 1, 1)
+            mock_datetime.fromtimestamp.side_effect = datetime.fromtimestamp
+
+            assert gen.fingerprint(definition) == before
+
+
+class TestTemplateSelection:
+    """Tests for index-based template selection."""
+
+    def test_new_library_needs_no_code_changes(
+        self, sample_meta_spec: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test a library added to the template tree is selected."""
+        from metaspec.models import SlashCommand
+
+        for path in [
+            "library/acme/tools/commands/lint.md.j2",
+            "library/acme/tools/templates/lint-template.md.j2",
+            "meta/ops/commands/deploy.md.j2",
+        ]:
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_text("x")
+        sample_meta_spec.slash_commands = [
+            SlashCommand(name="lint", description="Lint", source="acme/tools")
+        ]
+
+        template_map = Generator(custom_template_dir=tmp_path)._select_templates(
+            sample_meta_spec
+        )
+
+        assert template_map["library/acme/tools/commands/lint.md.j2"] == (
+            "templates/acme/tools/commands/lint.md"
+        )
+        assert template_map["library/acme/tools/templates/lint-template.md.j2"] == (
+            "templates/acme/tools/templates/lint-template.md"
+        )
+        assert template_map["meta/ops/commands/deploy.md.j2"] == (
+            ".metaspec/commands/metaspec.ops.deploy.md"
+        )
+
+    def test_check_slash_commands(self, sample_meta_spec: MetaSpecDefinition) -> None:
+        """Test slash commands of unknown sources are reported before rendering."""
+        from metaspec.models import SlashCommand
+
+        gen = Generator(use_cache=False)
+        sample_meta_spec.slash_commands = [
+            SlashCommand(name="plan", description="Plan", source="generic")
+        ]
+        gen.check_slash_commands(sample_meta_spec)
+
+        sample_meta_spec.slash_commands.append(
+            SlashCommand(name="plan", description="Plan", source="nope")
+        )
+        with pytest.raises(ValueError, match="source 'nope'"):
+            gen.check_slash_commands(sample_meta_spec)
+
+    def test_missing_optional_commands_are_not_selected(
+        self, sample_meta_spec: MetaSpecDefinition
+    ) -> None:
+        """Test commands a library lacks are left out instead of probed."""
+        from metaspec.models import SlashCommand
+
+        sample_meta_spec.slash_commands = [
+            SlashCommand(name="plan", description="Plan", source="generic"),
+            SlashCommand(name="plan", description="Plan", source="custom"),
+        ]
+
+        template_map = Generator(use_cache=False)._select_templates(sample_meta_spec)
+
+        assert "library/generic/greenfield/commands/plan.md.j2" in template_map
+        assert "library/custom/commands/plan.md.j2" not in template_map
+        assert "meta/sds/templates/domain-spec-template.md.j2" not in template_map
+        assert template_map["meta/sdd/commands/plan.md.j2"] == (
+            ".metaspec/commands/metaspec.sdd.plan.md"
+        )
+
+
+class TestSelectiveRegeneration:
+    """Tests for Generator.regenerate."""
+
+    @pytest.fixture
+    def definition(self, sample_meta_spec: MetaSpecDefinition) -> MetaSpecDefinition:
+        """A speckit definition with renderable templates."""
+        from dataclasses import replace
+
+        return replace(sample_meta_spec, slash_commands=[])
+
+    @staticmethod
+    def add_command(definition: MetaSpecDefinition) -> MetaSpecDefinition:
+        """Return the definition with one more CLI command."""
+        from dataclasses import replace
+
+        from metaspec.models import Command
+
+        command = Command(name="export", description="Export specs")
+        return replace(definition, cli_commands=[*definition.cli_commands, command])
+
+    def test_only_affected_templates_rerender(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test adding a CLI command re-renders only templates reading it."""
+        from metaspec.instrumentation import TemplateEvent, TimingCollector
+
+        output_dir = tmp_path / "speckit"
+        gen = Generator(use_cache=False, source_date_epoch=946684800)
+        gen.generate(definition, output_dir)
+        gitignore = output_dir / ".gitignore"
+        gitignore_mtime = gitignore.stat().st_mtime_ns
+
+        collector = TimingCollector()
+        gen.add_hook(collector)
+        changed = self.add_command(definition)
+        summary = gen.regenerate(changed, output_dir)
+
+        rendered = {
+            event.template
+            for event in collector.events
+            if isinstance(event, TemplateEvent)
+        }
+        template_map = gen._select_templates(changed)
+        assert rendered
+        for template_path in template_map:
+            deps = gen.dependency_graph.dependencies(template_path)
+            assert (template_path in rendered) == ("cli_commands" in deps)
+
+        assert Path(".gitignore") in summary.unchanged
+        assert Path("README.md") in summary.updated
+        assert gitignore.stat().st_mtime_ns == gitignore_mtime
+
+        # Same result as generating from scratch
+        fresh = gen.generate(changed, tmp_path / "fresh")
+        for path, content in fresh.files.items():
+            assert (output_dir / path).read_text(encoding="utf-8") == content
+
+    def test_edited_file_is_rerendered(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test a hand-edited file is regenerated even if unaffected."""
+        output_dir = tmp_path / "speckit"
+        gen = Generator(use_cache=False, source_date_epoch=946684800)
+        project = gen.generate(definition, output_dir)
+        (output_dir / ".gitignore").write_text("edited\n")
+
+        summary = gen.regenerate(self.add_command(definition), output_dir)
+
+        assert Path(".gitignore") in summary.updated
+        assert (output_dir / ".gitignore").read_text() == (
+            project.files[Path(".gitignore")]
+        )
+
+    def test_falls_back_to_full_generation(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test a directory without a generation record is fully generated."""
+        output_dir = tmp_path / "speckit"
+        gen = Generator(use_cache=False)
+
+        summary = gen.regenerate(definition, output_dir)
+
+        assert summary.created
+        assert (output_dir / "README.md").exists()
+
+
+class TestAsyncGeneration:
+    """Tests for Generator.agenerate."""
+
+    @pytest.fixture
+    def definition(self, sample_meta_spec: MetaSpecDefinition) -> MetaSpecDefinition:
+        """A speckit definition with renderable templates."""
+        from dataclasses import replace
+
+        return replace(sample_meta_spec, slash_commands=[])
+
+    def test_agenerate_matches_generate(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test agenerate writes the same speckit as generate."""
+        import asyncio
+
+        gen = Generator(use_cache=False, source_date_epoch=946684800)
+        expected = gen.generate(definition, tmp_path / "sync")
+
+        project = asyncio.run(gen.agenerate(definition, tmp_path / "async"))
+
+        assert project.files == expected.files
+        assert project.write_summary is not None
+        for path, content in expected.files.items():
+            assert (tmp_path / "async" / path).read_text(encoding="utf-8") == content
+
+    def test_concurrent_generations_do_not_block_loop(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test many generations run concurrently while the loop keeps ticking."""
+        import asyncio
+
+        gen = Generator(use_cache=False, async_workers=2)
+
+        async def main() -> tuple[list[SpecKitProject], int]:
+            ticks = 0
+            done = asyncio.Event()
+
+            async def ticker() -> None:
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            ticking = asyncio.create_task(ticker())
+            projects = await asyncio.gather(
+                *(gen.agenerate(definition, tmp_path / f"kit-{i}") for i in range(5))
+            )
+            done.set()
+            await ticking
+            return projects, ticks
+
+        projects, ticks = asyncio.run(main())
+
+        assert len(projects) == 5
+        assert all((tmp_path / f"kit-{i}" / "README.md").exists() for i in range(5))
+        assert ticks > 5
+
+    def test_agenerate_fingerprints_off_loop(
+        self,
+        definition: MetaSpecDefinition,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test the project cache fingerprint is computed off the event loop."""
+        import asyncio
+        import threading
+
+        from metaspec.project_cache import ProjectCache
+
+        gen = Generator(use_cache=False, project_cache=ProjectCache(tmp_path / "c"))
+        fingerprint = gen._get_templates_fingerprint
+        threads = []
+
+        def record() -> str:
+            threads.append(threading.current_thread())
+            return fingerprint()
+
+        monkeypatch.setattr(gen, "_get_templates_fingerprint", record)
+        asyncio.run(gen.agenerate(definition, tmp_path / "kit"))
+
+        assert threads
+        assert threading.main_thread() not in threads
+
+    def test_agenerate_existing_output(
+        self, definition: MetaSpecDefinition, tmp_path: Path
+    ) -> None:
+        """Test agenerate refuses an existing directory without force."""
+        import asyncio
+
+        with pytest.raises(FileExistsError):
+            asyncio.run(Generator(use_cache=False).agenerate(definition, tmp_path))
@@ -0,0 +1,221 @@
+"""
+Unit tests for metaspec.http_service module.
+"""
+
+import http.client
+import io
+import json
+import tarfile
+import threading
+import time
+import zipfile
+from collections.abc import Iterator
+
+import pytest
+
+from metaspec.generator import Generator
+from metaspec.http_service import GenerationHTTPServer, LatencyHistogram
+
+DEFINITION = {
+    "name": "http-kit",
+    "domain": "testing",
+    "entity": {"name": "Spec", "fields": [{"name": "id"}]},
+}
+
+
+@pytest.fixture(scope="module")
+def generator() -> Generator:
+    """Generator shared by the test servers."""
+    return Generator(use_cache=False, source_date_epoch=946684800)
+
+
+def start_server(generator: Generator, **options: object) -> GenerationHTTPServer:
+    """Start a server on a free local port in a background thread."""
+    server = GenerationHTTPServer(("127.0.0.1", 0), generator, **options)  # type: ignore[arg-type]
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    return server
+
+
+@pytest.fixture
+def server(generator: Generator) -> Iterator[GenerationHTTPServer]:
+    """Running server with default limits."""
+    server = start_server(generator)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(
+    server: GenerationHTTPServer, body: object, path: str = "/generate"
+) -> tuple[int, dict[str, str], bytes]:
+    """POST a JSON body and return (status, headers, body)."""
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        connection.request("POST", path, body=json.dumps(body))
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def get(server: GenerationHTTPServer, path: str) -> tuple[int, bytes]:
+    """GET a path and return (status, body)."""
+    connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+class TestGenerationHTTPServer:
+    """Tests for GenerationHTTPServer."""
+
+    def test_generate_zip(self, server: GenerationHTTPServer) -> None:
+        """Test POST /generate streams a zipped speckit."""
+        status, headers, body = post(server, DEFINITION)
+
+        assert status == 200
+        assert headers["Content-Type"] == "application/zip"
+        assert headers["Transfer-Encoding"] == "chunked"
+        assert headers["Content-Disposition"] == (
+            "attachment; filename=\"http-kit.zip\"; filename*=UTF-8''http-kit.zip"
+        )
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            assert "http-kit/README.md" in archive.namelist()
+
+    def test_generate_tar_gz(self, server: GenerationHTTPServer) -> None:
+        """Test ?format=tar.gz returns a tar.gz archive."""
+        status, headers, body = post(server, DEFINITION, "/generate?format=tar.gz")
+
+        assert status == 200
+        assert headers["Content-Type"] == "application/gzip"
+        with tarfile.open(fileobj=io.BytesIO(body), mode="r:gz") as archive:
+            assert "http-kit/README.md" in archive.getnames()
+
+    @pytest.mark.parametrize(
+        ("body", "path", "expected"),
+        [
+            ({"name": "no-entity"}, "/generate", 400),
+            ([1, 2], "/generate", 400),
+            (DEFINITION, "/generate?format=rar", 400),
+            (
+                {
+                    **DEFINITION,
+                    "slash_commands": [
+                        {"name": "specify", "description": "S", "source": "nope"}
+                    ],
+                },
+                "/generate",
+                400,
+            ),
+            (DEFINITION, "/elsewhere", 404),
+        ],
+    )
+    def test_client_errors(
+        self, server: GenerationHTTPServer, body: object, path: str, expected: int
+    ) -> None:
+        """Test invalid requests get JSON errors."""
+        status, _, response = post(server, body, path)
+
+        assert status == expected
+        assert json.loads(response)["ok"] is False
+
+    @pytest.mark.parametrize(
+        "name", ["", "../evil", "kit/../x", "a\\b", "kit\r\nX-Injected: 1"]
+    )
+    def test_unsafe_names(self, server: GenerationHTTPServer, name: str) -> None:
+        """Test names unsafe as archive directory or filename get 400."""
+        status, headers, response = post(server, {**DEFINITION, "name": name})
+
+        assert status == 400
+        assert "X-Injected" not in headers
+        assert json.loads(response)["ok"] is False
+
+    def test_unicode_filename(self, server: GenerationHTTPServer) -> None:
+        """Test non-ASCII names are sent as an RFC 6266 filename*."""
+        status, headers, _ = post(server, {**DEFINITION, "name": "kït"})
+
+        assert status == 200
+        assert headers["Content-Disposition"] == (
+            "attachment; filename=\"k_t.zip\"; filename*=UTF-8''k%C3%AFt.zip"
+        )
+
+    def test_metrics(self, server: GenerationHTTPServer) -> None:
+        """Test /metrics reports request counts and latency histograms."""
+        post(server, DEFINITION)
+        post(server, {"name": "invalid"})
+
+        # Requests are recorded after their last byte is sent
+        deadline = time.monotonic() + 10
+        while True:
+            status, body = get(server, "/metrics")
+            metrics = body.decode()
+            if 'le="+Inf"} 2' in metrics or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+
+        assert status == 200
+        assert 'metaspec_http_requests_total{endpoint="generate",status="200"} 1' in metrics
+        assert 'metaspec_http_requests_total{endpoint="generate",status="400"} 1' in metrics
+        assert (
+            'metaspec_http_request_duration_seconds_bucket{endpoint="generate",le="+Inf"} 2'
+            in metrics
+        )
+        assert "metaspec_generations_in_flight 0" in metrics
+        assert get(server, "/healthz")[0] == 200
+
+    def test_backpressure_and_timeout(
+        self, generator: Generator, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a full pool gets 429 and a stuck generation gets 504."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def stuck_generate_archive(*args: object, **kwargs: object) -> list:
+            started.set()
+            release.wait(10)
+            return []
+
+        server = start_server(generator, workers=1, queue_size=0, timeout=0.5)
+        monkeypatch.setattr(server, "generator", Generator(use_cache=False))
+        monkeypatch.setattr(
+            server.generator, "generate_archive", stuck_generate_archive
+        )
+        try:
+            results: list[int] = []
+            first = threading.Thread(
+                target=lambda: results.append(post(server, DEFINITION)[0])
+            )
+            first.start()
+            assert started.wait(10)
+
+            status, headers, _ = post(server, DEFINITION)
+            assert status == 429
+            assert headers["Retry-After"] == "1"
+
+            first.join(10)
+            assert results == [504]
+        finally:
+            release.set()
+            server.shutdown()
+            server.server_close()
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_buckets_are_cumulative(self) -> None:
+        """Test each observation counts in every bucket it fits."""
+        histogram = LatencyHistogram(buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        assert histogram.counts == [1, 2]
+        assert histogram.count == 3
+        assert histogram.sum == pytest.approx(5.55)
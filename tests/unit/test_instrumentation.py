@@ -0,0 +1,55 @@
+"""
+Unit tests for metaspec.instrumentation module.
+"""
+
+import json
+from pathlib import Path
+
+from metaspec.instrumentation import StageEvent, TemplateEvent, TimingCollector
+
+
+class TestTimingCollector:
+    """Tests for TimingCollector."""
+
+    def test_report_aggregates_events(self) -> None:
+        """Test stages and templates are summed per name."""
+        collector = TimingCollector()
+        collector(StageEvent("a", "render", 0.5, files=2, bytes=10))
+        collector(StageEvent("b", "render", 1.5, files=2, bytes=30))
+        collector(StageEvent("a", "validate", 0.1))
+        collector(TemplateEvent("a", "x.j2", 0.2, bytes=5, cached=False))
+        collector(TemplateEvent("b", "x.j2", 0.0, bytes=5, cached=True))
+        collector(TemplateEvent("a", "y.j2", 0.9, bytes=1, cached=False))
+
+        report = collector.report()
+
+        assert report["speckits"] == 2
+        assert list(report["stages"]) == ["validate", "render"]
+        assert report["stages"]["render"] == {
+            "count": 2,
+            "total": 2.0,
+            "max": 1.5,
+            "files": 4,
+            "bytes": 40,
+        }
+        assert list(report["templates"]) == ["y.j2", "x.j2"]
+        assert report["templates"]["x.j2"]["cached"] == 1
+        assert report["templates"]["x.j2"]["bytes"] == 10
+
+    def test_dump_writes_json(self, tmp_path: Path) -> None:
+        """Test the report is written as JSON."""
+        collector = TimingCollector()
+        collector(StageEvent("a", "write", 0.25, files=1, bytes=3))
+
+        collector.dump(tmp_path / "timings.json")
+
+        data = json.loads((tmp_path / "timings.json").read_text())
+        assert data["stages"]["write"]["total"] == 0.25
+
+    def test_clear(self) -> None:
+        """Test clearing forgets recorded events."""
+        collector = TimingCollector()
+        collector(StageEvent("a", "write", 0.25))
+        collector.clear()
+
+        assert collector.report() == {"speckits": 0, "stages": {}, "templates": {}}
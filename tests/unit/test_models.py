@@ -219,6 +219,39 @@ class TestMetaSpecDefinition:
         assert len(meta_spec.cli_commands) == 1
         assert meta_spec.cli_commands[0].options is None
 
+    def test_from_file_json(self, tmp_path: Path) -> None:
+        """Test loading a definition from a JSON file."""
+        path = tmp_path / "speckit.json"
+        path.write_text('{"name": "json-kit", "entity": {"name": "E", "fields": []}}')
+
+        meta_spec = MetaSpecDefinition.from_file(path)
+
+        assert meta_spec.name == "json-kit"
+        assert meta_spec.entity.name == "E"
+
+    def test_from_file_yaml(self, tmp_path: Path) -> None:
+        """Test loading a definition from a YAML file."""
+        pytest.importorskip("yaml")
+        path = tmp_path / "speckit.yaml"
+        path.write_text("name: yaml-kit\nentity:\n  name: E\n  fields:\n    - name: id\n")
+
+        meta_spec = MetaSpecDefinition.from_file(path)
+
+        assert meta_spec.name == "yaml-kit"
+        assert meta_spec.entity.fields[0].name == "id"
+
+    def test_from_file_rejects_unknown_type(self, tmp_path: Path) -> None:
+        """Test unsupported file types and non-mapping content are rejected."""
+        toml = tmp_path / "speckit.toml"
+        toml.write_text('name = "kit"')
+        listing = tmp_path / "speckit.json"
+        listing.write_text("[]")
+
+        with pytest.raises(ValueError, match="Unsupported definition file"):
+            MetaSpecDefinition.from_file(toml)
+        with pytest.raises(ValueError, match="must contain a mapping"):
+            MetaSpecDefinition.from_file(listing)
+
 
 class TestSpecKitProject:
     """Tests for SpecKitProject dataclass."""
@@ -234,6 +267,22 @@ class TestSpecKitProject:
         assert project.root_path == root
         assert len(project.files) == 2
 
+    def test_awrite_to_disk(self, tmp_path: Path) -> None:
+        """Test the async writer writes like write_to_disk."""
+        import asyncio
+
+        root = tmp_path / "test-project"
+        project = SpecKitProject(
+            root_path=root,
+            files={Path("README.md"): "# Test", Path("src/app.py"): "# App"},
+        )
+
+        summary = asyncio.run(project.awrite_to_disk())
+
+        assert (root / "src" / "app.py").read_text() == "# App"
+        assert sorted(summary.created) == [Path("README.md"), Path("src/app.py")]
+        assert project.write_summary is summary
+
     def test_project_files_access(self, tmp_path: Path) -> None:
         """Test accessing project files."""
         root = tmp_path / "test-project"
@@ -0,0 +1,499 @@
+"""
+Unit tests for metaspec.output module.
+"""
+
+import io
+import stat
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from metaspec import output
+from metaspec.output import (
+    MANIFEST_PATH,
+    DirectorySink,
+    TarSink,
+    ZipSink,
+    check_archive_prefix,
+    open_archive_sink,
+    read_manifest,
+)
+
+
+def _siblings(root: Path) -> list[str]:
+    """Names of hidden staging/backup/lock entries next to root."""
+    return sorted(p.name for p in root.parent.iterdir() if p.name.startswith("."))
+
+
+class TestDirectorySink:
+    """Tests for DirectorySink."""
+
+    def test_write_new_directory(self, tmp_path: Path) -> None:
+        """Test writing a project into a new directory."""
+        root = tmp_path / "project"
+        with DirectorySink(root) as sink:
+            sink.add_directory(Path("empty"))
+            sink.write_file(Path("README.md"), "# Test")
+            sink.write_file(Path("src/pkg/__init__.py"), ["a", "b"])
+
+        assert (root / "README.md").read_text() == "# Test"
+        assert (root / "src/pkg/__init__.py").read_text() == "ab"
+        assert (root / "empty").is_dir()
+        assert _siblings(root) == []
+
+    def test_target_absent_until_commit(self, tmp_path: Path) -> None:
+        """Test nothing appears at the target before commit."""
+        root = tmp_path / "project"
+        with DirectorySink(root) as sink:
+            sink.write_file(Path("README.md"), "# Test")
+            assert not root.exists()
+        assert root.exists()
+
+    def test_error_leaves_no_partial_project(self, tmp_path: Path) -> None:
+        """Test an exception discards the staged files."""
+        root = tmp_path / "project"
+        with pytest.raises(KeyboardInterrupt):
+            with DirectorySink(root) as sink:
+                sink.write_file(Path("README.md"), "# Test")
+                raise KeyboardInterrupt
+
+        assert not root.exists()
+        assert _siblings(root) == []
+
+    def test_error_keeps_existing_project(self, tmp_path: Path) -> None:
+        """Test a failed overwrite leaves the old project untouched."""
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "README.md").write_text("old")
+
+        with pytest.raises(RuntimeError):
+            with DirectorySink(root, force=True) as sink:
+                sink.write_file(Path("README.md"), "new")
+                raise RuntimeError("render failed")
+
+        assert (root / "README.md").read_text() == "old"
+
+    def test_exists_without_force(self, tmp_path: Path) -> None:
+        """Test an existing target is refused without force."""
+        root = tmp_path / "project"
+        root.mkdir()
+
+        with pytest.raises(FileExistsError, match="already exists"):
+            DirectorySink(root).open()
+        assert _siblings(root) == []
+
+    def test_force_replaces_and_carries_over(self, tmp_path: Path) -> None:
+        """Test overwriting keeps files that the project does not produce."""
+        root = tmp_path / "project"
+        (root / "specs").mkdir(parents=True)
+        (root / "README.md").write_text("old")
+        (root / "notes.txt").write_text("mine")
+        (root / "specs" / "my-spec.md").write_text("spec")
+
+        with DirectorySink(root, force=True) as sink:
+            sink.write_file(Path("README.md"), "new")
+            sink.write_file(Path("specs/README.md"), "guide")
+
+        assert (root / "README.md").read_text() == "new"
+        assert (root / "notes.txt").read_text() == "mine"
+        assert (root / "specs" / "my-spec.md").read_text() == "spec"
+        assert (root / "specs" / "README.md").read_text() == "guide"
+        assert _siblings(root) == []
+
+    def test_force_into_current_directory(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test regenerating into "." keeps writing into the same directory."""
+        root = tmp_path / "project"
+        root.mkdir()
+        (root / "notes.txt").write_text("mine")
+        monkeypatch.chdir(root)
+
+        for content in ("first", "generated"):
+            with DirectorySink(Path("."), force=True) as sink:
+                sink.write_file(Path("README.md"), content)
+
+        assert sink.root == root
+        assert (root / "README.md").read_text() == "generated"
+        assert (root / "notes.txt").read_text() == "mine"
+        assert sorted(p.name for p in root.iterdir()) == [
+            ".metaspec",
+            "README.md",
+            "notes.txt",
+        ]
+        assert _siblings(root) == []
+
+    def test_executable_files(self, tmp_path: Path) -> None:
+        """Test executable files are marked rwxr-xr-x."""
+        root = tmp_path / "project"
+        with DirectorySink(root) as sink:
+            sink.write_file(Path("run.sh"), "#!/bin/bash\n", executable=True)
+            sink.write_file(Path("data.txt"), "data")
+
+        assert stat.S_IMODE((root / "run.sh").stat().st_mode) == 0o755
+        assert not (root / "data.txt").stat().st_mode & stat.S_IXUSR
+
+    @pytest.mark.parametrize("policy", ["none", "files", "all"])
+    def test_fsync_policies(self, tmp_path: Path, policy: str) -> None:
+        """Test every fsync policy produces the same tree."""
+        root = tmp_path / "project"
+        with DirectorySink(root, fsync=policy) as sink:
+            sink.write_file(Path("a/b.txt"), "content")
+        assert (root / "a/b.txt").read_text() == "content"
+
+    def test_unknown_fsync_policy(self, tmp_path: Path) -> None:
+        """Test an unknown fsync policy is rejected."""
+        with pytest.raises(ValueError, match="fsync policy"):
+            DirectorySink(tmp_path / "project", fsync="sometimes")
+
+    def test_concurrent_writers_do_not_interleave(self, tmp_path: Path) -> None:
+        """Test concurrent writers to one path produce one complete project."""
+        root = tmp_path / "project"
+        errors: list[Exception] = []
+
+        def write(label: str) -> None:
+            try:
+                with DirectorySink(root, force=True) as sink:
+                    for i in range(20):
+                        sink.write_file(Path(f"file{i}.txt"), label)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(str(n),)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        contents = {p.read_text() for p in root.glob("file*.txt")}
+        assert len(contents) == 1
+        assert _siblings(root) == []
+
+    def test_concurrent_create_only_one_wins(self, tmp_path: Path) -> None:
+        """Test only one writer creates a new project without force."""
+        root = tmp_path / "project"
+        first = DirectorySink(root)
+        first.open()
+        first.write_file(Path("README.md"), "first")
+
+        results: list[str] = []
+
+        def second() -> None:
+            try:
+                with DirectorySink(root) as sink:
+                    sink.write_file(Path("README.md"), "second")
+                results.append("written")
+            except FileExistsError:
+                results.append("exists")
+
+        thread = threading.Thread(target=second)
+        thread.start()
+        first.commit()
+        thread.join()
+
+        assert results == ["exists"]
+        assert (root / "README.md").read_text() == "first"
+
+
+class TestCrashSafety:
+    """Tests for in-place updates of an existing target and crash recovery."""
+
+    @staticmethod
+    def _user_project(root: Path) -> None:
+        (root / "specs").mkdir(parents=True)
+        (root / "README.md").write_text("old")
+        (root / "specs" / "my-spec.md").write_text("spec")
+
+    def test_existing_target_updated_in_place(self, tmp_path: Path) -> None:
+        """Test the target directory and entries it does not produce stay put."""
+        root = tmp_path / "project"
+        self._user_project(root)
+        before = [p.stat() for p in (root, root / "specs" / "my-spec.md")]
+
+        with DirectorySink(root, force=True) as sink:
+            sink.write_file(Path("README.md"), "new")
+
+        after = [p.stat() for p in (root, root / "specs" / "my-spec.md")]
+        assert [s.st_ino for s in after] == [s.st_ino for s in before]
+        assert after[1].st_mtime_ns == before[1].st_mtime_ns
+        assert (root / "README.md").read_text() == "new"
+        assert _siblings(root) == []
+
+    def test_file_replacing_directory_refused(self, tmp_path: Path) -> None:
+        """Test a generated file is not written over a directory."""
+        root = tmp_path / "project"
+        self._user_project(root)
+
+        with pytest.raises(IsADirectoryError):
+            with DirectorySink(root, force=True) as sink:
+                sink.write_file(Path("README.md"), "new")
+                sink.write_file(Path("specs"), "file")
+
+        assert (root / "README.md").read_text() == "old"
+        assert (root / "specs" / "my-spec.md").read_text() == "spec"
+        assert sorted(p.name for p in root.rglob("*.tmp")) == []
+
+    def test_stale_temporary_files_removed(self, tmp_path: Path) -> None:
+        """Test staging, temporary and lock files of a killed writer are cleaned up."""
+        root = tmp_path / "project"
+        with DirectorySink(root) as sink:
+            sink.write_file(Path("specs/README.md"), "guide")
+        (tmp_path / ".project.0123abcd.tmp" / "src").mkdir(parents=True)
+        (tmp_path / ".project.lock").touch()
+        (tmp_path / ".other.0123abcd.tmp").mkdir()
+        (root / "specs" / ".README.md.0123abcd.tmp").write_text("partial")
+        (root / "specs" / ".notes.0123abcd.tmp").write_text("mine")
+
+        with DirectorySink(root, force=True) as sink:
+            sink.write_file(Path("specs/README.md"), "new")
+
+        assert _siblings(root) == [".other.0123abcd.tmp"]
+        assert sorted(p.name for p in (root / "specs").iterdir()) == [
+            ".notes.0123abcd.tmp",
+            "README.md",
+        ]
+
+
+class TestIncrementalWrite:
+    """Tests for manifest-based incremental regeneration."""
+
+    @staticmethod
+    def _write(root: Path, files: dict[str, str], executable: tuple[str, ...] = ()):
+        with DirectorySink(root, force=True) as sink:
+            for name, content in files.items():
+                sink.write_file(Path(name), content, executable=name in executable)
+        return sink
+
+    def test_manifest_written(self, tmp_path: Path) -> None:
+        """Test a written project records its files in the manifest."""
+        root = tmp_path / "project"
+        sink = self._write(root, {"a.txt": "a", "bin/run": "x"}, ("bin/run",))
+
+        manifest = read_manifest(root)
+        assert manifest is not None
+        assert sorted(manifest) == ["a.txt", "bin/run"]
+        assert manifest["bin/run"]["executable"] is True
+        assert sink.summary.created == [Path("a.txt"), Path("bin/run")]
+
+    def test_regenerate_touches_only_changed_files(self, tmp_path: Path) -> None:
+        """Test unchanged files keep their inode and mtime on regeneration."""
+        root = tmp_path / "project"
+        self._write(root, {"same.txt": "same", "edit.txt": "old"})
+        before = (root / "same.txt").stat()
+
+        sink = self._write(root, {"same.txt": "same", "edit.txt": "new"})
+
+        after = (root / "same.txt").stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+        assert (root / "edit.txt").read_text() == "new"
+        assert sink.incremental
+        assert sink.summary.unchanged == [Path("same.txt")]
+        assert sink.summary.updated == [Path("edit.txt")]
+
+    def test_streamed_content_compared(self, tmp_path: Path) -> None:
+        """Test chunked content equal to the file on disk is left alone."""
+        root = tmp_path / "project"
+        self._write(root, {"a.txt": "ab"})
+
+        with DirectorySink(root, force=True) as sink:
+            sink.write_file(Path("a.txt"), iter(["a", "b"]))
+
+        assert sink.summary.unchanged == [Path("a.txt")]
+        assert _siblings(root / "a.txt") == [".metaspec"]
+
+    def test_stale_generated_files_removed(self, tmp_path: Path) -> None:
+        """Test files no longer generated are deleted with empty parents."""
+        root = tmp_path / "project"
+        self._write(root, {"keep.txt": "k", "old/gone.txt": "g"})
+        (root / "user.txt").write_text("mine")
+
+        sink = self._write(root, {"keep.txt": "k"})
+
+        assert not (root / "old").exists()
+        assert (root / "user.txt").read_text() == "mine"
+        assert sink.summary.removed == [Path("old/gone.txt")]
+        assert "old/gone.txt" not in (read_manifest(root) or {})
+
+    def test_user_edited_stale_file_kept(self, tmp_path: Path) -> None:
+        """Test a no-longer-generated file edited by the user is not deleted."""
+        root = tmp_path / "project"
+        self._write(root, {"keep.txt": "k", "notes.txt": "generated"})
+        (root / "notes.txt").write_text("edited")
+
+        sink = self._write(root, {"keep.txt": "k"})
+
+        assert (root / "notes.txt").read_text() == "edited"
+        assert sink.summary.removed == []
+
+    def test_user_edit_of_generated_file_overwritten(self, tmp_path: Path) -> None:
+        """Test generated files are compared against disk, not the manifest."""
+        root = tmp_path / "project"
+        self._write(root, {"a.txt": "generated"})
+        (root / "a.txt").write_text("edited")
+
+        sink = self._write(root, {"a.txt": "generated"})
+
+        assert (root / "a.txt").read_text() == "generated"
+        assert sink.summary.updated == [Path("a.txt")]
+
+    def test_executable_bit_restored(self, tmp_path: Path) -> None:
+        """Test an unchanged script that lost its executable bit is fixed."""
+        root = tmp_path / "project"
+        self._write(root, {"run.sh": "#!/bin/sh"}, ("run.sh",))
+        (root / "run.sh").chmod(0o644)
+
+        sink = self._write(root, {"run.sh": "#!/bin/sh"}, ("run.sh",))
+
+        assert (root / "run.sh").stat().st_mode & stat.S_IXUSR
+        assert sink.summary.updated == [Path("run.sh")]
+
+    def test_error_leaves_project_untouched(self, tmp_path: Path) -> None:
+        """Test a failed incremental write changes nothing on disk."""
+        root = tmp_path / "project"
+        self._write(root, {"a.txt": "old"})
+
+        with pytest.raises(RuntimeError):
+            with DirectorySink(root, force=True) as sink:
+                sink.write_file(Path("a.txt"), "new")
+                sink.write_file(Path("b/c.txt"), "new")
+                raise RuntimeError("boom")
+
+        assert (root / "a.txt").read_text() == "old"
+        assert not (root / "b").exists()
+        assert sorted(p.name for p in root.rglob("*.tmp")) == []
+        assert sorted(read_manifest(root) or {}) == ["a.txt"]
+
+    def test_interrupted_commit_keeps_previous_generation(self, tmp_path: Path) -> None:
+        """Test a regeneration killed before it moves files leaves no trace."""
+        root = tmp_path / "project"
+        self._write(root, {"a.txt": "old", "b.txt": "b", "gone.txt": "g"})
+
+        with patch.object(output.os, "replace", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                self._write(root, {"a.txt": "new", "b.txt": "b"})
+
+        assert (root / "a.txt").read_text() == "old"
+        assert (root / "gone.txt").exists()
+        assert sorted(read_manifest(root) or {}) == ["a.txt", "b.txt", "gone.txt"]
+        assert sorted(p.name for p in root.rglob("*.tmp")) == []
+        assert _siblings(root) == []
+
+    def test_unchanged_regeneration_writes_nothing(self, tmp_path: Path) -> None:
+        """Test regenerating identical content touches no file or directory."""
+        root = tmp_path / "project"
+        files = {"a.txt": "a", "sub/b.txt": "b"}
+        self._write(root, files)
+        paths = [root, root / "sub", root / "a.txt", root / MANIFEST_PATH]
+        before = [(p.stat().st_ino, p.stat().st_mtime_ns) for p in paths]
+
+        sink = self._write(root, files)
+
+        assert [(p.stat().st_ino, p.stat().st_mtime_ns) for p in paths] == before
+        assert not sink.summary.changed
+
+    def test_invalid_manifest_is_rewritten(self, tmp_path: Path) -> None:
+        """Test a corrupt manifest is replaced; files are still compared on disk."""
+        root = tmp_path / "project"
+        self._write(root, {"a.txt": "a"})
+        (root / MANIFEST_PATH).write_text("not json")
+
+        sink = self._write(root, {"a.txt": "a"})
+
+        assert not sink.incremental
+        assert sink.summary.unchanged == [Path("a.txt")]
+        assert read_manifest(root) is not None
+
+
+class _UnseekableStream(io.RawIOBase):
+    """Write-only stream that cannot seek or tell, like a socket."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:  # type: ignore[override]
+        self.data += b
+        return len(b)
+
+
+class TestArchiveSinks:
+    """Tests for ZipSink and TarSink."""
+
+    @staticmethod
+    def _write(sink) -> None:
+        with sink:
+            sink.add_directory(Path("empty"))
+            sink.write_file(Path("README.md"), "# Test")
+            sink.write_file(Path("scripts/init.sh"), iter(["#!/bin/sh", "\n"]), executable=True)
+
+    def test_zip(self) -> None:
+        """Test writing a zip archive with modes and a prefix."""
+        buffer = io.BytesIO()
+        self._write(ZipSink(buffer, prefix="kit"))
+
+        with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as zf:
+            assert zf.read("kit/README.md") == b"# Test"
+            assert zf.read("kit/scripts/init.sh") == b"#!/bin/sh\n"
+            assert "kit/empty/" in zf.namelist()
+            assert (zf.getinfo("kit/scripts/init.sh").external_attr >> 16) & 0o777 == 0o755
+            assert (zf.getinfo("kit/README.md").external_attr >> 16) & 0o777 == 0o644
+            manifest = zf.read(f"kit/{MANIFEST_PATH.as_posix()}").decode()
+            assert '"scripts/init.sh"' in manifest
+
+    def test_zip_unseekable_stream(self) -> None:
+        """Test zip archives can be written to streams that cannot seek."""
+        stream = _UnseekableStream()
+        self._write(ZipSink(stream))
+
+        with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as zf:
+            assert zf.testzip() is None
+            assert zf.read("README.md") == b"# Test"
+
+    def test_tar_gz(self) -> None:
+        """Test writing a tar.gz archive to an unseekable stream."""
+        stream = _UnseekableStream()
+        self._write(TarSink(stream, prefix="kit", mtime=1_700_000_000))
+
+        with tarfile.open(fileobj=io.BytesIO(bytes(stream.data)), mode="r:gz") as tf:
+            script = tf.getmember("kit/scripts/init.sh")
+            assert script.mode == 0o755
+            assert script.mtime == 1_700_000_000
+            assert tf.getmember("kit/README.md").mode == 0o644
+            assert tf.getmember("kit/empty").isdir()
+            extracted = tf.extractfile("kit/scripts/init.sh")
+            assert extracted is not None and extracted.read() == b"#!/bin/sh\n"
+
+    @pytest.mark.parametrize("prefix", ["..", "../kit", "a/b", "/abs", "a\\b", "x\x00"])
+    def test_unsafe_prefix(self, prefix: str) -> None:
+        """Test prefixes that could escape the extraction directory are rejected."""
+        with pytest.raises(ValueError, match="Unsafe archive directory name"):
+            ZipSink(io.BytesIO(), prefix=prefix)
+        assert check_archive_prefix("my-kit.v2") == "my-kit.v2"
+
+    def test_unknown_format(self) -> None:
+        """Test unknown archive formats are rejected."""
+        with pytest.raises(ValueError, match="Unknown archive format"):
+            open_archive_sink(io.BytesIO(), "rar")
+
+    def test_write_requires_open(self) -> None:
+        """Test writing before open() fails clearly."""
+        with pytest.raises(RuntimeError, match="not open"):
+            ZipSink(io.BytesIO()).write_file(Path("a"), "a")
+
+    def test_tar_gz_fixed_mtime_is_reproducible(self) -> None:
+        """Test tar.gz archives with a fixed mtime are byte-identical."""
+        archives = []
+        for _ in range(2):
+            buffer = io.BytesIO()
+            self._write(TarSink(buffer, mtime=946684800))
+            archives.append(buffer.getvalue())
+
+        assert archives[0] == archives[1]
+        assert archives[0][4:8] == (946684800).to_bytes(4, "little")  # gzip MTIME
@@ -0,0 +1,141 @@
+"""
+Unit tests for metaspec.project_cache module.
+"""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from metaspec.models import SpecKitProject
+from metaspec.project_cache import ProjectCache
+
+
+def _project(content: str = "# Kit") -> SpecKitProject:
+    return SpecKitProject(
+        root_path=Path("unused"),
+        files={
+            Path("README.md"): content,
+            Path("scripts/init.sh"): "#!/bin/sh\n",
+        },
+        directories=[Path("scripts"), Path("specs")],
+        executable_files=[Path("scripts/init.sh")],
+    )
+
+
+class TestProjectCache:
+    """Tests for ProjectCache."""
+
+    def test_restore_miss(self, tmp_path: Path) -> None:
+        """Test restoring an unknown fingerprint returns None."""
+        cache = ProjectCache(tmp_path / "cache")
+
+        assert cache.restore("abc", tmp_path / "out") is None
+        assert not (tmp_path / "out").exists()
+
+    @pytest.mark.parametrize("method", ["copy", "reflink", "hardlink"])
+    def test_store_and_restore(self, tmp_path: Path, method: str) -> None:
+        """Test a stored project is restored with files, dirs and modes."""
+        cache = ProjectCache(tmp_path / "cache", method=method)
+        cache.store("abc", _project())
+
+        project = cache.restore("abc", tmp_path / "out")
+
+        out = tmp_path / "out"
+        assert project is not None
+        assert project.root_path == out
+        assert project.files[Path("README.md")] == "# Kit"
+        assert project.executable_files == [Path("scripts/init.sh")]
+        assert (out / "README.md").read_text() == "# Kit"
+        assert (out / "specs").is_dir()
+        assert os.access(out / "scripts/init.sh", os.X_OK)
+        assert project.write_summary is not None
+        assert Path("README.md") in project.write_summary.created
+
+    def test_hardlink_shares_storage(self, tmp_path: Path) -> None:
+        """Test hardlink restores link to the cached files."""
+        cache = ProjectCache(tmp_path / "cache", method="hardlink")
+        cache.store("abc", _project())
+
+        cache.restore("abc", tmp_path / "out")
+
+        assert (tmp_path / "out" / "README.md").stat().st_nlink == 2
+
+    def test_hardlink_keeps_cached_modes(self, tmp_path: Path) -> None:
+        """Test scripts needing a mode change are copied, not linked."""
+        cache = ProjectCache(tmp_path / "cache", method="hardlink")
+        cache.store("abc", _project())
+        cached_script = tmp_path / "cache" / "abc" / "scripts" / "init.sh"
+        cached_script.chmod(0o700)
+
+        cache.restore("abc", tmp_path / "out")
+
+        assert stat.S_IMODE(cached_script.stat().st_mode) == 0o700
+        restored = (tmp_path / "out" / "scripts" / "init.sh").stat()
+        assert (stat.S_IMODE(restored.st_mode), restored.st_nlink) == (0o755, 1)
+
+    def test_restore_reads_files_lazily(self, tmp_path: Path) -> None:
+        """Test restoring does not read the files back."""
+        cache = ProjectCache(tmp_path / "cache")
+        cache.store("abc", _project())
+
+        project = cache.restore("abc", tmp_path / "out")
+        (tmp_path / "out" / "README.md").write_text("read on access")
+
+        assert project is not None
+        assert len(project.files) == 2
+        assert project.files[Path("README.md")] == "read on access"
+
+    def test_restore_over_existing_requires_force(self, tmp_path: Path) -> None:
+        """Test restoring follows write_to_disk's force semantics."""
+        cache = ProjectCache(tmp_path / "cache")
+        cache.store("abc", _project())
+        (tmp_path / "out").mkdir()
+
+        with pytest.raises(FileExistsError):
+            cache.restore("abc", tmp_path / "out")
+
+        project = cache.restore("abc", tmp_path / "out", force=True)
+        assert project is not None
+
+    def test_restore_is_incremental(self, tmp_path: Path) -> None:
+        """Test restoring over the same project leaves files untouched."""
+        cache = ProjectCache(tmp_path / "cache")
+        cache.store("abc", _project())
+        cache.restore("abc", tmp_path / "out")
+
+        project = cache.restore("abc", tmp_path / "out", force=True)
+
+        assert project is not None and project.write_summary is not None
+        assert not project.write_summary.changed
+
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        """Test the least recently used entries are evicted first."""
+        cache = ProjectCache(tmp_path / "cache")
+        for i, fingerprint in enumerate(["a", "b", "c"]):
+            cache.store(fingerprint, _project(f"# Kit {i}"))
+            os.utime(cache.directory / f"{fingerprint}.json", (i, i))
+        cache.restore("a", tmp_path / "out")  # a is now most recently used
+        entry_size = cache.size() // 3
+
+        cache.max_size = entry_size * 2
+        removed = cache.evict()
+
+        assert removed == ["b"]
+        assert cache.contains("a") and cache.contains("c")
+        assert not (cache.directory / "b").exists()
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path: Path) -> None:
+        """Test unreadable metadata makes the entry count as missing."""
+        cache = ProjectCache(tmp_path / "cache")
+        cache.store("abc", _project())
+        (cache.directory / "abc.json").write_text("{")
+
+        assert not cache.contains("abc")
+        assert cache.restore("abc", tmp_path / "out") is None
+
+    def test_unknown_method(self, tmp_path: Path) -> None:
+        """Test unknown copy methods are rejected."""
+        with pytest.raises(ValueError, match="Unknown copy method"):
+            ProjectCache(tmp_path, method="teleport")
@@ -2,14 +2,41 @@
 Unit tests for metaspec.registry module.
 """
 
+import gzip
+import json
+import marshal
+import os
+import threading
+import time
+from collections.abc import Iterator
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from metaspec.registry import (
+    CACHE_FILE,
+    CACHE_TTL,
+    SNAPSHOT_FILE,
+    VALIDATORS_FILE,
     CommunityRegistry,
     CommunitySpeckit,
+    RegistrySnapshot,
+    clear_registry_snapshots,
     get_community_registry,
 )
+from metaspec.search_index import SearchIndex
+
+
+@pytest.fixture(autouse=True)
+def _fresh_snapshots() -> Iterator[None]:
+    """Start every test without memoized registries."""
+    clear_registry_snapshots()
+    yield
+    clear_registry_snapshots()
 
 
 class TestCommunitySpeckit:
@@ -156,10 +183,10 @@ Commands:
         assert success is False
         assert "failed" in message.lower()
 
-    @patch.object(CommunityRegistry, "fetch_speckits")
-    def test_search_speckits_empty(self, mock_fetch: MagicMock) -> None:
+    @patch.object(CommunityRegistry, "snapshot")
+    def test_search_speckits_empty(self, mock_snapshot: MagicMock) -> None:
         """Test searching speckits with no results."""
-        mock_fetch.return_value = []
+        mock_snapshot.return_value = RegistrySnapshot()
 
         registry = CommunityRegistry()
         results = registry.search("nonexistent")
@@ -235,47 +262,53 @@ Commands:
         assert speckits[0].name == "cached-kit"
         mock_urlopen.assert_not_called()
 
-    @patch.object(CommunityRegistry, "fetch_speckits")
-    def test_get_speckit_by_name(self, mock_fetch: MagicMock) -> None:
+    @patch.object(CommunityRegistry, "snapshot")
+    def test_get_speckit_by_name(self, mock_snapshot: MagicMock) -> None:
         """Test getting speckit by name."""
-        mock_fetch.return_value = [
-            CommunitySpeckit(name="kit1", command="cmd1", description="Kit 1"),
-            CommunitySpeckit(name="kit2", command="cmd2", description="Kit 2"),
-        ]
+        mock_snapshot.return_value = RegistrySnapshot(
+            [
+                CommunitySpeckit(name="kit1", command="cmd1", description="Kit 1"),
+                CommunitySpeckit(name="kit2", command="cmd2", description="Kit 2"),
+            ]
+        )
 
         registry = CommunityRegistry()
         speckit = registry.get("kit1")
         assert speckit is not None
         assert speckit.name == "kit1"
 
-    @patch.object(CommunityRegistry, "fetch_speckits")
-    def test_get_speckit_by_command(self, mock_fetch: MagicMock) -> None:
+    @patch.object(CommunityRegistry, "snapshot")
+    def test_get_speckit_by_command(self, mock_snapshot: MagicMock) -> None:
         """Test getting speckit by command."""
-        mock_fetch.return_value = [
-            CommunitySpeckit(name="kit1", command="cmd1", description="Kit 1"),
-        ]
+        mock_snapshot.return_value = RegistrySnapshot(
+            [
+                CommunitySpeckit(name="kit1", command="cmd1", description="Kit 1"),
+            ]
+        )
 
         registry = CommunityRegistry()
         speckit = registry.get("cmd1")
         assert speckit is not None
         assert speckit.command == "cmd1"
 
-    @patch.object(CommunityRegistry, "fetch_speckits")
-    def test_get_speckit_not_found(self, mock_fetch: MagicMock) -> None:
+    @patch.object(CommunityRegistry, "snapshot")
+    def test_get_speckit_not_found(self, mock_snapshot: MagicMock) -> None:
         """Test getting non-existent speckit."""
-        mock_fetch.return_value = []
+        mock_snapshot.return_value = RegistrySnapshot()
 
         registry = CommunityRegistry()
         speckit = registry.get("nonexistent")
         assert speckit is None
 
-    @patch.object(CommunityRegistry, "fetch_speckits")
-    def test_search_by_keyword(self, mock_fetch: MagicMock) -> None:
+    @patch.object(CommunityRegistry, "snapshot")
+    def test_search_by_keyword(self, mock_snapshot: MagicMock) -> None:
         """Test searching speckits by keyword."""
-        mock_fetch.return_value = [
-            CommunitySpeckit(name="python-kit", command="pykit", description="Python toolkit"),
-            CommunitySpeckit(name="rust-kit", command="rustkit", description="Rust toolkit"),
-        ]
+        mock_snapshot.return_value = RegistrySnapshot(
+            [
+                CommunitySpeckit(name="python-kit", command="pykit", description="Python toolkit"),
+                CommunitySpeckit(name="rust-kit", command="rustkit", description="Rust toolkit"),
+            ]
+        )
 
         registry = CommunityRegistry()
         results = registry.search("python")
@@ -394,23 +427,25 @@ Commands:
         registry2 = get_community_registry()
         assert registry1 is registry2
 
-    @patch.object(CommunityRegistry, "fetch_speckits")
-    def test_search_with_tags(self, mock_fetch: MagicMock) -> None:
+    @patch.object(CommunityRegistry, "snapshot")
+    def test_search_with_tags(self, mock_snapshot: MagicMock) -> None:
         """Test searching speckits with tags."""
-        mock_fetch.return_value = [
-            CommunitySpeckit(
-                name="python-kit",
-                command="pykit",
-                description="Python toolkit",
-                tags=["python", "dev"],
-            ),
-            CommunitySpeckit(
-                name="rust-kit",
-                command="rustkit",
-                description="Rust toolkit",
-                tags=["rust", "systems"],
-            ),
-        ]
+        mock_snapshot.return_value = RegistrySnapshot(
+            [
+                CommunitySpeckit(
+                    name="python-kit",
+                    command="pykit",
+                    description="Python toolkit",
+                    tags=["python", "dev"],
+                ),
+                CommunitySpeckit(
+                    name="rust-kit",
+                    command="rustkit",
+                    description="Rust toolkit",
+                    tags=["rust", "systems"],
+                ),
+            ]
+        )
 
         registry = CommunityRegistry()
         results = registry.search("dev")
@@ -448,3 +483,467 @@ Commands:
         repr_str = repr(speckit)
         assert "CommunitySpeckit" in repr_str or "test-kit" in repr_str
 
+
+class _RegistryServer(HTTPServer):
+    """Local stand-in for the GitHub raw registry URL."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _RegistryHandler)
+        self.requests: list[dict[str, str]] = []
+        self.etag: str | None = '"v1"'
+        self.last_modified: str | None = None
+        self.data: dict[str, Any] = {
+            "speckits": [
+                {"name": "remote-kit", "command": "remote", "description": "R"}
+            ]
+        }
+
+
+class _RegistryHandler(BaseHTTPRequestHandler):
+    """Serves speckits.json like raw.githubusercontent.com does."""
+
+    server: _RegistryServer
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append(dict(self.headers))
+        etag = server.etag
+        last_modified = server.last_modified
+        if (etag and self.headers.get("If-None-Match") == etag) or (
+            last_modified and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = json.dumps(server.data).encode()
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        if etag:
+            self.send_header("ETag", etag)
+        if last_modified:
+            self.send_header("Last-Modified", last_modified)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def registry_server() -> Iterator[_RegistryServer]:
+    """Serve a registry on a local port."""
+    server = _RegistryServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _local_registry(server: _RegistryServer, cache_dir: Path) -> CommunityRegistry:
+    """Create a registry client for the local server with its own cache."""
+    registry = CommunityRegistry(
+        registry_url=f"http://127.0.0.1:{server.server_port}/speckits.json"
+    )
+    registry.cache_dir = cache_dir
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return registry
+
+
+def _expire(cache_dir: Path) -> None:
+    """Make the cached registry older than the TTL."""
+    expired = time.time() - CACHE_TTL.total_seconds() - 60
+    os.utime(cache_dir / CACHE_FILE, (expired, expired))
+
+
+class TestConditionalFetch:
+    """Tests for revalidating the registry cache over HTTP."""
+
+    def test_gzip_response_and_validators_stored(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test gzip bodies are decoded and their ETag is kept."""
+        registry = _local_registry(registry_server, tmp_path)
+
+        speckits = registry.fetch_speckits()
+
+        assert [s.name for s in speckits] == ["remote-kit"]
+        assert "gzip" in registry_server.requests[0]["Accept-Encoding"]
+        validators = json.loads((tmp_path / VALIDATORS_FILE).read_text())
+        assert validators["etag"] == '"v1"'
+
+    def test_fresh_cache_skips_request(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test no request is made within the TTL."""
+        registry = _local_registry(registry_server, tmp_path)
+        registry.fetch_speckits()
+        registry.fetch_speckits()
+        assert len(registry_server.requests) == 1
+
+    def test_not_modified_renews_cache(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test a 304 answer keeps the cache and restarts its TTL."""
+        registry = _local_registry(registry_server, tmp_path)
+        registry.fetch_speckits()
+        _expire(tmp_path)
+        registry_server.data = {"speckits": []}
+
+        speckits = registry.fetch_speckits()
+
+        assert [s.name for s in speckits] == ["remote-kit"]
+        request = registry_server.requests[1]
+        assert request["If-None-Match"] == '"v1"'
+        age = time.time() - (tmp_path / CACHE_FILE).stat().st_mtime
+        assert age < 60
+
+    def test_modified_replaces_cache(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test a changed registry is downloaded with its new ETag."""
+        registry = _local_registry(registry_server, tmp_path)
+        registry.fetch_speckits()
+        _expire(tmp_path)
+        registry_server.etag = '"v2"'
+        registry_server.data = {
+            "speckits": [{"name": "new-kit", "command": "new", "description": "N"}]
+        }
+
+        speckits = registry.fetch_speckits()
+
+        assert [s.name for s in speckits] == ["new-kit"]
+        validators = json.loads((tmp_path / VALIDATORS_FILE).read_text())
+        assert validators["etag"] == '"v2"'
+
+    def test_last_modified_revalidation(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test If-Modified-Since is sent when the server has no ETag."""
+        registry_server.etag = None
+        registry_server.last_modified = "Wed, 01 Oct 2025 00:00:00 GMT"
+        registry = _local_registry(registry_server, tmp_path)
+        registry.fetch_speckits()
+        _expire(tmp_path)
+
+        assert [s.name for s in registry.fetch_speckits()] == ["remote-kit"]
+        request = registry_server.requests[1]
+        assert "If-None-Match" not in request
+        assert request["If-Modified-Since"] == "Wed, 01 Oct 2025 00:00:00 GMT"
+
+    def test_use_cache_false_is_unconditional(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test use_cache=False downloads without validators."""
+        registry = _local_registry(registry_server, tmp_path)
+        registry.fetch_speckits()
+        registry.fetch_speckits(use_cache=False)
+        assert "If-None-Match" not in registry_server.requests[1]
+
+    def test_validators_of_other_url_ignored(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test validators stored for another registry URL are not sent."""
+        registry = _local_registry(registry_server, tmp_path)
+        registry.fetch_speckits()
+        _expire(tmp_path)
+        registry.registry_url += "?mirror=1"
+
+        registry.fetch_speckits()
+        assert "If-None-Match" not in registry_server.requests[1]
+
+
+def _write_cache(cache_dir: Path, *names: str) -> None:
+    """Write a registry cache holding speckits with these names."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / CACHE_FILE).write_text(
+        json.dumps(
+            {
+                "speckits": [
+                    {"name": name, "command": f"{name}-cmd", "description": name}
+                    for name in names
+                ]
+            }
+        )
+    )
+
+
+def _cached_registry(cache_dir: Path) -> CommunityRegistry:
+    """Create a registry client reading an existing cache, offline."""
+    registry = CommunityRegistry(registry_url="http://127.0.0.1:9/speckits.json")
+    registry.cache_dir = cache_dir
+    return registry
+
+
+class TestRegistrySnapshot:
+    """Tests for memoized, indexed registry snapshots."""
+
+    def test_indexes(self) -> None:
+        """Test lookups by name, command and PyPI package; first entry wins."""
+        first = CommunitySpeckit(
+            name="kit", command="kit-cmd", description="A", pypi_package="kit-pkg"
+        )
+        duplicate = CommunitySpeckit(name="kit", command="other", description="B")
+        snapshot = RegistrySnapshot([first, duplicate])
+
+        assert snapshot.get("kit") is first
+        assert snapshot.get("kit-cmd") is first
+        assert snapshot.get("kit-pkg") is first
+        assert snapshot.get("other") is duplicate
+        assert snapshot.get("missing") is None
+
+    def test_shared_across_clients(self, tmp_path: Path) -> None:
+        """Test registries reading the same cache parse it once."""
+        _write_cache(tmp_path, "one", "two")
+        snapshot = _cached_registry(tmp_path).snapshot()
+
+        with patch("builtins.open", side_effect=AssertionError("cache re-read")):
+            assert _cached_registry(tmp_path).snapshot() is snapshot
+            assert _cached_registry(tmp_path).get("two-cmd") is snapshot.speckits[1]
+            assert len(_cached_registry(tmp_path).fetch_speckits()) == 2
+
+    def test_invalidated_when_cache_changes(self, tmp_path: Path) -> None:
+        """Test a rewritten cache file is read again."""
+        _write_cache(tmp_path, "old")
+        registry = _cached_registry(tmp_path)
+        assert registry.get("old") is not None
+
+        _write_cache(tmp_path, "new", "newer")
+        mtime = time.time() - 10
+        os.utime(tmp_path / CACHE_FILE, (mtime, mtime))
+
+        assert registry.get("old") is None
+        assert registry.get("newer") is not None
+
+    def test_invalidated_when_validators_change(self, tmp_path: Path) -> None:
+        """Test new validators invalidate the snapshot."""
+        _write_cache(tmp_path, "kit")
+        registry = _cached_registry(tmp_path)
+        snapshot = registry.snapshot()
+
+        (tmp_path / VALIDATORS_FILE).write_text("{}")
+        assert registry.snapshot() is not snapshot
+
+    def test_not_modified_keeps_snapshot(
+        self, registry_server: _RegistryServer, tmp_path: Path
+    ) -> None:
+        """Test a 304 revalidation reuses the parsed snapshot."""
+        registry = _local_registry(registry_server, tmp_path)
+        snapshot = registry.snapshot()
+
+        # Expire by age alone: touching the cache would invalidate it
+        with patch("metaspec.registry.CACHE_TTL", timedelta(0)):
+            assert registry.snapshot() is snapshot
+        assert len(registry_server.requests) == 2
+        assert registry.snapshot() is snapshot
+        assert len(registry_server.requests) == 2
+
+    def test_offline_without_cache(self, tmp_path: Path) -> None:
+        """Test an unreachable registry without cache gives an empty snapshot."""
+        registry = _cached_registry(tmp_path)
+        assert registry.snapshot().speckits == []
+        assert registry.get("anything") is None
+
+
+class TestBinarySnapshot:
+    """Tests for the binary registry snapshot."""
+
+    def test_round_trip(self) -> None:
+        """Test a restored snapshot holds equal speckits and lookups."""
+        speckits = [
+            CommunitySpeckit(
+                name="kit", command="k", description="d", pypi_package="kit-pkg"
+            ),
+            CommunitySpeckit(name="other", command="o", description="d", tags=["x"]),
+        ]
+        data = marshal.loads(marshal.dumps(RegistrySnapshot(speckits).to_data()))
+
+        restored = RegistrySnapshot.from_data(data)
+        assert restored is not None
+        assert restored.speckits == speckits
+        assert restored.get("kit-pkg") is restored.speckit(0)
+        assert restored.search_index is not None
+
+    def test_from_data_rejects_other_data(self) -> None:
+        """Test data of other fields or shape is not restored."""
+        data = RegistrySnapshot([]).to_data()
+        assert RegistrySnapshot.from_data((("name",), *data[1:])) is None
+        assert RegistrySnapshot.from_data(None) is None
+
+    @pytest.mark.parametrize(
+        "corrupt",
+        [
+            # A record column missing a value, or with a value of another type
+            lambda data: data[1][0].pop(),
+            lambda data: data[1][3].__setitem__(0, 1),
+            lambda data: data[1][7].__setitem__(1, [None]),
+            # An index whose tokens or terms do not match its numbers
+            lambda data: data[2][2].append("ghost"),
+            lambda data: data[2][3].pop(),
+        ],
+    )
+    def test_from_data_validates_eagerly(self, corrupt: Any) -> None:
+        """Test inconsistent records and index are rejected on load."""
+        speckits = [
+            CommunitySpeckit(name="kit", command="k", description="d", tags=["a"]),
+            CommunitySpeckit(name="other", command="o", description="d", tags=["b"]),
+        ]
+        data = marshal.loads(marshal.dumps(RegistrySnapshot(speckits).to_data()))
+        assert RegistrySnapshot.from_data(data) is not None
+
+        corrupt(data)
+        assert RegistrySnapshot.from_data(data) is None
+
+    def test_warm_load_skips_validation(self, tmp_path: Path) -> None:
+        """Test the JSON is neither parsed nor validated once snapshotted."""
+        _write_cache(tmp_path, "alpha", "beta")
+        _cached_registry(tmp_path).snapshot()
+        assert (tmp_path / SNAPSHOT_FILE).exists()
+
+        clear_registry_snapshots()
+        with (
+            patch("metaspec.registry.json.load", side_effect=AssertionError("parsed")),
+            patch.object(
+                CommunitySpeckit, "__init__", side_effect=AssertionError("validated")
+            ),
+        ):
+            registry = _cached_registry(tmp_path)
+            assert [s.name for s in registry.search("beta")] == ["beta"]
+            speckit = registry.get("alpha-cmd")
+        assert speckit == CommunitySpeckit(
+            name="alpha", command="alpha-cmd", description="alpha"
+        )
+
+    def test_corrupted_snapshot_falls_back_to_cache(self, tmp_path: Path) -> None:
+        """Test a corrupted snapshot is ignored and rewritten."""
+        _write_cache(tmp_path, "alpha")
+        _cached_registry(tmp_path).snapshot()
+        (tmp_path / SNAPSHOT_FILE).write_bytes(b"corrupted")
+
+        clear_registry_snapshots()
+        assert _cached_registry(tmp_path).get("alpha") is not None
+
+        clear_registry_snapshots()
+        with patch("metaspec.registry.json.load", side_effect=AssertionError("parsed")):
+            assert _cached_registry(tmp_path).get("alpha") is not None
+
+    def test_snapshot_of_other_python_ignored(self, tmp_path: Path) -> None:
+        """Test a snapshot written by another Python version is not used."""
+        _write_cache(tmp_path, "alpha")
+        _cached_registry(tmp_path).snapshot()
+        path = tmp_path / SNAPSHOT_FILE
+        snapshot_format, _, state, data = marshal.loads(path.read_bytes())
+        path.write_bytes(marshal.dumps((snapshot_format, (2, 7), state, data)))
+
+        clear_registry_snapshots()
+        with patch("metaspec.registry.RegistrySnapshot.from_data") as from_data:
+            assert _cached_registry(tmp_path).get("alpha") is not None
+        from_data.assert_not_called()
+
+    def test_snapshot_errors_fall_back_to_cache(self, tmp_path: Path) -> None:
+        """Test any error restoring the snapshot reads the JSON cache."""
+        _write_cache(tmp_path, "alpha")
+        _cached_registry(tmp_path).snapshot()
+
+        clear_registry_snapshots()
+        with patch(
+            "metaspec.registry.RegistrySnapshot.from_data", side_effect=KeyError
+        ):
+            assert _cached_registry(tmp_path).get("alpha") is not None
+
+    def test_stale_snapshot_ignored(self, tmp_path: Path) -> None:
+        """Test a snapshot of a previous cache is not used."""
+        _write_cache(tmp_path, "old")
+        _cached_registry(tmp_path).snapshot()
+
+        _write_cache(tmp_path, "new")
+        mtime = time.time() - 10
+        os.utime(tmp_path / CACHE_FILE, (mtime, mtime))
+        clear_registry_snapshots()
+
+        registry = _cached_registry(tmp_path)
+        assert registry.get("old") is None
+        assert registry.get("new") is not None
+
+    def test_large_registry_warm_search(self, tmp_path: Path) -> None:
+        """Test a warm search over 10,000 speckits stays fast."""
+        _write_cache(tmp_path, *(f"kit-{i}" for i in range(10_000)))
+        _cached_registry(tmp_path).snapshot()
+
+        clear_registry_snapshots()
+        start = time.perf_counter()
+        results = _cached_registry(tmp_path).search("kit", limit=20)
+        elapsed = time.perf_counter() - start
+        assert len(results) == 20
+        assert elapsed < 0.5
+
+
+class TestRankedSearch:
+    """Tests for registry search through the persistent index."""
+
+    def test_ranked_results(self, tmp_path: Path) -> None:
+        """Test search ranks name matches first and pages results."""
+        _write_cache(tmp_path, "alpha", "beta-api", "api")
+        registry = _cached_registry(tmp_path)
+
+        assert [s.name for s in registry.search("api")] == ["api", "beta-api"]
+        assert [s.name for s in registry.search("api", limit=1, offset=1)] == [
+            "beta-api"
+        ]
+
+    def test_substring_search(self, tmp_path: Path) -> None:
+        """Test a query inside a word still finds speckits, as before ranking."""
+        _write_cache(tmp_path, "speckit", "openspec")
+        registry = _cached_registry(tmp_path)
+
+        assert [s.name for s in registry.search("kit")] == ["speckit"]
+        # Prefix matches rank above matches inside a word
+        assert [s.name for s in registry.search("spec")] == ["speckit", "openspec"]
+
+    def test_index_persisted_and_reused(self, tmp_path: Path) -> None:
+        """Test the index is saved in the binary snapshot and not rebuilt."""
+        _write_cache(tmp_path, "alpha", "beta")
+        _cached_registry(tmp_path).search("alpha")
+        assert (tmp_path / SNAPSHOT_FILE).exists()
+
+        clear_registry_snapshots()
+        with patch.object(SearchIndex, "build", side_effect=AssertionError("rebuilt")):
+            results = _cached_registry(tmp_path).search("beta")
+        assert [s.name for s in results] == ["beta"]
+
+    def test_index_rebuilt_when_registry_changes(self, tmp_path: Path) -> None:
+        """Test a changed registry gets a new index."""
+        _write_cache(tmp_path, "alpha")
+        registry = _cached_registry(tmp_path)
+        assert registry.search("gamma") == []
+
+        _write_cache(tmp_path, "alpha", "gamma")
+        mtime = time.time() - 10
+        os.utime(tmp_path / CACHE_FILE, (mtime, mtime))
+        assert [s.name for s in registry.search("gamma")] == ["gamma"]
+
+    def test_suggest(self, tmp_path: Path) -> None:
+        """Test misspelled queries get the closest speckits."""
+        _write_cache(tmp_path, "openspec", "api-speckit")
+        registry = _cached_registry(tmp_path)
+
+        assert registry.search("opnspec") == []
+        assert registry.suggest("opnspec")[0].name == "openspec"
+        assert registry.suggest("api-spekit", limit=1)[0].name == "api-speckit"
+
+    def test_unpersisted_registry(self) -> None:
+        """Test search works on registries that are not cached."""
+        with patch.object(
+            CommunityRegistry,
+            "snapshot",
+            return_value=RegistrySnapshot(
+                [CommunitySpeckit(name="kit", command="k", description="d")]
+            ),
+        ):
+            assert [s.name for s in CommunityRegistry().search("kit")] == ["kit"]
@@ -0,0 +1,246 @@
+"""
+Unit tests for metaspec.search_index module.
+"""
+
+import marshal
+import time
+
+from metaspec.registry import CommunitySpeckit
+from metaspec.search_index import INDEX_FORMAT, SearchIndex, tokenize, trigrams
+
+
+def _speckit(
+    name: str, description: str = "", tags: list[str] | None = None, command: str = ""
+) -> CommunitySpeckit:
+    """Create a registry entry."""
+    return CommunitySpeckit(
+        name=name,
+        command=command or name,
+        description=description or f"{name} speckit",
+        tags=tags or ["misc"],
+    )
+
+
+class TestTokenize:
+    """Tests for tokenization."""
+
+    def test_tokenize(self) -> None:
+        """Test text is split into lowercase alphanumeric tokens."""
+        assert tokenize("API-Speckit v2, OpenAPI_3") == [
+            "api",
+            "speckit",
+            "v2",
+            "openapi",
+            "3",
+        ]
+        assert tokenize("  --  ") == []
+        assert tokenize("Café 日本語 snake_case") == ["café", "日本語", "snake", "case"]
+
+
+class TestTrigrams:
+    """Tests for trigram extraction."""
+
+    def test_trigrams(self) -> None:
+        """Test words are padded and whitespace is normalized."""
+        assert trigrams("API") == {"  a", " ap", "api", "pi "}
+        assert trigrams("a  b") == trigrams("a b")
+        assert trigrams("") == set()
+
+
+class TestSuggest:
+    """Tests for typo-tolerant suggestions."""
+
+    def _index(self) -> tuple[list[CommunitySpeckit], SearchIndex]:
+        """Index a small registry."""
+        speckits = [
+            _speckit("api-speckit", tags=["openapi"]),
+            _speckit("openspec", tags=["spec"]),
+            _speckit("mcp-speckit", command="mcp-spec"),
+        ]
+        return speckits, SearchIndex.build(speckits)
+
+    def test_misspelled_names(self) -> None:
+        """Test misspelled names suggest the intended speckit first."""
+        speckits, index = self._index()
+        assert speckits[index.suggest("api-spekit")[0]].name == "api-speckit"
+        assert speckits[index.suggest("opnspec")[0]].name == "openspec"
+        assert speckits[index.suggest("mcp-spek")[0]].name == "mcp-speckit"
+
+    def test_tags_and_commands(self) -> None:
+        """Test tags and commands are matched too."""
+        speckits, index = self._index()
+        assert index.suggest("opnapi")[0] == 0
+        assert index.suggest("mcpspec")[0] == 2
+
+    def test_unrelated_query(self) -> None:
+        """Test dissimilar queries suggest nothing."""
+        _, index = self._index()
+        assert index.suggest("zzzzqqq") == []
+        assert index.suggest("") == []
+
+    def test_limit(self) -> None:
+        """Test the number of suggestions is limited, each entry once."""
+        index = SearchIndex.build(
+            [_speckit(f"speckit-{i}", tags=[f"speckit-{i}"]) for i in range(10)]
+        )
+        suggestions = index.suggest("speckit", limit=3)
+        assert len(suggestions) == 3
+        assert len(set(index.suggest("speckit", threshold=0.1, limit=20))) == 10
+
+    def test_fast(self) -> None:
+        """Test suggestions take well under a millisecond on a typical registry."""
+        index = SearchIndex.build(
+            [_speckit(f"{word}-kit") for word in map(str, range(500))]
+        )
+        start = time.perf_counter()
+        for _ in range(100):
+            index.suggest("42-kt")
+        assert (time.perf_counter() - start) / 100 < 0.005
+
+
+class TestSearchIndex:
+    """Tests for ranked search."""
+
+    def test_field_boosts(self) -> None:
+        """Test name matches outrank command, tag and description matches."""
+        speckits = [
+            _speckit("plain", description="Works with graphql schemas"),
+            _speckit("tagged", tags=["graphql"]),
+            _speckit("cmd", command="graphql-cmd"),
+            _speckit("graphql-kit"),
+        ]
+        index = SearchIndex.build(speckits)
+        assert index.search("graphql") == [3, 2, 1, 0]
+
+    def test_all_terms_must_match(self) -> None:
+        """Test multi-term queries return entries matching every term."""
+        speckits = [
+            _speckit("api-kit", description="REST API docs"),
+            _speckit("spec-kit", description="Generic specs"),
+            _speckit("api-spec-kit", description="API specs"),
+        ]
+        index = SearchIndex.build(speckits)
+        assert index.search("api spec") == [2]
+        assert set(index.search("api")) == {0, 2}
+        assert index.search("api missing") == []
+
+    def test_prefix_matches_rank_below_exact(self) -> None:
+        """Test a term matches word prefixes, weighted below exact words."""
+        speckits = [_speckit("devops-kit"), _speckit("dev-kit")]
+        index = SearchIndex.build(speckits)
+        assert index.search("dev") == [1, 0]
+
+    def test_substring_matches_rank_below_prefix(self) -> None:
+        """Test terms match inside tokens, weighted below word prefixes."""
+        speckits = [
+            _speckit("speckit", description="Specs"),
+            _speckit("devops-kit", description="Pipelines"),
+            _speckit("ops", description="Operations"),
+        ]
+        index = SearchIndex.build(speckits)
+        assert index.search("kit") == [1, 0]
+        assert index.search("eck") == [0]
+        assert index.search("vops") == [1]
+        assert index.search("eck vops") == []
+        assert index.search("zzz") == []
+
+    def test_substring_and_prefix_matches_blended(self) -> None:
+        """Test a term finds prefix and substring matches together."""
+        speckits = [
+            _speckit("api-speckit", description="APIs"),
+            _speckit("kit-tools", description="Tools"),
+        ]
+        index = SearchIndex.build(speckits)
+        assert index.search("kit") == [1, 0]
+
+    def test_non_ascii(self) -> None:
+        """Test non-ASCII text is indexed and searchable."""
+        index = SearchIndex.build(
+            [
+                _speckit("docs-kit", description="日本語 のドキュメント"),
+                _speckit("café"),
+            ]
+        )
+        assert index.search("日本語") == [0]
+        assert index.search("CAFÉ") == [1]
+
+    def test_query_without_tokens_matches_nothing(self) -> None:
+        """Test a query of only punctuation does not return the whole registry."""
+        index = SearchIndex.build([_speckit("a"), _speckit("b")])
+        assert index.search("++") == []
+        assert index.search("-") == []
+
+    def test_ties_keep_registry_order(self) -> None:
+        """Test equally relevant entries keep registry order."""
+        index = SearchIndex.build(
+            [_speckit(f"kit-{i}", description="same") for i in range(5)]
+        )
+        assert index.search("kit") == [0, 1, 2, 3, 4]
+
+    def test_limit_and_offset(self) -> None:
+        """Test limit and offset page through ranked results."""
+        index = SearchIndex.build([_speckit(f"kit-{i}") for i in range(10)])
+        assert index.search("kit", limit=3) == [0, 1, 2]
+        assert index.search("kit", limit=3, offset=3) == [3, 4, 5]
+        assert index.search("kit", offset=8) == [8, 9]
+        assert index.search("", limit=2, offset=1) == [1, 2]
+
+    def test_empty_query_matches_all(self) -> None:
+        """Test an empty query returns every entry in registry order."""
+        index = SearchIndex.build([_speckit("a"), _speckit("b")])
+        assert index.search("") == [0, 1]
+
+    def test_empty_index(self) -> None:
+        """Test an empty registry finds nothing."""
+        index = SearchIndex.build([])
+        assert index.search("anything") == []
+        assert index.search("") == []
+
+    def test_large_registry(self) -> None:
+        """Test queries stay fast on tens of thousands of entries."""
+        speckits = [
+            _speckit(
+                f"kit-{i}",
+                description=f"speckit number {i} for domain {i % 50}",
+                tags=[f"tag{i % 100}"],
+            )
+            for i in range(20000)
+        ]
+        index = SearchIndex.build(speckits)
+        start = time.perf_counter()
+        results = index.search("domain 7 speckit", limit=20)
+        elapsed = time.perf_counter() - start
+        assert len(results) == 20
+        assert elapsed < 0.5
+
+
+class TestPersistence:
+    """Tests for storing and restoring indexes."""
+
+    def test_round_trip(self) -> None:
+        """Test a stored index answers like the original."""
+        index = SearchIndex.build([_speckit("api-kit"), _speckit("spec-kit")])
+        data = marshal.loads(marshal.dumps(index.to_data()))
+
+        loaded = SearchIndex.from_data(data)
+        assert loaded is not None
+        assert loaded.search("kit") == index.search("kit")
+        assert loaded.suggest("api-kt") == index.suggest("api-kt")
+
+    def test_other_format(self) -> None:
+        """Test data of another index format is not restored."""
+        data = SearchIndex.build([_speckit("a")]).to_data()
+        assert SearchIndex.from_data((INDEX_FORMAT - 1, *data[1:])) is None
+
+    def test_corrupted(self) -> None:
+        """Test data that is not an index is not restored."""
+        assert SearchIndex.from_data(None) is None
+        assert SearchIndex.from_data((INDEX_FORMAT, "1", {}, [], {})) is None
+
+    def test_corrupted_numbers(self) -> None:
+        """Test packed numbers that do not match their checksum are rejected."""
+        data = SearchIndex.build([_speckit("a"), _speckit("b")]).to_data()
+        packed = list(data[5])
+        packed[1] = bytes([packed[1][0] ^ 1]) + packed[1][1:]
+        assert SearchIndex.from_data((*data[:5], tuple(packed), data[6])) is None
+        assert SearchIndex.from_data(data) is not None
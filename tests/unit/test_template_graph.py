@@ -0,0 +1,66 @@
+"""
+Unit tests for metaspec.template_graph module.
+"""
+
+import pytest
+from jinja2 import DictLoader, Environment, TemplateNotFound
+
+from metaspec.template_graph import TemplateDependencyGraph
+
+TEMPLATES = {
+    "header.j2": "# {{ name }}\n",
+    "plain.j2": "{{ name }} {{ version }}\n",
+    "loop.j2": "{% for cmd in cli_commands %}{{ cmd.name }}{% endfor %}\n",
+    "page.j2": "{% include 'header.j2' %}{{ description }}\n",
+    "nested.j2": "{% include 'page.j2' %}{{ entity.name }}\n",
+    "base.j2": "{% block body %}{% endblock %}{{ date }}\n",
+    "child.j2": "{% extends 'base.j2' %}{% block body %}{{ domain }}{% endblock %}",
+    "dynamic.j2": "{% include template_name %}",
+    "macros.j2": "{% macro title() %}{{ name }}{% endmacro %}",
+    "imports.j2": "{% import 'macros.j2' as m %}{{ m.title() }}\n",
+}
+
+
+@pytest.fixture
+def graph() -> TemplateDependencyGraph:
+    """Dependency graph over the test templates."""
+    return TemplateDependencyGraph(Environment(loader=DictLoader(TEMPLATES)))
+
+
+class TestTemplateDependencyGraph:
+    """Tests for TemplateDependencyGraph."""
+
+    def test_undeclared_variables(self, graph: TemplateDependencyGraph) -> None:
+        """Test a template depends on the variables it reads, not loop locals."""
+        assert graph.dependencies("plain.j2") == {"name", "version"}
+        assert graph.dependencies("loop.j2") == {"cli_commands"}
+
+    def test_includes_are_followed(self, graph: TemplateDependencyGraph) -> None:
+        """Test included templates' variables count, transitively."""
+        assert graph.dependencies("page.j2") == {"name", "description"}
+        assert graph.dependencies("nested.j2") == {"name", "description", "entity"}
+
+    def test_extends_and_imports_are_followed(
+        self, graph: TemplateDependencyGraph
+    ) -> None:
+        """Test parent templates and imported macros count."""
+        assert graph.dependencies("child.j2") == {"domain", "date"}
+        assert graph.dependencies("imports.j2") == {"name"}
+
+    def test_dynamic_reference_depends_on_everything(
+        self, graph: TemplateDependencyGraph
+    ) -> None:
+        """Test a computed template name makes dependencies unknown."""
+        assert graph.dependencies("dynamic.j2") is None
+
+    def test_affected(self, graph: TemplateDependencyGraph) -> None:
+        """Test only templates reading a changed key are affected."""
+        names = ["plain.j2", "loop.j2", "page.j2", "dynamic.j2"]
+
+        assert graph.affected(names, {"cli_commands"}) == ["loop.j2", "dynamic.j2"]
+        assert graph.affected(names, {"name"}) == ["plain.j2", "page.j2", "dynamic.j2"]
+
+    def test_missing_template(self, graph: TemplateDependencyGraph) -> None:
+        """Test unknown templates raise TemplateNotFound."""
+        with pytest.raises(TemplateNotFound):
+            graph.dependencies("missing.j2")
@@ -0,0 +1,103 @@
+"""
+Unit tests for metaspec.template_index module.
+"""
+
+import pytest
+
+from metaspec.template_index import TemplateIndex
+
+TEMPLATES = [
+    "base/README.md.j2",
+    "library/generic/greenfield/commands/plan.md.j2",
+    "library/generic/greenfield/templates/plan-template.md.j2",
+    "library/generic/brownfield/commands/apply.md.j2",
+    "library/sdd/spec-kit/commands/plan.md.j2",
+    "library/sdd/spec-kit/templates/plan-template.md.j2",
+    "library/mcp/templates/tool-template.md.j2",
+    "meta/sds/commands/specify.md.j2",
+    "meta/sds/commands/plan.md.j2",
+    "meta/evolution/commands/apply.md.j2",
+    "meta/templates/spec-template.md.j2",
+    "meta/sds/templates/domain-spec-template.md.j2",
+    "meta/templates/notes.txt",
+]
+
+
+class TestTemplateIndex:
+    """Tests for TemplateIndex."""
+
+    def test_get_exact_source(self) -> None:
+        """Test library templates are found by source, kind and name."""
+        index = TemplateIndex(TEMPLATES)
+
+        entry = index.get("sdd/spec-kit", "commands", "plan.md")
+
+        assert entry is not None
+        assert entry.path == "library/sdd/spec-kit/commands/plan.md.j2"
+        assert entry.root == "library/sdd/spec-kit"
+        assert index.get("sdd/spec-kit", "commands", "apply.md") is None
+
+    def test_parent_source_resolves_nested_libraries(self) -> None:
+        """Test a parent source finds commands in its nested libraries."""
+        index = TemplateIndex(TEMPLATES)
+
+        assert index.library_root("generic", "plan") == "library/generic/greenfield"
+        assert index.library_root("generic", "apply") == "library/generic/brownfield"
+
+    def test_other_parent_sources_are_not_routed(self) -> None:
+        """Test only routed sources resolve to their nested libraries."""
+        index = TemplateIndex(TEMPLATES)
+
+        assert index.get("sdd", "commands", "plan.md") is None
+        assert index.library_root("sdd", "plan") == "library/sdd"
+
+    def test_ambiguous_routed_source(self) -> None:
+        """Test two nested libraries providing one template are rejected."""
+        with pytest.raises(ValueError, match="Ambiguous template for source"):
+            TemplateIndex(
+                [
+                    *TEMPLATES,
+                    "library/generic/brownfield/commands/plan.md.j2",
+                ]
+            )
+
+    def test_parent_library_wins_over_nested_ones(self) -> None:
+        """Test a routed source's own template is not ambiguous."""
+        index = TemplateIndex(
+            [
+                *TEMPLATES,
+                "library/generic/commands/plan.md.j2",
+                "library/generic/brownfield/commands/plan.md.j2",
+            ]
+        )
+
+        assert index.library_root("generic", "plan") == "library/generic"
+
+    def test_library_root_from_template_only(self) -> None:
+        """Test libraries without command files resolve via their templates."""
+        index = TemplateIndex(TEMPLATES)
+
+        assert index.library_root("mcp", "tool") == "library/mcp"
+        assert index.library_root("unknown", "tool") == "library/unknown"
+
+    def test_meta_command_groups(self) -> None:
+        """Test MetaSpec command groups are discovered from the tree."""
+        index = TemplateIndex(TEMPLATES)
+
+        groups = index.meta_command_groups()
+
+        assert sorted(groups) == ["evolution", "sds"]
+        assert [e.name for e in groups["sds"]] == ["plan.md", "specify.md"]
+
+    def test_meta_templates_skip_group_templates(self) -> None:
+        """Test command group templates and non-template files are not copied."""
+        index = TemplateIndex(TEMPLATES)
+
+        assert [e.name for e in index.meta_templates()] == ["spec-template.md"]
+
+    def test_contains(self) -> None:
+        """Test membership checks use template names."""
+        index = TemplateIndex(TEMPLATES)
+
+        assert "base/README.md.j2" in index
+        assert "base/missing.md.j2" not in index
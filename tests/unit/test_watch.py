@@ -0,0 +1,161 @@
+"""
+Unit tests for metaspec.watch module.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from metaspec.watch import DefinitionWatcher, FileChange, FileWatcher, WatchUpdate
+
+DEFINITION = {
+    "name": "watched-kit",
+    "domain": "testing",
+    "entity": {"name": "Spec", "fields": [{"name": "id"}]},
+    "cli_commands": [{"name": "info", "description": "Show info"}],
+}
+
+
+def write_definition(path: Path, **changes: object) -> None:
+    """Write the test definition with some fields replaced."""
+    path.write_text(json.dumps({**DEFINITION, **changes}), encoding="utf-8")
+
+
+class TestFileWatcher:
+    """Tests for FileWatcher."""
+
+    @pytest.mark.parametrize(
+        "use_inotify",
+        [
+            False,
+            pytest.param(
+                True,
+                marks=pytest.mark.skipif(
+                    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+                ),
+            ),
+        ],
+    )
+    def test_detects_changes(self, tmp_path: Path, use_inotify: bool) -> None:
+        """Test modified files and files created in watched trees are reported."""
+        definition = tmp_path / "speckit.json"
+        definition.write_text("{}")
+        templates = tmp_path / "templates"
+        (templates / "base").mkdir(parents=True)
+        watcher = FileWatcher(
+            [definition, templates], poll_interval=0.05, use_inotify=use_inotify
+        )
+        assert watcher.uses_inotify is use_inotify
+
+        try:
+            assert watcher.wait(timeout=0.1) == set()
+
+            definition.write_text('{"name": "changed"}')
+            assert watcher.wait(timeout=5) == {definition.resolve()}
+
+            new_template = templates / "base" / "NEW.md.j2"
+            new_template.write_text("new")
+            assert watcher.wait(timeout=5) == {new_template.resolve()}
+        finally:
+            watcher.close()
+
+    def test_stop_event(self, tmp_path: Path) -> None:
+        """Test waiting ends when the stop event is set."""
+        watcher = FileWatcher([tmp_path], poll_interval=0.05, use_inotify=False)
+        stop = threading.Event()
+        stop.set()
+
+        assert watcher.wait(stop=stop) == set()
+
+
+class TestDefinitionWatcher:
+    """Tests for DefinitionWatcher."""
+
+    def test_update_reports_changed_files(self, tmp_path: Path) -> None:
+        """Test a definition change rewrites only affected files and diffs them."""
+        definition = tmp_path / "speckit.json"
+        write_definition(definition)
+        output_dir = tmp_path / "watched-kit"
+        watcher = DefinitionWatcher(definition, output_dir, use_inotify=False)
+
+        first = watcher.update()
+        assert first.summary.created
+        assert first.changes == []
+
+        write_definition(
+            definition,
+            cli_commands=[
+                {"name": "info", "description": "Show info"},
+                {"name": "export", "description": "Export"},
+            ],
+        )
+        second = watcher.update([definition])
+
+        changed = {change.path: change for change in second.changes}
+        assert Path("README.md") in changed
+        assert Path(".gitignore") not in changed
+        assert Path(".gitignore") in second.summary.unchanged
+        assert changed[Path("src/watched_kit/cli.py")].added > 0
+        assert str(changed[Path("README.md")]).startswith("M README.md (+")
+        watcher.watcher.close()
+
+    def test_update_keeps_output_in_place(self, tmp_path: Path) -> None:
+        """Test regenerating keeps the inodes of the output and untouched files."""
+        definition = tmp_path / "speckit.json"
+        write_definition(definition)
+        output_dir = tmp_path / "watched-kit"
+        watcher = DefinitionWatcher(definition, output_dir, use_inotify=False)
+        watcher.update()
+        untouched = output_dir / ".gitignore"
+        before = (output_dir.stat().st_ino, untouched.stat().st_ino)
+
+        write_definition(definition, domain="changed")
+        update = watcher.update([definition])
+
+        assert update.summary.changed
+        assert Path(".gitignore") in update.summary.unchanged
+        assert (output_dir.stat().st_ino, untouched.stat().st_ino) == before
+        watcher.watcher.close()
+
+    def test_run_reports_errors_and_keeps_watching(self, tmp_path: Path) -> None:
+        """Test an invalid definition is reported and a fix regenerates."""
+        definition = tmp_path / "speckit.json"
+        definition.write_text("{not json")
+        output_dir = tmp_path / "watched-kit"
+        watcher = DefinitionWatcher(
+            definition, output_dir, poll_interval=0.05, use_inotify=False
+        )
+        updates: list[WatchUpdate] = []
+        errors: list[Exception] = []
+        stop = threading.Event()
+
+        def on_error(error: Exception) -> None:
+            errors.append(error)
+            write_definition(definition)
+
+        def on_update(update: WatchUpdate) -> None:
+            updates.append(update)
+            stop.set()
+
+        thread = threading.Thread(target=watcher.run, args=(on_update, on_error, stop))
+        thread.start()
+        thread.join(timeout=30)
+
+        assert not thread.is_alive()
+        assert len(errors) == 1
+        assert len(updates) == 1
+        assert updates[0].changed_inputs == [definition.resolve()]
+        assert (output_dir / "README.md").exists()
+
+
+class TestFileChange:
+    """Tests for FileChange."""
+
+    def test_str(self) -> None:
+        """Test the compact one-line change format."""
+        change = FileChange("D", Path("docs/old.md"), 0, 3)
+
+        assert str(change) == "D docs/old.md (+0 -3)"